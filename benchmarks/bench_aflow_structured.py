@@ -0,0 +1,76 @@
+"""
+A/B benchmark: structured, concurrently sampled AFlow versus the operator chain.
+
+Runs the AFlow agent on a set of tasks in both modes and reports latency,
+LLM calls, tokens, parse failures and tool-set overlap with the ground truth
+tool flow. Requires a configured LLM endpoint (OPENAI_API_KEY/OPENAI_API_BASE).
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from statistics import mean
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_react_fused import load_tasks, overlap_scores
+from geoplan_bench.utils.arena import create_aflow_agent
+
+
+def run_mode(tasks, mode: str, args):
+    """Run all tasks in one mode and aggregate the measurements"""
+    rows = []
+    for task in tasks:
+        agent = create_aflow_agent(model=args.model, mode=mode, num_samples=args.num_samples,
+                                   ensemble=args.ensemble)
+        start = time.perf_counter()
+        try:
+            trajectory = agent.run_and_return_tool_trajectory(task["question"])
+            failed = 0
+        except Exception as e:
+            print(f"{mode} failed on task {task.get('task_id')}: {e}")
+            trajectory, failed = [], 1
+        latency = time.perf_counter() - start
+        precision, recall = overlap_scores(trajectory, task["ground_truth_tool_flow"])
+        rows.append({
+            "task_id": task.get("task_id"),
+            "latency_s": latency,
+            "failed": failed,
+            "trajectory_length": len(trajectory),
+            "tool_precision": precision,
+            "tool_recall": recall,
+            **agent.usage_stats,
+        })
+
+    summary = {key: mean(row[key] for row in rows) for key in rows[0] if key != "task_id"}
+    return {"summary": summary, "tasks": rows}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="A/B benchmark of structured versus chained AFlow")
+    parser.add_argument("--task-dir", type=str, default="examples/data_examples/tasks/filtered",
+                        help="Directory containing task files")
+    parser.add_argument("--limit", type=int, default=10, help="Maximum number of tasks")
+    parser.add_argument("--model", type=str, default="gpt-4o-mini", help="Model name")
+    parser.add_argument("--num-samples", type=int, default=3, help="Concurrent generations in structured mode")
+    parser.add_argument("--ensemble", type=str, default="llm", choices=["llm", "local"],
+                        help="Self-consistency ensemble method")
+    parser.add_argument("--output", type=str, default=None, help="Optional JSON output path")
+    args = parser.parse_args()
+
+    tasks = load_tasks(args.task_dir, args.limit)
+    if not tasks:
+        raise FileNotFoundError(f"No task files found in {args.task_dir}")
+
+    results = {mode: run_mode(tasks, mode, args) for mode in ("chain", "structured")}
+    print(json.dumps({mode: result["summary"] for mode, result in results.items()}, indent=2))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Scaling experiment on the mock LLM backend: workers versus throughput and tail latency.
+
+Runs the agents of the evaluation pipeline on a set of tasks with a thread pool
+for each worker count, against the in-process mock backend (or any backend
+selected with GEOPLAN_LLM_BACKEND/OPENAI_API_BASE when --backend is "env").
+All tasks are submitted at once, so the queue depth at start is tasks - workers.
+Reports throughput, p50/p99 end-to-end latency (queueing included) and
+p50/p99 service latency per worker count.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_react_fused import load_tasks
+
+AGENT_FACTORIES = ("react", "plan_and_execute", "earth", "debate", "cot", "aflow")
+
+
+def percentile(values, q):
+    """Nearest-rank percentile"""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(q / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def run_task(task, agent_names, submitted_at):
+    """Run the selected agents on one task, return (end-to-end, service) latency"""
+    from geoplan_bench.utils import arena
+
+    started_at = time.perf_counter()
+    for agent_name in agent_names:
+        factory = {
+            "react": arena.create_react_agent,
+            "plan_and_execute": arena.create_plan_and_execute_agent,
+            "earth": arena.create_earth_agent,
+            "debate": arena.create_debate_agent,
+            "cot": arena.create_zero_shot_cot_based_agent,
+            "aflow": arena.create_aflow_agent,
+        }[agent_name]
+        factory().run_and_return_tool_trajectory(task["question"])
+    finished_at = time.perf_counter()
+    return finished_at - submitted_at, finished_at - started_at
+
+
+def run_workers(tasks, workers: int, agent_names):
+    """Run all tasks with a given number of workers"""
+    failures = 0
+    latencies = []
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(run_task, task, agent_names, time.perf_counter()) for task in tasks]
+        for future in futures:
+            try:
+                latencies.append(future.result())
+            except Exception as e:
+                print(f"Task failed: {e}")
+                failures += 1
+    elapsed = time.perf_counter() - start
+    end_to_end = [latency[0] for latency in latencies] or [0.0]
+    service = [latency[1] for latency in latencies] or [0.0]
+    return {
+        "workers": workers,
+        "tasks": len(tasks),
+        "failures": failures,
+        "initial_queue_depth": max(0, len(tasks) - workers),
+        "throughput_tasks_per_s": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_latency_s": percentile(end_to_end, 50),
+        "p99_latency_s": percentile(end_to_end, 99),
+        "p50_service_s": percentile(service, 50),
+        "p99_service_s": percentile(service, 99),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Workers versus throughput on the mock LLM backend")
+    parser.add_argument("--task-dir", type=str, default="examples/data_examples/tasks/filtered",
+                        help="Directory containing task files")
+    parser.add_argument("--repeat", type=int, default=20, help="Copies of the task set to run")
+    parser.add_argument("--workers", type=str, default="1,2,4,8,16", help="Comma-separated worker counts")
+    parser.add_argument("--agents", type=str, default="react,cot,aflow",
+                        help=f"Comma-separated agents from {', '.join(AGENT_FACTORIES)}")
+    parser.add_argument("--backend", type=str, default="mock", choices=["mock", "env"],
+                        help="mock forces the in-process mock, env keeps the configured backend")
+    parser.add_argument("--latency", type=float, default=0.2, help="Mock mean latency per call in seconds")
+    parser.add_argument("--latency-distribution", type=str, default="lognormal", help="Mock latency distribution")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Mock error rate")
+    parser.add_argument("--output", type=str, default=None, help="Optional JSON output path")
+    args = parser.parse_args()
+
+    if args.backend == "mock":
+        os.environ["GEOPLAN_LLM_BACKEND"] = "mock"
+        os.environ["GEOPLAN_MOCK_LATENCY"] = str(args.latency)
+        os.environ["GEOPLAN_MOCK_LATENCY_DISTRIBUTION"] = args.latency_distribution
+        os.environ["GEOPLAN_MOCK_ERROR_RATE"] = str(args.error_rate)
+
+    agent_names = [name.strip() for name in args.agents.split(",") if name.strip()]
+    unknown = set(agent_names) - set(AGENT_FACTORIES)
+    if unknown:
+        raise ValueError(f"Unknown agents: {sorted(unknown)}")
+
+    tasks = load_tasks(args.task_dir, sys.maxsize) * args.repeat
+    if not tasks:
+        raise FileNotFoundError(f"No task files found in {args.task_dir}")
+
+    results = [run_workers(tasks, int(workers), agent_names) for workers in args.workers.split(",")]
+    print(json.dumps(results, indent=2))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
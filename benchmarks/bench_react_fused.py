@@ -0,0 +1,110 @@
+"""
+A/B benchmark: fused thought+action ReAct steps versus the two-call loop.
+
+Runs the general ReAct agent on a set of tasks in both modes and reports
+latency, LLM calls, tokens and trajectory quality against the ground truth
+tool flow. Requires a configured LLM endpoint (OPENAI_API_KEY/OPENAI_API_BASE).
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from statistics import mean
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from geoplan_bench.agents.observation import StubObservationProvider
+from geoplan_bench.utils.arena import create_react_agent
+
+
+def load_tasks(task_dir: str, limit: int):
+    """Load up to limit task files from a directory"""
+    tasks = []
+    for filename in sorted(os.listdir(task_dir)):
+        if filename.endswith(".json"):
+            with open(os.path.join(task_dir, filename), "r", encoding="utf-8") as f:
+                tasks.append(json.load(f))
+        if len(tasks) >= limit:
+            break
+    return tasks
+
+
+def overlap_scores(trajectory, ground_truth):
+    """Tool-set precision and recall of a trajectory against the ground truth"""
+    predicted, expected = set(trajectory), set(ground_truth)
+    hits = len(predicted & expected)
+    precision = hits / len(predicted) if predicted else 0.0
+    recall = hits / len(expected) if expected else 0.0
+    return precision, recall
+
+
+def run_mode(tasks, fused: bool, args, structural_evaluator=None):
+    """Run all tasks in one mode and aggregate the measurements"""
+    rows = []
+    for task in tasks:
+        agent = create_react_agent(
+            model=args.model,
+            prompt_layout=args.prompt_layout,
+            fused=fused,
+            observation_provider=StubObservationProvider() if args.stub_observations else None
+        )
+        start = time.perf_counter()
+        trajectory = agent.run_and_return_tool_trajectory(task["question"])
+        latency = time.perf_counter() - start
+        precision, recall = overlap_scores(trajectory, task["ground_truth_tool_flow"])
+        row = {
+            "task_id": task.get("task_id"),
+            "latency_s": latency,
+            "trajectory_length": len(trajectory),
+            "tool_precision": precision,
+            "tool_recall": recall,
+            **agent.usage_stats,
+        }
+        if structural_evaluator is not None:
+            row["tool_flow_similarity"], _ = structural_evaluator.compute_structural_score(
+                trajectory, task["ground_truth_tool_flow"])
+        rows.append(row)
+
+    summary = {key: mean(row[key] for row in rows) for key in rows[0] if key != "task_id"}
+    return {"summary": summary, "tasks": rows}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="A/B benchmark of fused versus two-call ReAct steps")
+    parser.add_argument("--task-dir", type=str, default="examples/data_examples/tasks/filtered",
+                        help="Directory containing task files")
+    parser.add_argument("--limit", type=int, default=10, help="Maximum number of tasks")
+    parser.add_argument("--model", type=str, default="gpt-4o-mini", help="Model name")
+    parser.add_argument("--prompt-layout", type=str, default="inline", choices=["inline", "cached"],
+                        help="ReAct prompt layout")
+    parser.add_argument("--stub-observations", action="store_true",
+                        help="Use stub tool functions instead of LLM-imagined observations")
+    parser.add_argument("--structural", action="store_true",
+                        help="Also report the structural tool flow similarity (loads the embedding model)")
+    parser.add_argument("--output", type=str, default=None, help="Optional JSON output path")
+    args = parser.parse_args()
+
+    tasks = load_tasks(args.task_dir, args.limit)
+    if not tasks:
+        raise FileNotFoundError(f"No task files found in {args.task_dir}")
+
+    structural_evaluator = None
+    if args.structural:
+        from geoplan_bench.evaluation.metrics import StructuralEvaluator
+        structural_evaluator = StructuralEvaluator()
+
+    results = {
+        "two_call": run_mode(tasks, False, args, structural_evaluator),
+        "fused": run_mode(tasks, True, args, structural_evaluator),
+    }
+    print(json.dumps({mode: result["summary"] for mode, result in results.items()}, indent=2))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
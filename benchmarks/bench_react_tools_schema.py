@@ -0,0 +1,76 @@
+"""
+Micro-benchmark: ReAct tools_schema construction and serialization per step.
+
+Compares rebuilding the function-calling schema on every step (previous
+behaviour) with the schema compiled once per agent.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from geoplan_bench.agents.ReAct import ReActAgent
+import geoplan_bench.tools as tools
+
+
+def build_agent() -> ReActAgent:
+    """ReAct agent with the full tool set, as built by create_react_agent"""
+    agent = ReActAgent(api_key="benchmark")
+    for name in tools.__all__:
+        agent.add_tool(getattr(tools, name))
+    return agent
+
+
+def rebuild_schema(agent: ReActAgent) -> list:
+    """Per-step schema construction used before the schema was cached"""
+    return [
+        {
+            "type": "function",
+            "function": {
+                "name": name,
+                "description": info["description"],
+                "parameters": info["parameters"]
+            }
+        }
+        for name, info in agent.tools.items()
+    ]
+
+
+def time_steps(step, steps: int, repeat: int) -> float:
+    """Best-of-repeat wall time of one step, in microseconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(steps):
+            step()
+        best = min(best, (time.perf_counter() - start) / steps)
+    return best * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ReAct tools_schema construction")
+    parser.add_argument("--steps", type=int, default=1000, help="Steps per measurement")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of measurements")
+    args = parser.parse_args()
+
+    agent = build_agent()
+    schema_bytes = len(agent.get_tools_schema_json().encode("utf-8"))
+
+    results = {
+        "tools": len(agent.tools),
+        "schema_bytes_per_step": schema_bytes,
+        "rebuild_us_per_step": time_steps(lambda: rebuild_schema(agent), args.steps, args.repeat),
+        "rebuild_and_serialize_us_per_step": time_steps(
+            lambda: json.dumps(rebuild_schema(agent), ensure_ascii=False), args.steps, args.repeat),
+        "cached_us_per_step": time_steps(agent.get_tools_schema, args.steps, args.repeat),
+        "cached_serialized_us_per_step": time_steps(agent.get_tools_schema_json, args.steps, args.repeat),
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Import-time regression check for geoplan_bench and the CLI scripts.
+
+Every entry point runs in a fresh interpreter with ``-X importtime``. The
+check fails when an entry point loads one of HEAVY_MODULES, which must only be
+imported where they are used, or when the self time of the modules it imports
+(beyond those of a bare interpreter) exceeds its budget:
+
+    python benchmarks/check_import_time.py
+    python benchmarks/check_import_time.py --budget-ms 300 --top 15
+"""
+
+import os
+import re
+import sys
+import argparse
+import subprocess
+from typing import Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (name, interpreter arguments after -X importtime)
+ENTRY_POINTS = [
+    ("import geoplan_bench.llm", ["-c", "import geoplan_bench.llm"]),
+    ("import geoplan_bench.utils", ["-c", "import geoplan_bench.utils"]),
+    ("import geoplan_bench.pipeline", ["-c", "import geoplan_bench.pipeline"]),
+    ("import geoplan_bench.evaluation.metrics", ["-c", "import geoplan_bench.evaluation.metrics"]),
+    ("import geoplan_bench.utils.importance", ["-c", "import geoplan_bench.utils.importance"]),
+    ("import geoplan_bench.pipeline.task_validation", ["-c", "import geoplan_bench.pipeline.task_validation"]),
+    ("scripts/evaluate.py --help", [os.path.join("scripts", "evaluate.py"), "--help"]),
+    ("scripts/generate_tasks.py --help", [os.path.join("scripts", "generate_tasks.py"), "--help"]),
+    ("scripts/filter_tasks.py --help", [os.path.join("scripts", "filter_tasks.py"), "--help"]),
+    ("scripts/cot_batch.py --help", [os.path.join("scripts", "cot_batch.py"), "--help"]),
+]
+
+# imported lazily, where they are used
+HEAVY_MODULES = ("matplotlib", "sentence_transformers", "sklearn", "torch", "transformers", "scipy",
+                 "openai", "google.genai")
+
+_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$')
+
+
+def import_times(args: List[str]) -> Tuple[Dict[str, int], str]:
+    """({module: self time in microseconds}, error output) of one interpreter run"""
+    result = subprocess.run([sys.executable, "-X", "importtime"] + args, cwd=ROOT, capture_output=True, text=True,
+                            env=dict(os.environ, PYTHONPATH=ROOT, PYTHONDONTWRITEBYTECODE="1"))
+    times, errors = {}, []
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            times[match.group(4)] = int(match.group(1))
+        elif not line.startswith("import time:"):
+            errors.append(line)
+    return times, "\n".join(errors) if result.returncode else ""
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check geoplan_bench import times")
+    parser.add_argument("--budget-ms", type=float, default=400.0,
+                        help="Largest import time allowed per entry point, on top of a bare interpreter")
+    parser.add_argument("--top", type=int, default=0, help="Print the N slowest modules of every entry point")
+    args = parser.parse_args()
+
+    baseline, _ = import_times(["-c", "pass"])
+    failures = []
+    for name, entry_args in ENTRY_POINTS:
+        times, errors = import_times(entry_args)
+        if errors:
+            print(f"{name:<50} error\n{errors}")
+            failures.append(name)
+            continue
+        added = {module: us for module, us in times.items() if module not in baseline}
+        total_ms = sum(added.values()) / 1000
+        heavy = sorted({heavy for heavy in HEAVY_MODULES
+                        for module in added if module == heavy or module.startswith(heavy + ".")})
+        status = "ok"
+        if heavy:
+            status = f"loads {', '.join(heavy)}"
+        elif total_ms > args.budget_ms:
+            status = f"over budget ({args.budget_ms:.0f} ms)"
+        if status != "ok":
+            failures.append(name)
+        print(f"{name:<50} {total_ms:8.1f} ms  {len(added):5d} modules  {status}")
+        for module, us in sorted(added.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+            print(f"    {module:<60} {us / 1000:8.1f} ms")
+
+    if failures:
+        print(f"\n{len(failures)} entry points failed the import-time check")
+        sys.exit(1)
+    print("\nAll entry points within the import-time budget")
+
+
+if __name__ == "__main__":
+    main()
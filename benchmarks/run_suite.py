@@ -0,0 +1,193 @@
+"""
+Run the benchmark suite in benchmarks/suite and record results to JSON.
+
+Every case (benchmark method and parameter value) runs in its own process,
+from a temporary working directory, with the mock LLM backend and stdout
+silenced. A case that exceeds its timeout is recorded as such instead of
+blocking the run. Results are written to benchmarks/results/ with the git
+commit, so regressions are visible between commits:
+
+    python benchmarks/run_suite.py
+    python benchmarks/run_suite.py --bench LongestPaths --compare benchmarks/results/<previous>.json
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import shutil
+import inspect
+import tempfile
+import platform
+import argparse
+import importlib
+import itertools
+import subprocess
+import multiprocessing
+from statistics import median
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+SUITE_DIR = os.path.join(ROOT, "benchmarks", "suite")
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+
+
+def discover(pattern: str = None):
+    """Yield (case name, module name, class name, method name, params) for every case"""
+    for filename in sorted(os.listdir(SUITE_DIR)):
+        if not (filename.startswith("bench_") and filename.endswith(".py")):
+            continue
+        module_name = f"benchmarks.suite.{filename[:-3]}"
+        module = importlib.import_module(module_name)
+        for class_name, cls in inspect.getmembers(module, inspect.isclass):
+            if cls.__module__ != module_name:
+                continue
+            params = getattr(cls, "params", [None])
+            if params and isinstance(params[0], (list, tuple)):
+                combinations = list(itertools.product(*params))
+            else:
+                combinations = [(param,) for param in params]
+            for method_name in sorted(name for name in dir(cls) if name.startswith("time_")):
+                for combination in combinations:
+                    args = ", ".join(repr(param) for param in combination if param is not None)
+                    case_name = f"{filename[:-3]}.{class_name}.{method_name}({args})"
+                    if pattern and not re.search(pattern, case_name):
+                        continue
+                    yield case_name, module_name, class_name, method_name, combination
+
+
+def _run_case(module_name, class_name, method_name, combination, queue):
+    """Child process body: setup once, then time the method ``repeat`` times"""
+    workdir = tempfile.mkdtemp()
+    os.chdir(workdir)
+    os.environ.setdefault("GEOPLAN_LLM_BACKEND", "mock")
+    sys.stdout = open(os.devnull, "w")
+    args = [param for param in combination if param is not None]
+    try:
+        cls = getattr(importlib.import_module(module_name), class_name)
+        benchmark = cls()
+        if hasattr(benchmark, "setup"):
+            benchmark.setup(*args)
+        try:
+            samples = []
+            for _ in range(getattr(cls, "repeat", 3)):
+                start = time.perf_counter()
+                getattr(benchmark, method_name)(*args)
+                samples.append(time.perf_counter() - start)
+        finally:
+            if hasattr(benchmark, "teardown"):
+                benchmark.teardown(*args)
+        queue.put({"status": "ok", "samples": samples})
+    except NotImplementedError as e:
+        queue.put({"status": "skipped", "reason": str(e)})
+    except Exception as e:
+        queue.put({"status": "failed", "reason": f"{type(e).__name__}: {e}"})
+    finally:
+        os.chdir(ROOT)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def run_case(module_name, class_name, method_name, combination, timeout: float):
+    """Run one case in a child process and summarize its samples"""
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(
+        target=_run_case, args=(module_name, class_name, method_name, combination, queue))
+    process.start()
+    process.join(timeout)
+    if process.is_alive():
+        process.terminate()
+        process.join()
+        return {"status": "timeout", "timeout_s": timeout}
+    if queue.empty():
+        return {"status": "failed", "reason": f"exit code {process.exitcode}"}
+    result = queue.get()
+    if result["status"] == "ok":
+        samples = result["samples"]
+        result.update({"min_s": min(samples), "median_s": median(samples), "max_s": max(samples)})
+    return result
+
+
+def git_commit():
+    """(commit hash, dirty flag) of the working tree, or (None, None) outside git"""
+    try:
+        commit = subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=ROOT, text=True).strip()
+        dirty = bool(subprocess.check_output(
+            ["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT, text=True).strip())
+        return commit, dirty
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+
+
+def compare(results, baseline_path: str, threshold: float):
+    """Print the median ratio against a previous result file, return the regressed cases"""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+    regressions = []
+    for case_name, result in results.items():
+        previous = baseline.get(case_name, {})
+        if result.get("status") != "ok" or previous.get("status") != "ok":
+            continue
+        ratio = result["median_s"] / previous["median_s"] if previous["median_s"] else float("inf")
+        flag = ""
+        if ratio > threshold:
+            flag = "  REGRESSION"
+            regressions.append(case_name)
+        elif ratio < 1 / threshold:
+            flag = "  improved"
+        print(f"{case_name:<80} {previous['median_s']:>10.4f}s -> {result['median_s']:>10.4f}s  x{ratio:.2f}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the GeoPlan-bench benchmark suite")
+    parser.add_argument("--bench", type=str, default=None, help="Regex selecting case names")
+    parser.add_argument("--quick", action="store_true", help="Only run the first parameter value of each benchmark")
+    parser.add_argument("--timeout", type=float, default=None, help="Override the per-case timeout in seconds")
+    parser.add_argument("--output", type=str, default=None, help="Result file, defaults to benchmarks/results/")
+    parser.add_argument("--compare", type=str, default=None, help="Previous result file to compare against")
+    parser.add_argument("--threshold", type=float, default=1.2, help="Median slowdown ratio counted as a regression")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit with status 1 on a regression")
+    args = parser.parse_args()
+
+    results = {}
+    seen_classes = set()
+    for case_name, module_name, class_name, method_name, combination in discover(args.bench):
+        key = (module_name, class_name, method_name)
+        if args.quick and key in seen_classes:
+            continue
+        seen_classes.add(key)
+        cls = getattr(importlib.import_module(module_name), class_name)
+        timeout = args.timeout or getattr(cls, "timeout", 600)
+        results[case_name] = run_case(module_name, class_name, method_name, combination, timeout)
+        result = results[case_name]
+        detail = f"{result['median_s']:.4f}s" if result["status"] == "ok" else result.get("reason", "")
+        print(f"{case_name:<80} {result['status']:<8} {detail}")
+
+    commit, dirty = git_commit()
+    record = {
+        "commit": commit,
+        "dirty": dirty,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "results": results,
+    }
+    output = args.output
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"{time.strftime('%Y%m%d_%H%M%S')}_{(commit or 'nogit')[:8]}.json")
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(record, f, ensure_ascii=False, indent=2)
+    print(f"Results saved to {output}")
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold)
+        if regressions and args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,21 @@
+"""
+Benchmark suite for the GeoPlan-bench harness itself.
+
+Each ``bench_*.py`` module holds asv-style benchmark classes:
+
+- ``params`` / ``param_names``: parameter values (a list, or a list of lists for a grid)
+- ``setup(*params)``: prepares the case, raising NotImplementedError skips it
+- ``time_*(*params)``: timed methods
+- ``repeat`` and ``timeout``: samples per case and seconds before the case is abandoned
+
+Run with ``python benchmarks/run_suite.py``, which records results to JSON.
+"""
+
+import importlib.util
+
+
+def require(*modules: str):
+    """Skip the case unless the optional modules are installed; the package imports them lazily"""
+    missing = [module for module in modules if importlib.util.find_spec(module) is None]
+    if missing:
+        raise NotImplementedError(f"Missing optional dependencies: {', '.join(missing)}")
@@ -0,0 +1,39 @@
+"""
+Agent construction: equipping agents from the prebuilt ToolRegistry versus
+registering every tool through add_tool, and building the full arena.
+"""
+
+import os
+
+
+class ArenaConstruction:
+    repeat = 5
+    timeout = 300
+
+    def setup(self):
+        os.environ["GEOPLAN_LLM_BACKEND"] = "mock"
+        try:
+            from geoplan_bench.agents.ReAct import ReActAgent
+            from geoplan_bench.tools.registry import get_tool_registry
+            from geoplan_bench.utils import arena
+        except Exception as e:
+            raise NotImplementedError(f"Agents unavailable: {e}")
+        self.agent_class = ReActAgent
+        self.arena = arena
+        self.registry = get_tool_registry()
+        self.funcs = [entry["func"] for entry in self.registry.tools.values()]
+
+    def time_add_tool(self):
+        agent = self.agent_class(api_key="benchmark")
+        for func in self.funcs:
+            agent.add_tool(func)
+        agent.get_tools_info()
+
+    def time_set_tools(self):
+        agent = self.agent_class(api_key="benchmark")
+        agent.set_tools(self.registry.subset())
+        agent.get_tools_info()
+
+    def time_create_arena(self):
+        self.arena.create_arena()
+        self.arena.create_aflow_agent()
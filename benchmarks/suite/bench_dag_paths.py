@@ -0,0 +1,23 @@
+"""
+ToolFlowGenerator._find_longest_paths_with_networkx on large synthetic DAGs.
+"""
+
+from benchmarks.suite.synthetic import synthetic_dag
+
+
+class LongestPaths:
+    params = [50, 200, 1000, 5000]
+    param_names = ["num_nodes"]
+    repeat = 3
+    timeout = 300
+
+    def setup(self, num_nodes):
+        try:
+            from geoplan_bench.pipeline.task_generation import ToolFlowGenerator
+        except Exception as e:
+            raise NotImplementedError(f"ToolFlowGenerator unavailable: {e}")
+        self.generator = ToolFlowGenerator()
+        self.dag = synthetic_dag(num_nodes)
+
+    def time_find_longest_paths(self, num_nodes):
+        self.generator._find_longest_paths_with_networkx(self.dag)
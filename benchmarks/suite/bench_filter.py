@@ -0,0 +1,33 @@
+"""
+filter_tasks on synthetic task corpora.
+"""
+
+import os
+import shutil
+import tempfile
+
+from benchmarks.suite import require
+from benchmarks.suite.synthetic import synthetic_tasks, write_tasks
+
+
+class FilterTasks:
+    params = [1000, 10000, 100000]
+    param_names = ["num_tasks"]
+    repeat = 1
+    timeout = 1800
+
+    def setup(self, num_tasks):
+        require("sentence_transformers", "sklearn")
+        try:
+            from geoplan_bench.pipeline.task_validation import filter_tasks
+        except Exception as e:
+            raise NotImplementedError(f"filter_tasks unavailable: {e}")
+        self.filter_tasks = filter_tasks
+        self.root = tempfile.mkdtemp()
+        self.task_dir = write_tasks(synthetic_tasks(num_tasks), os.path.join(self.root, "raw"))
+
+    def teardown(self, num_tasks):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def time_filter_tasks(self, num_tasks):
+        self.filter_tasks(self.task_dir)
@@ -0,0 +1,23 @@
+"""
+Tool flow near-duplicate removal with the MinHash/LSH index.
+"""
+
+from benchmarks.suite.synthetic import synthetic_tasks
+
+
+class FlowMinHash:
+    params = [1000, 10000, 100000]
+    param_names = ["num_tasks"]
+    repeat = 1
+    timeout = 600
+
+    def setup(self, num_tasks):
+        try:
+            from geoplan_bench.pipeline.flow_minhash import dedupe_tool_flows
+        except Exception as e:
+            raise NotImplementedError(f"dedupe_tool_flows unavailable: {e}")
+        self.dedupe_tool_flows = dedupe_tool_flows
+        self.tasks = synthetic_tasks(num_tasks)
+
+    def time_dedupe_tool_flows(self, num_tasks):
+        self.dedupe_tool_flows(self.tasks)
@@ -0,0 +1,54 @@
+"""
+ToolImportanceAnalyzer graph construction and importance scoring.
+"""
+
+from benchmarks.suite import require
+from benchmarks.suite.synthetic import synthetic_tasks
+
+
+class ToolImportance:
+    params = [1000, 10000, 100000]
+    param_names = ["num_tasks"]
+    repeat = 3
+    timeout = 900
+
+    def setup(self, num_tasks):
+        try:
+            from geoplan_bench.utils.importance import ToolImportanceAnalyzer
+        except Exception as e:
+            raise NotImplementedError(f"ToolImportanceAnalyzer unavailable: {e}")
+        self.analyzer_class = ToolImportanceAnalyzer
+        self.tasks = synthetic_tasks(num_tasks)
+        self.analyzer = ToolImportanceAnalyzer()
+        self.analyzer.build_graph_from_tool_flows(self.tasks)
+
+    def time_build_graph(self, num_tasks):
+        self.analyzer_class().build_graph_from_tool_flows(self.tasks)
+
+    def time_calculate_importance(self, num_tasks):
+        self.analyzer.calculate_tool_importance()
+
+
+class WideToolImportance:
+    """Importance over tens of thousands of nodes, e.g. parameterized tool variants"""
+    params = [[1000, 20000], ["networkx", "scipy"]]
+    param_names = ["num_nodes", "backend"]
+    repeat = 3
+    timeout = 900
+
+    def setup(self, num_nodes, backend):
+        if backend == "scipy":
+            require("scipy")
+        try:
+            from geoplan_bench.utils.importance import ToolImportanceAnalyzer
+        except Exception as e:
+            raise NotImplementedError(f"ToolImportanceAnalyzer unavailable: {e}")
+        tasks = synthetic_tasks(3 * num_nodes)
+        for index, task in enumerate(tasks):
+            task["ground_truth_tool_flow"] = [f"{tool}#{(index + position) % (num_nodes // 50 or 1)}"
+                                              for position, tool in enumerate(task["ground_truth_tool_flow"])]
+        self.analyzer = ToolImportanceAnalyzer(backend=backend)
+        self.analyzer.build_graph_from_tool_flows(tasks)
+
+    def time_calculate_importance(self, num_nodes, backend):
+        self.analyzer.calculate_tool_importance()
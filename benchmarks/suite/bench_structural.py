@@ -0,0 +1,51 @@
+"""
+StructuralEvaluator.calculate_tool_flow_similarity on synthetic tool flows.
+"""
+
+import random
+
+from benchmarks.suite import require
+from benchmarks.suite.synthetic import tool_names
+
+_evaluator = None
+
+
+def get_evaluator():
+    """The evaluator loads the embedding model, so it is built once per process"""
+    global _evaluator
+    if _evaluator is None:
+        require("sentence_transformers", "sklearn")
+        try:
+            from geoplan_bench.evaluation.metrics.structural import StructuralEvaluator
+            _evaluator = StructuralEvaluator()
+        except Exception as e:
+            raise NotImplementedError(f"StructuralEvaluator unavailable: {e}")
+    # uniform tool costs, so no importance analysis is triggered
+    _evaluator._tool_cost_cache = {}
+    _evaluator._importance_analysis = {"tool_importance_scores": {}}
+    return _evaluator
+
+
+class StructuralSimilarity:
+    params = [10, 30, 60]
+    param_names = ["flow_length"]
+    repeat = 5
+    timeout = 600
+
+    def setup(self, flow_length):
+        self.evaluator = get_evaluator()
+        rng = random.Random(flow_length)
+        names = tool_names()
+        self.pairs = [
+            (rng.sample(names, flow_length), rng.sample(names, flow_length))
+            for _ in range(20)
+        ]
+
+    def time_similarity_cold(self, flow_length):
+        self.evaluator.tool_similarity_cache = {}
+        for agent_flow, ground_truth_flow in self.pairs:
+            self.evaluator.calculate_tool_flow_similarity(agent_flow, ground_truth_flow)
+
+    def time_similarity_warm(self, flow_length):
+        for agent_flow, ground_truth_flow in self.pairs:
+            self.evaluator.calculate_tool_flow_similarity(agent_flow, ground_truth_flow)
@@ -0,0 +1,78 @@
+"""
+Synthetic corpora for the benchmark suite.
+"""
+
+import os
+import json
+import random
+import inspect
+from uuid import UUID
+from typing import Dict, List
+
+from geoplan_bench.config.constants import COMPLEXITIES, DOMAIN_KEYWORDS, DOMAINS
+
+QUESTION_TEMPLATES = [
+    "How has the {keyword} situation changed around site {site} over the past {years} years?",
+    "Which parts of region {site} show the strongest {keyword} signal since {year}?",
+    "Estimate the {keyword} extent in district {site} and compare it with {year}.",
+    "Where should monitoring of {keyword} be prioritized within zone {site} for the next {years} years?",
+]
+
+
+def tool_names() -> List[str]:
+    import geoplan_bench.tools as tools
+    return [name for name, obj in inspect.getmembers(tools, inspect.isfunction) if not name.startswith('_')]
+
+
+def synthetic_tasks(num_tasks: int, seed: int = 0) -> List[Dict]:
+    """
+    Tasks in the generated-task format. Questions contain a keyword of their
+    domain so they pass the domain filter, and some are exact duplicates so
+    the semantic deduplication has work to do.
+    """
+    rng = random.Random(seed)
+    names = tool_names()
+    tasks = []
+    for index in range(num_tasks):
+        domain = rng.choice(DOMAINS)
+        complexity = rng.choice(COMPLEXITIES)
+        keyword = rng.choice(DOMAIN_KEYWORDS.get(domain) or [domain.lower()])
+        if tasks and rng.random() < 0.05:
+            question = rng.choice(tasks)["question"]
+        else:
+            question = rng.choice(QUESTION_TEMPLATES).format(
+                keyword=keyword, site=rng.randint(1, 10 ** 6), years=rng.randint(2, 30), year=rng.randint(1990, 2024))
+        length = rng.randint(10, 20) if complexity == "Complex" else rng.randint(3, 12)
+        tasks.append({
+            "task_id": str(UUID(int=rng.getrandbits(128))),
+            "dag_template_filename": "synthetic.json",
+            "complexity": complexity,
+            "domain": domain,
+            "question": question,
+            "ground_truth_tool_flow": rng.sample(names, length),
+        })
+    return tasks
+
+
+def write_tasks(tasks: List[Dict], task_dir: str) -> str:
+    """Write one JSON file per task, as the generation pipeline does"""
+    os.makedirs(task_dir, exist_ok=True)
+    for task in tasks:
+        with open(os.path.join(task_dir, f"task_{task['task_id']}.json"), "w", encoding="utf-8") as f:
+            json.dump(task, f, ensure_ascii=False)
+    return task_dir
+
+
+def synthetic_dag(num_nodes: int, out_degree: int = 3, window: int = 20, seed: int = 0) -> Dict:
+    """
+    Random DAG template: node i links to up to out_degree nodes among the next
+    window nodes, so edges always point forward.
+    """
+    rng = random.Random(seed)
+    nodes = [f"tool_{index}" for index in range(num_nodes)]
+    edges = []
+    for index in range(num_nodes - 1):
+        targets = range(index + 1, min(num_nodes, index + 1 + window))
+        for target in rng.sample(list(targets), min(out_degree, len(targets))):
+            edges.append([nodes[index], nodes[target]])
+    return {"domain": "synthetic", "nodes": nodes, "edges": edges, "description": "synthetic"}
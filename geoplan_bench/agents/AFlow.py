@@ -1,139 +1,225 @@
-import os
-import inspect
 import ast
 import re
-from typing import Callable
-from openai import OpenAI
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional
+from geoplan_bench.llm import BudgetExceeded, create_openai_client, propagate_context
 from dotenv import load_dotenv
 
+from geoplan_bench.agents.usage import UsageTracker
+from geoplan_bench.data.schemas import ToolFlowSchema
+from geoplan_bench.evaluation.edit_distance import load_tool_costs, medoid_index
+from geoplan_bench.tools.registry import ToolSet, add_tool_entry, tools_catalogue
+
 load_dotenv()
 
+# "chain": generate, refine, verify, ensemble, validate and format as six sequential calls
+# "structured": num_samples concurrent schema-constrained generations plus one ensemble call
+AFLOW_MODES = ("chain", "structured")
+# "llm": SC_ENSEMBLE_PROMPT round-trip, "local": edit-distance medoid of the candidates
+ENSEMBLE_METHODS = ("llm", "local")
+
 
 class AFlowAgent:
-    def __init__(self, model="gpt-4o-mini"):
-        self.client = OpenAI(
-            api_key=os.getenv("OPENAI_API_KEY"),
-            base_url=os.getenv("OPENAI_API_BASE")
-        )
+    def __init__(self, model="gpt-4o-mini", mode="chain", num_samples=3, sample_temperature=0.7,
+                 ensemble="llm", tool_costs=None):
+        if mode not in AFLOW_MODES:
+            raise ValueError(f"Unknown AFlow mode: {mode}, expected one of {AFLOW_MODES}")
+        if ensemble not in ENSEMBLE_METHODS:
+            raise ValueError(f"Unknown ensemble method: {ensemble}, expected one of {ENSEMBLE_METHODS}")
+        if num_samples < 1:
+            raise ValueError(f"num_samples must be at least 1, got {num_samples}")
+        self.client = create_openai_client()
         self.model = model
         self.tools = {}
         self.agent_type = "AFlow"
+        self.mode = mode
+        # Number of independent generations voted on in structured mode
+        self.num_samples = num_samples
+        self.sample_temperature = sample_temperature
+        self.ensemble = ensemble
+        # Insertion/deletion cost per tool for the local ensemble, loaded from the
+        # tool importance analysis on first use when not given
+        self.tool_costs = tool_costs
+        self.usage = UsageTracker()
+        self.usage_stats = self.usage.summary()
+        self.partial_tool_flow = []
     def add_tool(self, func: Callable):
         """Add tool, automatically extract information from function"""
-        # Get function name
-        name = func.__name__
-        
-        # Get docstring as description
-        description = func.__doc__ or f"Execute {name} function"
-        
-        # Get function signature
-        sig = inspect.signature(func)
-        parameters = {
-            "type": "object",
-            "properties": {},
-            "required": []
-        }
-        
-        # Analyze parameters
-        for param_name, param in sig.parameters.items():
-            # Skip self parameter
-            if param_name == 'self':
+        self.tools = add_tool_entry(self.tools, func)
+
+    def set_tools(self, tools: ToolSet):
+        """Use a prebuilt ToolSet (see ToolRegistry.subset), replacing the current tools"""
+        self.tools = tools
+
+    def get_tools_info(self) -> str:
+        return tools_catalogue(self.tools)
+
+    def _create_completion(self, prompt: str, temperature: float = 0.3) -> str:
+        """Create a chat completion, record its token usage and return the content"""
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=temperature
+        )
+        self.usage.record(response)
+        return response.choices[0].message.content
+
+    def run_and_return_tool_trajectory(self, question: str) -> List[str]:
+        """Run the workflow of the configured mode and keep its token usage in ``usage_stats``"""
+        self.usage.reset()
+        # best tool flow so far, returned when a budget stops the workflow
+        self.partial_tool_flow = []
+        try:
+            if self.mode == "structured":
+                return self._run_structured(question)
+            return self._run_chain(question)
+        except BudgetExceeded as e:
+            print(f"AFlow stopped: {e.reason}")
+            return self.partial_tool_flow
+        finally:
+            self.usage_stats = self.usage.summary()
+
+    def _ensemble(self, solutions: list) -> Optional[int]:
+        """Select the most consistent solution, return its index or None"""
+        if self.ensemble == "local":
+            return self._local_ensemble(solutions)
+        return self._llm_ensemble(solutions)
+
+    def _extract_tool_flow(self, solution: str) -> List[str]:
+        """Tool names of a free-text solution, preferring its last list literal"""
+        for literal in reversed(re.findall(r'\[[^\[\]]*\]', solution or "")):
+            try:
+                tool_flow = ast.literal_eval(literal)
+            except (ValueError, SyntaxError):
                 continue
-                
-            param_type = "string"  # Default type
-            if param.annotation != inspect.Parameter.empty:
-                # Set type based on type annotation
-                if param.annotation == int:
-                    param_type = "integer"
-                elif param.annotation == float:
-                    param_type = "number"
-                elif param.annotation == bool:
-                    param_type = "boolean"
-            
-            parameters["properties"][param_name] = {
-                "type": param_type,
-                "description": f"{param_name} parameter"
-            }
-            
-            # If no default value, then required parameter
-            if param.default == inspect.Parameter.empty:
-                parameters["required"].append(param_name)
-        
-        self.tools[name] = {"func": func, "description": description, "parameters": parameters}
-    def run_and_return_tool_trajectory(self, question: str) -> str:
+            if isinstance(tool_flow, list):
+                return [str(tool) for tool in tool_flow]
+        return [name for name in re.findall(r'[A-Za-z_][A-Za-z0-9_]*', solution or "") if name in self.tools]
+
+    def _local_ensemble(self, solutions: list) -> int:
+        """Pick the medoid candidate under the structural metric's edit cost model"""
+        if self.tool_costs is None:
+            self.tool_costs = load_tool_costs()
+        tool_flows = [
+            solution if isinstance(solution, list) else self._extract_tool_flow(solution)
+            for solution in solutions
+        ]
+        return medoid_index(tool_flows, self.tool_costs)
+
+    def _llm_ensemble(self, solutions: list) -> Optional[int]:
+        """Ask the LLM for the most consistent solution, return its index or None"""
+        from geoplan_bench.config.prompts import SC_ENSEMBLE_PROMPT
+
+        solution_text = ""
+        for index, solution in enumerate(solutions):
+            solution_text += f"{chr(65 + index)}: \n{str(solution)}\n\n\n"
+
+        prompt = SC_ENSEMBLE_PROMPT.format(solutions=solution_text)
+        response = self._create_completion(prompt)
+        try:
+          # response format:"""
+          # ...
+          # **solution_letter**: A
+          # """
+          letters = "".join(chr(65 + index) for index in range(len(solutions)))
+          ensemble_solution_answer_letter = re.search(f'[{letters}]', response.split("solution_letter")[-1].strip()).group()
+          return ord(ensemble_solution_answer_letter) - 65
+        except:
+          print("Error in ensemble solution")
+          return None
+
+    def _generate_tool_flow(self, prompt: str) -> Optional[List[str]]:
+        """One schema-constrained generation, restricted to registered tools"""
+        try:
+            response = self.client.beta.chat.completions.parse(
+                model=self.model,
+                messages=[{"role": "user", "content": prompt}],
+                response_format=ToolFlowSchema,
+                temperature=self.sample_temperature
+            )
+        except BudgetExceeded:
+            raise
+        except Exception as e:
+            print(f"Error in structured generation: {e}")
+            return None
+        self.usage.record(response)
+        parsed = response.choices[0].message.parsed
+        if parsed is None:
+            return None
+        return [tool for tool in parsed.tool_flow if tool in self.tools]
+
+    def _run_structured(self, question: str) -> List[str]:
+        """
+        Sample num_samples tool flows concurrently with structured outputs and
+        pick one by self-consistency. Validation and formatting are covered by
+        the prompt rules and the response schema.
+        """
+        from geoplan_bench.config.prompts import STRUCTURED_TOOL_FLOW_PROMPT
+
+        prompt = STRUCTURED_TOOL_FLOW_PROMPT.format(input=question, tools=self.get_tools_info())
+        with ThreadPoolExecutor(max_workers=self.num_samples) as executor:
+            generate = propagate_context(lambda _: self._generate_tool_flow(prompt))
+            futures = [executor.submit(generate, sample) for sample in range(self.num_samples)]
+        tool_flows, budget_error = [], None
+        for future in futures:
+            try:
+                tool_flows.append(future.result())
+            except BudgetExceeded as e:
+                budget_error = e
+        if budget_error is not None:
+            # samples that finished before the budget ran out are the partial result
+            self.partial_tool_flow = next((tool_flow for tool_flow in tool_flows if tool_flow), [])
+            raise budget_error
+
+        candidates = [tool_flow for tool_flow in tool_flows if tool_flow]
+        if not candidates:
+            return []
+        self.partial_tool_flow = candidates[0]
+        # Identical candidates need no vote
+        if len(candidates) == 1 or all(tool_flow == candidates[0] for tool_flow in candidates):
+            return candidates[0]
+
+        index = self._ensemble(candidates)
+        if index is None or index >= len(candidates):
+            return candidates[0]
+        return candidates[index]
+
+    def _run_chain(self, question: str) -> List[str]:
         """
         Implementation of the workflow
         """
         from geoplan_bench.config.prompts import (
             ANSWER_GENERATION_PROMPT, REFINE_PROMPT, VERIFY_PROMPT,
-            SC_ENSEMBLE_PROMPT, VALIDATE_FORMAT_PROMPT, FORMAT_PROMPT
+            VALIDATE_FORMAT_PROMPT, FORMAT_PROMPT
         )
         
-        tools_info = "\n".join([
-            f"- {name}: {info['description']}" 
-            for name, info in self.tools.items()
-        ])
+        tools_info = self.get_tools_info()
         initial_prompt = question+"\nYou must choose the tools below to output the best tool flow that can solve the problen with the format:['tool1_name','tool2_name','tool3_name'......].Only output the tool flow, do not output any other text.Tools you can choose from:\n "+"\n".join(tools_info)
         # Generate initial solution
-        initial_solution =self.client.chat.completions.create(
-            model=self.model,
-            messages=[{"role": "user", "content": ANSWER_GENERATION_PROMPT.format(input=initial_prompt)}],
-            temperature=0.3
-        ).choices[0].message.content
+        initial_solution =self._create_completion(ANSWER_GENERATION_PROMPT.format(input=initial_prompt))
+        self.partial_tool_flow = self._extract_tool_flow(initial_solution)
         
         # Get refined solution with custom operator
-        refined_solution = self.client.chat.completions.create(
-            model=self.model,
-            messages=[{"role": "user", "content": initial_prompt+f"\nInitial solution: {initial_solution}"+REFINE_PROMPT}],
-            temperature=0.3
-        ).choices[0].message.content
+        refined_solution = self._create_completion(initial_prompt+f"\nInitial solution: {initial_solution}"+REFINE_PROMPT)
+        self.partial_tool_flow = self._extract_tool_flow(refined_solution)
         
         # Verify essential tools
-        verified_solution = self.client.chat.completions.create(
-            model=self.model,
-            messages=[{"role": "user", "content": initial_prompt+f"\nCurrent solution: {refined_solution}"+VERIFY_PROMPT}],
-            temperature=0.3
-        ).choices[0].message.content
+        verified_solution = self._create_completion(initial_prompt+f"\nCurrent solution: {refined_solution}"+VERIFY_PROMPT)
+        self.partial_tool_flow = self._extract_tool_flow(verified_solution)
 
         # Ensemble the solutions
         solutions = [initial_solution, refined_solution, verified_solution]
-        answer_mapping = {}
-        solution_text = ""
-        for index, solution in enumerate(solutions):
-            answer_mapping[chr(65 + index)] = index
-            solution_text += f"{chr(65 + index)}: \n{str(solution)}\n\n\n"
-
-        prompt = SC_ENSEMBLE_PROMPT.format(solutions=solution_text)
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.3
-        ).choices[0].message.content
-        try:
-          # response format:"""
-          # ...
-          # **solution_letter**: A
-          # """
-          ensemble_solution_answer_letter = re.search(r'[ABC]', response.split("solution_letter")[-1].strip()).group()
-          letter_to_index_dict={'A':0,'B':1,'C':2}
-          ensemble_solution_answer_index = letter_to_index_dict[ensemble_solution_answer_letter]
-          ensemble_solution_answer = solutions[ensemble_solution_answer_index]
-        except:
-          print("Error in ensemble solution")
+        ensemble_solution_answer_index = self._ensemble(solutions)
+        if ensemble_solution_answer_index is None:
           ensemble_solution_answer = verified_solution
+        else:
+          ensemble_solution_answer = solutions[ensemble_solution_answer_index]
           
         # Validate format and preprocessing steps
-        validated_solution = self.client.chat.completions.create(
-            model=self.model,
-            messages=[{"role": "user", "content": f"\nCurrent solution: {ensemble_solution_answer}"+VALIDATE_FORMAT_PROMPT}],
-            temperature=0.3
-        ).choices[0].message.content
+        validated_solution = self._create_completion(f"\nCurrent solution: {ensemble_solution_answer}"+VALIDATE_FORMAT_PROMPT)
+        self.partial_tool_flow = self._extract_tool_flow(validated_solution)
         
         # Final formatting
-        formatted_solution = self.client.chat.completions.create(
-            model=self.model,
-            messages=[{"role": "user", "content": f"\nCurrent solution: {validated_solution}"+FORMAT_PROMPT}],
-            temperature=0.3
-        ).choices[0].message.content
+        formatted_solution = self._create_completion(f"\nCurrent solution: {validated_solution}"+FORMAT_PROMPT)
         
         return ast.literal_eval(formatted_solution)
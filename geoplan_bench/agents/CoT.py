@@ -1,64 +1,35 @@
-from openai import OpenAI
-import os
-import inspect
-from typing import Callable, List
+from geoplan_bench.llm import create_openai_client
+import json
+from typing import Callable, Dict, List, Optional
 from dotenv import load_dotenv
 
+from geoplan_bench.data.schemas import CoTBatchSchema
+from geoplan_bench.tools.registry import ToolSet, add_tool_entry, tools_catalogue
+
 load_dotenv()
 
 
 class ZeroShotCoTBasedAgent:
     def __init__(self, model="gpt-4o-mini"):
-        self.client = OpenAI(
-            api_key=os.getenv("OPENAI_API_KEY"),
-            base_url=os.getenv("OPENAI_API_BASE")
-        )
+        self.client = create_openai_client()
         self.model = model
         self.tools = {}
         self.agent_type = "CoT" 
         
     def add_tool(self, func: Callable):
-        name = func.__name__
-        
-        description = func.__doc__ or f"Execute {name} function"
-
-        sig = inspect.signature(func)
-        parameters = {
-            "type": "object",
-            "properties": {},
-            "required": []
-        }
-        
-        for param_name, param in sig.parameters.items():
-       
-            if param_name == 'self':
-                continue
-                
-            param_type = "string" 
-            if param.annotation != inspect.Parameter.empty:
-                if param.annotation == int:
-                    param_type = "integer"
-                elif param.annotation == float:
-                    param_type = "number"
-                elif param.annotation == bool:
-                    param_type = "boolean"
-            
-            parameters["properties"][param_name] = {
-                "type": param_type,
-                "description": f"{param_name} parameter"
-            }
-            
-            if param.default == inspect.Parameter.empty:
-                parameters["required"].append(param_name)
-        
-        self.tools[name] = {"func": func, "description": description, "parameters": parameters}
+        """Add tool, automatically extract information from function"""
+        self.tools = add_tool_entry(self.tools, func)
+
+    def set_tools(self, tools: ToolSet):
+        """Use a prebuilt ToolSet (see ToolRegistry.subset), replacing the current tools"""
+        self.tools = tools
     
+    def get_tools_info(self) -> str:
+        return tools_catalogue(self.tools)
+
     def get_cot_prompt(self, query: str) -> str:
         """Generate CoT prompt"""
-        tools_info = "\n".join([
-            f"- {name}: {info['description']}" 
-            for name, info in self.tools.items()
-        ])
+        tools_info = self.get_tools_info()
         return f"""
         You are an intelligent assistant that needs to solve user problems based on the tools provided.
         User question: {query}
@@ -82,11 +53,126 @@ class ZeroShotCoTBasedAgent:
         )
         return cot_response.choices[0].message.content
 
+    def get_batch_cot_prompt(self, queries: List[str]) -> str:
+        """Generate CoT prompt that plans several questions at once"""
+        tools_info = self.get_tools_info()
+        questions = "\n".join([f"[{index}] {query}" for index, query in enumerate(queries)])
+        return f"""
+        You are an intelligent assistant that needs to solve user problems based on the tools provided.
+        Solve each of the following questions independently:
+        {questions}
+        Available tools:
+        {tools_info}
+        For each question, think step by step, in each step, you should choose one name of these tools to call.
+        Return one answer per question with its task_index (the number in brackets) and its steps,
+        each step with the thought and the tool name.
+        """
+
     def run_and_return_tool_trajectory(self, query: str) -> List[str]:
         """Run CoT agent and return tool trajectory"""
         result = self.run(query)
+        return self.parse_tool_trajectory(result)
+
+    def parse_tool_trajectory(self, result: str) -> List[str]:
+        """Extract tool names from the step1:thought;tool output format"""
         tool_trajectory = []
         for step in result.split("\n"):
             if step.startswith("step"):
                 tool_trajectory.append(step.split(";")[1].strip())
         return tool_trajectory
+
+    def run_batch(self, queries: List[str], batch_size: int = 10) -> List[List[str]]:
+        """
+        Plan many questions with one structured-output request per batch,
+        so the tool catalogue is sent once per batch instead of once per question.
+
+        Args:
+            queries: Questions to plan
+            batch_size: Questions packed into one request
+
+        Returns:
+            Tool trajectories in the order of queries
+        """
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be at least 1, got {batch_size}")
+        trajectories = []
+        for start in range(0, len(queries), batch_size):
+            trajectories.extend(self._run_one_batch(queries[start:start + batch_size]))
+        return trajectories
+
+    def _run_one_batch(self, queries: List[str]) -> List[List[str]]:
+        answers = {}
+        try:
+            response = self.client.beta.chat.completions.parse(
+                model=self.model,
+                messages=[{"role": "user", "content": self.get_batch_cot_prompt(queries)}],
+                response_format=CoTBatchSchema,
+                temperature=0.2
+            )
+            parsed = response.choices[0].message.parsed
+            if parsed is not None:
+                for answer in parsed.answers:
+                    answers[answer.task_index] = [step.tool.strip() for step in answer.steps]
+        except Exception as e:
+            print(f"Error in batch CoT request: {e}")
+
+        trajectories = []
+        for index, query in enumerate(queries):
+            if index in answers:
+                trajectories.append(answers[index])
+            else:
+                # Questions missing from the batch answer are planned on their own
+                trajectories.append(self.run_and_return_tool_trajectory(query))
+        return trajectories
+
+    def write_batch_file(self, queries: List[str], path: str, custom_ids: Optional[List[str]] = None) -> str:
+        """
+        Write one chat completion request per question in the OpenAI Batch API
+        JSONL input format. The file can be uploaded with purpose="batch".
+
+        Args:
+            queries: Questions to plan
+            path: Output JSONL path
+            custom_ids: Request ids, e.g. task ids, defaults to "task-<index>"
+
+        Returns:
+            The output path
+        """
+        if custom_ids is None:
+            custom_ids = [f"task-{index}" for index in range(len(queries))]
+        with open(path, "w", encoding="utf-8") as f:
+            for custom_id, query in zip(custom_ids, queries):
+                request = {
+                    "custom_id": custom_id,
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": {
+                        "model": self.model,
+                        "messages": [{"role": "user", "content": self.get_cot_prompt(query)}],
+                        "temperature": 0.2
+                    }
+                }
+                f.write(json.dumps(request, ensure_ascii=False) + "\n")
+        return path
+
+    def read_batch_results(self, path: str) -> Dict[str, List[str]]:
+        """
+        Demultiplex an OpenAI Batch API output JSONL file into tool trajectories.
+
+        Returns:
+            Mapping from custom_id to tool trajectory, failed requests map to []
+        """
+        trajectories = {}
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                result = json.loads(line)
+                response = result.get("response") or {}
+                if result.get("error") or response.get("status_code") != 200:
+                    print(f"Batch request {result.get('custom_id')} failed: {result.get('error')}")
+                    trajectories[result["custom_id"]] = []
+                    continue
+                content = response["body"]["choices"][0]["message"]["content"]
+                trajectories[result["custom_id"]] = self.parse_tool_trajectory(content)
+        return trajectories
@@ -1,10 +1,10 @@
 from dotenv.main import logger
-from openai import OpenAI
+from geoplan_bench.llm import (BudgetExceeded, JSONParseError, create_openai_client, extract_json, json_mode_kwargs,
+                               parse_json_response, span)
 import os
-import inspect
 from typing import Callable, List
 from dotenv import load_dotenv
-import json
+from geoplan_bench.tools.registry import ToolSet, add_tool_entry, tools_catalogue
 
 load_dotenv()
 
@@ -15,57 +15,22 @@ class DebateAgent:
             api_key = os.getenv("OPENAI_API_KEY")
         if base_url is None:
             base_url = os.getenv("OPENAI_API_BASE")
-        self.client = OpenAI(
-            api_key=api_key,
-            base_url=base_url
-        )
+        self.client = create_openai_client(api_key=api_key, base_url=base_url)
         self.model = model
         self.tools = {}
         self.agent_type = "Debate"  
 
     def add_tool_to_debater(self, func: Callable):
         """add tool to debater"""
-        name = func.__name__
+        self.tools = add_tool_entry(self.tools, func)
 
-        description = func.__doc__ or f"Execute {name} function"
-
-        sig = inspect.signature(func)
-        parameters = {
-            "type": "object",
-            "properties": {},
-            "required": []
-        }
-    
-        for param_name, param in sig.parameters.items():
-
-            if param_name == 'self':
-                continue
-                
-            param_type = "string" 
-            if param.annotation != inspect.Parameter.empty:
-                if param.annotation == int:
-                    param_type = "integer"
-                elif param.annotation == float:
-                    param_type = "number"
-                elif param.annotation == bool:
-                    param_type = "boolean"
-            
-            parameters["properties"][param_name] = {
-                "type": param_type,
-                "description": f"{param_name} parameter"
-            }
-            
-            if param.default == inspect.Parameter.empty:
-                parameters["required"].append(param_name)
-        
-        self.tools[name] = {"func": func, "description": description, "parameters": parameters}
+    def set_tools(self, tools: ToolSet):
+        """Use a prebuilt ToolSet (see ToolRegistry.subset), replacing the current tools"""
+        self.tools = tools
 
     def create_initial_prompt(self, question: str) -> str:
         """Create initial prompt for Round 0 - independent thinking"""
-        tools_info = "\n".join([
-            f"- {name}: {info['description']}" 
-            for name, info in self.tools.items()
-        ])
+        tools_info = tools_catalogue(self.tools)
         
         return f"""You are participating in a multi-agent debate. In this initial round, please think independently and provide your first answer to the question without seeing other agents' responses.
 
@@ -85,10 +50,7 @@ class DebateAgent:
 
     def create_debate_prompt(self, question: str, conversation_history: List[str],debater_index: int,debater_num: int) -> str:
         """Create debate prompt for Round 1 to N - debate rounds"""
-        tools_info = "\n".join([
-            f"- {name}: {info['description']}" 
-            for name, info in self.tools.items()
-        ])
+        tools_info = tools_catalogue(self.tools)
         
         history_str = "\n".join(conversation_history)
 
@@ -114,10 +76,7 @@ class DebateAgent:
 
     def create_final_prompt(self, question: str, conversation_history: List[str]) -> str:
         """Create final prompt for summary round"""
-        tools_info = "\n".join([
-            f"- {name}: {info['description']}" 
-            for name, info in self.tools.items()
-        ])
+        tools_info = tools_catalogue(self.tools)
         
         history_str = "\n".join(conversation_history)
         
@@ -147,39 +106,65 @@ class DebateAgent:
         """Run the complete debate process"""
         # 1. Initialize conversation history
         conversation_history = []
-        
+        try:
+            return self._run_debate(question, conversation_history, debater_num, num_rounds)
+        except BudgetExceeded as e:
+            logger.error(f"Debate stopped: {e.reason}")
+            return self.latest_tool_trajectory(conversation_history)
+
+    def latest_tool_trajectory(self, conversation_history: List[str]) -> List[str]:
+        """Most recent trajectory proposed by a debater, used when the debate is cut short"""
+        for entry in reversed(conversation_history):
+            try:
+                response = extract_json(entry.split("debater: ", 1)[-1])
+            except JSONParseError:
+                continue
+            if not isinstance(response, dict):
+                continue
+            for key in ("refined_tool_trajectory", "initial_tool_trajectory"):
+                if isinstance(response.get(key), list):
+                    return response[key]
+        return []
+
+    def _run_debate(self, question: str, conversation_history: List[str], debater_num: int, num_rounds: int) -> List[str]:
+        """Debate rounds and summary, appending every response to conversation_history"""
         # 2. Round 0: Independent initial responses
         
-        for i in range(debater_num):
-            prompt = self.create_initial_prompt(question)
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[{"role": "user", "content": prompt}],
-            )
-             
-            conversation_history.append(f"[Round 0] number {i} debater: {response.choices[0].message.content}")
+        with span("round 0", category="round"):
+            for i in range(debater_num):
+                prompt = self.create_initial_prompt(question)
+                with span(f"debater {i}", category="debater"):
+                    response = self.client.chat.completions.create(
+                        model=self.model,
+                        messages=[{"role": "user", "content": prompt}],
+                    )
+                 
+                conversation_history.append(f"[Round 0] number {i} debater: {response.choices[0].message.content}")
 
         # 3. Round 1 to N: Debate rounds
         for round_num in range(1, num_rounds + 1):      
-            for i in range(debater_num):
-                prompt = self.create_debate_prompt(question, conversation_history,i,debater_num)
-                response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[{"role": "user", "content": prompt}],
-                )
-                conversation_history.append(f"[Round {round_num}] number {i} debater: {response.choices[0].message.content}")
+            with span(f"round {round_num}", category="round"):
+                for i in range(debater_num):
+                    prompt = self.create_debate_prompt(question, conversation_history,i,debater_num)
+                    with span(f"debater {i}", category="debater"):
+                        response = self.client.chat.completions.create(
+                            model=self.model,
+                            messages=[{"role": "user", "content": prompt}],
+                        )
+                    conversation_history.append(f"[Round {round_num}] number {i} debater: {response.choices[0].message.content}")
 
         # 4. Final Answer: Summary round      
         final_prompt = self.create_final_prompt(question, conversation_history)
-        final_response = self.client.chat.completions.create(
-            model=self.model,
-            messages=[{"role": "user", "content": final_prompt}], 
-        )
-        try:
-            tool_trajectory = json.loads(final_response.choices[0].message.content.strip())["final_tool_trajectory"]
-        except Exception as e:
-            logger.error(f"Error: {e}")    
-            tool_trajectory = []
+        with span("summary", category="round"):
+            final_response = self.client.chat.completions.create(
+                model=self.model,
+                messages=[{"role": "user", "content": final_prompt}],
+                **json_mode_kwargs()
+            )
+        final_answer = parse_json_response(final_response.choices[0].message.content, default={})
+        tool_trajectory = final_answer.get("final_tool_trajectory", []) if isinstance(final_answer, dict) else []
+        if not tool_trajectory:
+            logger.error("Error: no final_tool_trajectory in summary response")
           
         conversation_history.append(f"[Round {num_rounds+1}] final tool trajectory: {tool_trajectory}")
 
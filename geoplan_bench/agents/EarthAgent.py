@@ -1,7 +1,7 @@
-import json
 import os
 from typing import List
-from openai import OpenAI
+from geoplan_bench.llm import BudgetExceeded, create_openai_client, json_mode_kwargs, parse_json_response, span
+from geoplan_bench.data.schemas import AgentSelectionSchema, AgentSelectionsSchema
 from dotenv import load_dotenv
 from geoplan_bench.agents.ReAct import ReActAgent
 from dotenv.main import logger
@@ -15,10 +15,7 @@ class EarthAgent:
             api_key = os.getenv("OPENAI_API_KEY")
         if base_url is None:
             base_url = os.getenv("OPENAI_API_BASE")
-        self.client = OpenAI(
-            api_key=api_key,
-            base_url=base_url
-        )
+        self.client = create_openai_client(api_key=api_key, base_url=base_url)
         self.model = model
         self.layer1_agents = {}
         self.layer2_agents = {}
@@ -63,23 +60,13 @@ class EarthAgent:
         response = self.client.chat.completions.create(
             model=self.model,
             messages=[{"role": "user", "content": prompt}],
+            **json_mode_kwargs()
         )
-        
-        try:
-            result_text = response.choices[0].message.content
-            if "```json" in result_text:
-                json_start = result_text.find("```json") + 7
-                json_end = result_text.find("```", json_start)
-                result_text = result_text[json_start:json_end].strip()
-            elif "```" in result_text:
-                json_start = result_text.find("```") + 3
-                json_end = result_text.find("```", json_start)
-                result_text = result_text[json_start:json_end].strip()
-            
-            return json.loads(result_text)
-        except Exception as e:
-            logger.error(f"Layer 3 selection parsing failed: {e}")
+        selection = parse_json_response(response.choices[0].message.content, schema=AgentSelectionSchema)
+        if selection is None:
+            logger.error("Layer 3 selection parsing failed")
             return {"selected_agent": "generalChatBotAgent", "subtask": query}
+        return selection
     
     def select_layer2_agents(self, query: str, layer3_selection: dict) -> list:
         """Select layer 2 agents"""
@@ -116,23 +103,13 @@ class EarthAgent:
         response = self.client.chat.completions.create(
             model=self.model,
             messages=[{"role": "user", "content": prompt}],
+            **json_mode_kwargs()
         )
-        
-        try:
-            result_text = response.choices[0].message.content
-            if "```json" in result_text:
-                json_start = result_text.find("```json") + 7
-                json_end = result_text.find("```", json_start)
-                result_text = result_text[json_start:json_end].strip()
-            elif "```" in result_text:
-                json_start = result_text.find("```") + 3
-                json_end = result_text.find("```", json_start)
-                result_text = result_text[json_start:json_end].strip()
-            
-            return json.loads(result_text).get("selected_agents", [])
-        except Exception as e:
-            logger.error(f"Layer 2 selection parsing failed: {e}")
+        selection = parse_json_response(response.choices[0].message.content, schema=AgentSelectionsSchema)
+        if selection is None:
+            logger.error("Layer 2 selection parsing failed")
             return []
+        return selection["selected_agents"]
     
     def select_layer1_agents(self, query: str, layer2_selections: list, layer3_selection: dict) -> list:
         """Select layer 1 agents"""
@@ -171,23 +148,13 @@ class EarthAgent:
         response = self.client.chat.completions.create(
             model=self.model,
             messages=[{"role": "user", "content": prompt}],
+            **json_mode_kwargs()
         )
-        
-        try:
-            result_text = response.choices[0].message.content
-            if "```json" in result_text:
-                json_start = result_text.find("```json") + 7
-                json_end = result_text.find("```", json_start)
-                result_text = result_text[json_start:json_end].strip()
-            elif "```" in result_text:
-                json_start = result_text.find("```") + 3
-                json_end = result_text.find("```", json_start)
-                result_text = result_text[json_start:json_end].strip()
-            
-            return json.loads(result_text).get("selected_agents", [])
-        except Exception as e:
-            logger.error(f"Layer 1 selection parsing failed: {e}")
+        selection = parse_json_response(response.choices[0].message.content, schema=AgentSelectionsSchema)
+        if selection is None:
+            logger.error("Layer 1 selection parsing failed")
             return []
+        return selection["selected_agents"]
     
     def select_layer1_agents_ablation_study(self, query: str) -> list:
         """Select layer 1 agents for ablation study"""
@@ -222,23 +189,13 @@ class EarthAgent:
         response = self.client.chat.completions.create(
             model=self.model,
             messages=[{"role": "user", "content": prompt}],
+            **json_mode_kwargs()
         )
-        
-        try:
-            result_text = response.choices[0].message.content
-            if "```json" in result_text:
-                json_start = result_text.find("```json") + 7
-                json_end = result_text.find("```", json_start)
-                result_text = result_text[json_start:json_end].strip()
-            elif "```" in result_text:
-                json_start = result_text.find("```") + 3
-                json_end = result_text.find("```", json_start)
-                result_text = result_text[json_start:json_end].strip()
-            
-            return json.loads(result_text).get("selected_agents", [])
-        except Exception as e:
-            logger.error(f"Layer 1 selection parsing failed: {e}")
+        selection = parse_json_response(response.choices[0].message.content, schema=AgentSelectionsSchema)
+        if selection is None:
+            logger.error("Layer 1 selection parsing failed")
             return []
+        return selection["selected_agents"]
 
     def select_layer2_agents_ablation_study(self, query: str) -> list:
         """Select layer 2 agents for ablation study"""
@@ -273,23 +230,13 @@ class EarthAgent:
         response = self.client.chat.completions.create(
             model=self.model,
             messages=[{"role": "user", "content": prompt}],
+            **json_mode_kwargs()
         )
-        
-        try:
-            result_text = response.choices[0].message.content
-            if "```json" in result_text:
-                json_start = result_text.find("```json") + 7
-                json_end = result_text.find("```", json_start)
-                result_text = result_text[json_start:json_end].strip()
-            elif "```" in result_text:
-                json_start = result_text.find("```") + 3
-                json_end = result_text.find("```", json_start)
-                result_text = result_text[json_start:json_end].strip()
-            
-            return json.loads(result_text).get("selected_agents", [])
-        except Exception as e:
-            logger.error(f"Layer 2 selection parsing failed: {e}")
+        selection = parse_json_response(response.choices[0].message.content, schema=AgentSelectionsSchema)
+        if selection is None:
+            logger.error("Layer 2 selection parsing failed")
             return []
+        return selection["selected_agents"]
     
     def select_layer3_agents_ablation_study(self, query: str) -> list:
         """Select third layer agent for ablation study"""
@@ -316,23 +263,13 @@ class EarthAgent:
         response = self.client.chat.completions.create(
             model=self.model,
             messages=[{"role": "user", "content": prompt}],
+            **json_mode_kwargs()
         )
-        
-        try:
-            result_text = response.choices[0].message.content
-            if "```json" in result_text:
-                json_start = result_text.find("```json") + 7
-                json_end = result_text.find("```", json_start)
-                result_text = result_text[json_start:json_end].strip()
-            elif "```" in result_text:
-                json_start = result_text.find("```") + 3
-                json_end = result_text.find("```", json_start)
-                result_text = result_text[json_start:json_end].strip()
-            
-            return json.loads(result_text)
-        except Exception as e:
-            logger.error(f"Layer 3 selection parsing failed: {e}")
+        selection = parse_json_response(response.choices[0].message.content, schema=AgentSelectionSchema)
+        if selection is None:
+            logger.error("Layer 3 selection parsing failed")
             return {"selected_agent": "generalChatBotAgent", "subtask": query}
+        return selection
             
     def select_agents_directly(self, query: str) -> list:
         """Select agents directly"""
@@ -372,29 +309,27 @@ class EarthAgent:
         response = self.client.chat.completions.create(
             model=self.model,
             messages=[{"role": "user", "content": prompt}],
+            **json_mode_kwargs()
         )
-        try:
-            result_text = response.choices[0].message.content
-            if "```json" in result_text:
-                json_start = result_text.find("```json") + 7
-                json_end = result_text.find("```", json_start)
-                result_text = result_text[json_start:json_end].strip()
-            elif "```" in result_text:
-                json_start = result_text.find("```") + 3
-                json_end = result_text.find("```", json_start)
-                result_text = result_text[json_start:json_end].strip()
-            return json.loads(result_text)
-        except Exception as e:
-            logger.error(f"Agents selection parsing failed: {e}")
+        selection = parse_json_response(response.choices[0].message.content, schema=AgentSelectionsSchema)
+        if selection is None:
+            logger.error("Agents selection parsing failed")
             return []
+        return selection
     
     def run(self, query: str) -> str:
         """Run EarthAgent"""
         
         # Step 1: Layer-wise agent selection
-        layer3_selection = self.select_layer3_agent(query)
-        layer2_selections = self.select_layer2_agents(query, layer3_selection)
-        layer1_selections = self.select_layer1_agents(query, layer2_selections, layer3_selection)
+        with span("layer selection", category="layer"):
+            try:
+                layer3_selection = self.select_layer3_agent(query)
+                layer2_selections = self.select_layer2_agents(query, layer3_selection)
+                layer1_selections = self.select_layer1_agents(query, layer2_selections, layer3_selection)
+            except BudgetExceeded as e:
+                # no expert has run yet, so there is no trajectory to return
+                logger.error(f"Layer selection stopped: {e.reason}")
+                return "", []
         
         # Build execution plan
         plan = {
@@ -425,44 +360,49 @@ class EarthAgent:
                 continue
             
             # Execute expert reasoning
-            try:
-                for agent_info in agents:
-                    # Handle special format for layer 3
-                    if layer == 3 and isinstance(agent_info, dict) and "selected_agent" in agent_info:
-                        agent_name = agent_info.get("selected_agent")
-                        subtask = agent_info.get("subtask", query)
-                        subtask = f"Final task:{query}\n" +f"This is the subtask of the final task that you need to complete right now:{subtask} "+ "\n" + "**choose the most relevant tools to solve the subtask**"
-                    elif isinstance(agent_info, dict):
-                        agent_name = agent_info.get("name")
-                        subtask = agent_info.get("subtask", query)
-                    else:
-                        agent_name = agent_info
-                        subtask = query
+            with span(f"layer {layer}", category="layer"):
+                try:
+                    for agent_info in agents:
+                        # Handle special format for layer 3
+                        if layer == 3 and isinstance(agent_info, dict) and "selected_agent" in agent_info:
+                            agent_name = agent_info.get("selected_agent")
+                            subtask = agent_info.get("subtask") or query
+                            subtask = f"Final task:{query}\n" +f"This is the subtask of the final task that you need to complete right now:{subtask} "+ "\n" + "**choose the most relevant tools to solve the subtask**"
+                        elif isinstance(agent_info, dict):
+                            agent_name = agent_info.get("name")
+                            subtask = agent_info.get("subtask") or query
+                        else:
+                            agent_name = agent_info
+                            subtask = query
                     
-                    # Checkagent
-                    if agent_name not in agent_dict:
-                        error_msg = f"Agent {agent_name}  {layer} "
-                        results.append(error_msg)
-                        continue
+                        # Checkagent
+                        if agent_name not in agent_dict:
+                            error_msg = f"Agent {agent_name}  {layer} "
+                            results.append(error_msg)
+                            continue
                     
-                    # agent1
-                    agent = agent_dict[agent_name]
-                    # EarthAgent
-                    agent.agent_type = "EarthAgent"
+                        # agent1
+                        agent = agent_dict[agent_name]
+                        # EarthAgent
+                        agent.agent_type = "EarthAgent"
                     
-                    result, history = agent.run(subtask)
-                    result_info = {
-                        "layer": layer,
-                        "agent_name": agent.name,
-                        "agent_description": agent.description,
-                        "subtask": subtask,
-                        "result": result,
-                        "history": history
-                    }
-                    results.append(result_info)
-            except Exception as e:
-                error_msg = f": {str(e)}"
-                results.append(error_msg)
+                        with span(agent_name, category="expert", layer=layer):
+                            result, history = agent.run(subtask)
+                        result_info = {
+                            "layer": layer,
+                            "agent_name": agent.name,
+                            "agent_description": agent.description,
+                            "subtask": subtask,
+                            "result": result,
+                            "history": history,
+                            "tool_trajectory": list(agent.last_step_log.tool_trajectory),
+                            "usage": agent.usage_stats,
+                            "run_stats": agent.run_stats
+                        }
+                        results.append(result_info)
+                except Exception as e:
+                    error_msg = f": {str(e)}"
+                    results.append(error_msg)
         
         # Step 3: Generate final result
         final_result = results[-1] if results else ""
@@ -472,7 +412,10 @@ class EarthAgent:
         final_result,results = self.run(query)
         tool_trajectory=[]
         for result_info in results:
-            if isinstance(result_info, dict) and "history" in result_info:
+            # experts record their trajectory from the structured step log
+            if isinstance(result_info, dict) and "tool_trajectory" in result_info:
+                tool_trajectory.extend(result_info["tool_trajectory"])
+            elif isinstance(result_info, dict) and "history" in result_info:
                 history = result_info["history"]
                 # from history parse tool calls
                 for step in history.split("\n"):
@@ -1,73 +1,31 @@
 import json
-import os
-import inspect
 from typing import Callable, List
-from openai import OpenAI
+from geoplan_bench.llm import create_openai_client
 from dotenv import load_dotenv
 from geoplan_bench.data.schemas import PlanSchema
+from geoplan_bench.tools.registry import ToolSet, add_tool_entry, tools_catalogue
 
 load_dotenv()
 
 
 class PlanExecuteAgent:
     def __init__(self, model="gpt-4o-mini"):
-        self.client = OpenAI(
-            api_key=os.getenv("OPENAI_API_KEY"),
-            base_url=os.getenv("OPENAI_API_BASE")
-        )
+        self.client = create_openai_client()
         self.model = model
         self.tools = {}
         self.agent_type = "Plan&Execute" 
         
     def add_tool(self, func: Callable):
         """Add tool, automatically extract information from function"""
-        # Get function name
-        name = func.__name__
-        
-        # Get docstring as description
-        description = func.__doc__ or f"Execute {name} function"
-        
-        # Get function signature
-        sig = inspect.signature(func)
-        parameters = {
-            "type": "object",
-            "properties": {},
-            "required": []
-        }
-        
-        # Analyze parameters
-        for param_name, param in sig.parameters.items():
-            # Skip self parameter
-            if param_name == 'self':
-                continue
-                
-            param_type = "string"  # Default type
-            if param.annotation != inspect.Parameter.empty:
-                # Set type based on type annotation
-                if param.annotation == int:
-                    param_type = "integer"
-                elif param.annotation == float:
-                    param_type = "number"
-                elif param.annotation == bool:
-                    param_type = "boolean"
-            
-            parameters["properties"][param_name] = {
-                "type": param_type,
-                "description": f"{param_name} parameter"
-            }
-            
-            # If no default value, then required parameter
-            if param.default == inspect.Parameter.empty:
-                parameters["required"].append(param_name)
-        
-        self.tools[name] = {"func": func, "description": description, "parameters": parameters}
+        self.tools = add_tool_entry(self.tools, func)
+
+    def set_tools(self, tools: ToolSet):
+        """Use a prebuilt ToolSet (see ToolRegistry.subset), replacing the current tools"""
+        self.tools = tools
     
     def get_planning_prompt(self, query: str) -> str:
         """Generate planning step prompt"""
-        tools_info = "\n".join([
-            f"- {name}: {info['description']}" 
-            for name, info in self.tools.items()
-        ])
+        tools_info = tools_catalogue(self.tools)
         
         return f"""You are an intelligent assistant that needs to solve user problems.
 
@@ -96,10 +54,7 @@ class PlanExecuteAgent:
 
     def get_final_result_prompt(self, query: str, plan: dict, results: List[str]) -> str:
         """Generate execution step prompt"""
-        tools_info = "\n".join([
-            f"- {name}: {info['description']}" 
-            for name, info in self.tools.items()
-        ])
+        tools_info = tools_catalogue(self.tools)
         
         results_text = "\n".join([f"Step {i+1} result: {result}" for i, result in enumerate(results)])
         
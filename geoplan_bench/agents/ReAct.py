@@ -1,23 +1,25 @@
 import json
 import os
-import inspect
 from typing import Callable,List
-from openai import OpenAI
+from geoplan_bench.llm import BudgetExceeded, create_openai_client, span
 from dotenv import load_dotenv
+from geoplan_bench.agents.usage import UsageTracker
+from geoplan_bench.agents.observation import LLMObservationProvider, StubObservationProvider
+from geoplan_bench.agents.step_log import ReActStepLog
+from geoplan_bench.tools.registry import ToolSet, add_tool_entry, tools_catalogue, tools_schema
 
 load_dotenv()
 
+PROMPT_LAYOUTS = ("inline", "cached")
+
 
 class ReActAgent:
-    def __init__(self, model="gpt-4o-mini",api_key=os.getenv("OPENAI_API_KEY"),base_url=os.getenv("OPENAI_API_BASE"),name="",description="",system_prompt="You are an intelligent assistant that needs to solve user problems.",max_steps=10,temperature=0.2):
+    def __init__(self, model="gpt-4o-mini",api_key=os.getenv("OPENAI_API_KEY"),base_url=os.getenv("OPENAI_API_BASE"),name="",description="",system_prompt="You are an intelligent assistant that needs to solve user problems.",max_steps=10,temperature=0.2,prompt_layout="inline",observation_provider=None,fused=False,loop_detector=None):
         if api_key is None:
             api_key = os.getenv("OPENAI_API_KEY")
         if base_url is None:
             base_url = os.getenv("OPENAI_API_BASE")
-        self.client = OpenAI(
-            api_key=api_key,
-            base_url=base_url
-        )
+        self.client = create_openai_client(api_key=api_key, base_url=base_url)
         self.model = model
         self.tools = {}
         self.name = name
@@ -26,52 +28,59 @@ class ReActAgent:
         self.max_steps = max_steps
         self.temperature = temperature
         self.agent_type = "ReAct"  
+        # "inline" interleaves per-step state with the instructions (original layout),
+        # "cached" keeps a stable leading system message so provider prompt caching applies
+        if prompt_layout not in PROMPT_LAYOUTS:
+            raise ValueError(f"Unknown prompt layout: {prompt_layout}, expected one of {PROMPT_LAYOUTS}")
+        self.prompt_layout = prompt_layout
+        self._tools_schema = None
+        self._tools_schema_json = None
+        self._tools_info = None
+        # fused=True asks for the thought and the function call in one tool-calling completion
+        self.fused = fused
+        # Produces tool observations; defaults to an LLM call per action
+        self.observation_provider = observation_provider or LLMObservationProvider()
+        self.usage = UsageTracker()
+        self.usage_stats = self.usage.summary()
+        # Structured record of the latest run, see ReActStepLog
+        self.last_step_log = ReActStepLog()
+        # Optional LoopDetector that ends the run early on repeated or cyclic tool calls
+        self.loop_detector = loop_detector
+        self.run_stats = self._new_run_stats()
 
     def get_description(self):
         return self.description
         
     def add_tool(self, func: Callable):
         """Add tool, automatically extract information from function"""
-        # Get function name
-        name = func.__name__
-        
-        # Get docstring as description
-        description = func.__doc__ or f"Execute {name} function"
-        
-        # Get function signature
-        sig = inspect.signature(func)
-        parameters = {
-            "type": "object",
-            "properties": {},
-            "required": []
-        }
-        
-        # Analyze parameters
-        for param_name, param in sig.parameters.items():
-            # Skip self parameter
-            if param_name == 'self':
-                continue
-                
-            param_type = "string"  # Default type
-            if param.annotation != inspect.Parameter.empty:
-                # Set type based on type annotation
-                if param.annotation == int:
-                    param_type = "integer"
-                elif param.annotation == float:
-                    param_type = "number"
-                elif param.annotation == bool:
-                    param_type = "boolean"
-            
-            parameters["properties"][param_name] = {
-                "type": param_type,
-                "description": f"{param_name} parameter"
-            }
-            
-            # If no default value, then required parameter
-            if param.default == inspect.Parameter.empty:
-                parameters["required"].append(param_name)
-        
-        self.tools[name] = {"func": func, "description": description, "parameters": parameters}
+        self.tools = add_tool_entry(self.tools, func)
+        self._invalidate_tool_cache()
+
+    def set_tools(self, tools: ToolSet):
+        """Use a prebuilt ToolSet (see ToolRegistry.subset), replacing the current tools"""
+        self.tools = tools
+        self._invalidate_tool_cache()
+
+    def _invalidate_tool_cache(self):
+        """Drop the compiled tool schema and catalogue after the tool set changed"""
+        self._tools_schema = None
+        self._tools_schema_json = None
+        self._tools_info = None
+
+    def get_tools_schema(self) -> List[dict]:
+        """Function-calling schema of all tools, compiled once per tool set"""
+        if self._tools_schema is None:
+            self._tools_schema = tools_schema(self.tools)
+        return self._tools_schema
+
+    def get_tools_schema_json(self) -> str:
+        """Serialized ``tools`` fragment of the action request body"""
+        if self._tools_schema_json is None:
+            if isinstance(self.tools, ToolSet):
+                self._tools_schema_json = self.tools.schema_json()
+            else:
+                self._tools_schema_json = json.dumps(self.get_tools_schema(), ensure_ascii=False)
+        return self._tools_schema_json
     
     def set_name(self, name: str):
         self.name = name
@@ -79,13 +88,17 @@ class ReActAgent:
     def set_description(self, description: str):
         self.description = description
     
-    def get_thought_prompt(self, query: str, history: str) -> str:
+    def get_tools_info(self) -> str:
+        """Generate the tool catalogue listed in prompts"""
+        if self._tools_info is None:
+            self._tools_info = tools_catalogue(self.tools)
+        return self._tools_info
+
+    def get_thought_prompt(self, query: str, history: str, previous_tool_calls: List[str] = None) -> str:
         """Generate thought step prompt"""
-        tools_info = "\n".join([
-            f"- {name}: {info['description']}" 
-            for name, info in self.tools.items()
-        ])
-        previous_tool_calls = self.parse_tool_trajectory(history)
+        tools_info = self.get_tools_info()
+        if previous_tool_calls is None:
+            previous_tool_calls = self.parse_tool_trajectory(history)
         
         return f"""{self.system_prompt}
 
@@ -114,9 +127,10 @@ class ReActAgent:
 
         Please start with "Thought: " and provide your strategic analysis in one clear sentence."""
 
-    def get_action_prompt(self, query: str, thought: str, history: str) -> str:
+    def get_action_prompt(self, query: str, thought: str, history: str, previous_tool_calls: List[str] = None) -> str:
         """Generate action step prompt"""
-        previous_tool_calls = self.parse_tool_trajectory(history)
+        if previous_tool_calls is None:
+            previous_tool_calls = self.parse_tool_trajectory(history)
         return f"""Based on your thinking,specifically based on your **previous_tool_calls**, decide the next action using function calling.
 
         User question: {query}
@@ -153,102 +167,281 @@ class ReActAgent:
         Your last thought: {last_thought}
         """
 
+    def get_tool_result_prompt(self, scenario: str, tool_name: str, args: dict) -> str:
+        """Generate prompt asking the LLM to imagine a tool result"""
+        return f"""
+        You need to **fully imagine** the execution result of this tool based on the current tool's name, description and parameters. The result should be beneficial for solving the problem. Only describe in one sentence what the tool did, this sentence should be in past tense.
+        Current scenario: {scenario}
+        Tool name: {tool_name}
+        Tool description: {self.tools[tool_name]["description"]}
+        Tool parameters: {args}
+        """
+
+    def get_static_prompt(self) -> str:
+        """Generate the step-independent system message of the cached layout"""
+        return f"""{self.system_prompt}
+
+        Available tools:
+        {self.get_tools_info()}
+
+        **Strategic Thinking Guidelines**:
+        1. **Fresh Perspective**: If you've taken certain approaches before, explore different angles or complementary information apart from your previous_tool_calls
+        2. **Progress Assessment**: Evaluate what information you've gathered and identify any gaps
+        3. **Completion Check**: If you have sufficient information to provide a comprehensive answer, prepare to finish
+        4. **Diversification**: Avoid repeating similar tool calls - seek variety in your information gathering.The tool you will call next should be different from your previous_tool_calls
+
+        **Decision Framework**:
+        - If you have enough information, Think: "I have gathered sufficient information and can provide a comprehensive answer to this question."
+        - If you need more data, Think about what specific information is still missing and how to obtain it differently
+        - If you're unsure, Think about what would make you confident in your answer
+
+        **Decision Rules** (when deciding an action):
+        1. Carefully check **previous_tool_calls** to avoid repeating same tool call.The tool you will call next should be different from your previous_tool_calls
+        2. If sufficient information obtained to answer the question, do NOT call any function (this will trigger FINISH)
+        3. If must call tools, ensure clear distinction from previous calls (different tools or significantly different parameters)
+        4. If you find yourself possibly entering a loop, do NOT call any function
+
+        **Anti-loop check**: Review the last 2-3 actions in history, if similar tool call patterns found, do NOT call any function."""
+
+    def get_thought_state_prompt(self, query: str, history: str, previous_tool_calls: List[str] = None) -> str:
+        """Generate the per-step part of the thought prompt for the cached layout"""
+        if previous_tool_calls is None:
+            previous_tool_calls = self.parse_tool_trajectory(history)
+        return f"""User question: {query}
+
+        History:
+        {history}
+
+        Your previous_tool_calls: {previous_tool_calls}
+
+        **CRITICAL**: This is ONLY for thinking and analysis. Do NOT include "Action:" statements here.
+
+        Please start with "Thought: " and provide your strategic analysis in one clear sentence."""
+
+    def get_action_state_prompt(self, query: str, thought: str, history: str, previous_tool_calls: List[str] = None) -> str:
+        """Generate the per-step part of the action prompt for the cached layout"""
+        if previous_tool_calls is None:
+            previous_tool_calls = self.parse_tool_trajectory(history)
+        return f"""Based on your thinking,specifically based on your **previous_tool_calls**, decide the next action using function calling.
+
+        User question: {query}
+
+        Your thought: {thought}
+
+        History:
+        {history}
+
+        Your previous_tool_calls: {previous_tool_calls}
+
+        **Action Decision**:
+        - If you need more information: Call ONE function with appropriate parameters
+        - If you have enough information to answer: Make NO function call (this will finish the task)"""
+
+    def get_fused_prompt(self, query: str, history: str, previous_tool_calls: List[str] = None) -> str:
+        """Generate prompt for a fused thought and action step"""
+        return f"""{self.get_static_prompt()}
+
+        {self.get_fused_state_prompt(query, history, previous_tool_calls)}"""
+
+    def get_fused_state_prompt(self, query: str, history: str, previous_tool_calls: List[str] = None) -> str:
+        """Generate the per-step part of the fused prompt for the cached layout"""
+        if previous_tool_calls is None:
+            previous_tool_calls = self.parse_tool_trajectory(history)
+        return f"""User question: {query}
+
+        History:
+        {history}
+
+        Your previous_tool_calls: {previous_tool_calls}
+
+        **Response Format**:
+        - First write your strategic analysis in one clear sentence starting with "Thought: ". Do NOT write "Action:" statements.
+        - Then, if you need more information, call ONE function with appropriate parameters, different from your previous_tool_calls
+        - If you have enough information to answer, or you may be entering a loop, make NO function call (this will finish the task)"""
+
+    def _build_messages(self, step_prompt: str) -> List[dict]:
+        """Put the static prefix first when the cached layout is used"""
+        if self.prompt_layout == "cached":
+            return [
+                {"role": "system", "content": self.get_static_prompt()},
+                {"role": "user", "content": step_prompt}
+            ]
+        return [{"role": "user", "content": step_prompt}]
+
+    def get_thought_messages(self, query: str, history: str, previous_tool_calls: List[str] = None) -> List[dict]:
+        """Generate thought step messages for the configured prompt layout"""
+        if self.prompt_layout == "cached":
+            return self._build_messages(self.get_thought_state_prompt(query, history, previous_tool_calls))
+        return self._build_messages(self.get_thought_prompt(query, history, previous_tool_calls))
+
+    def get_action_messages(self, query: str, thought: str, history: str, previous_tool_calls: List[str] = None) -> List[dict]:
+        """Generate action step messages for the configured prompt layout"""
+        if self.prompt_layout == "cached":
+            return self._build_messages(self.get_action_state_prompt(query, thought, history, previous_tool_calls))
+        return self._build_messages(self.get_action_prompt(query, thought, history, previous_tool_calls))
+
+    def get_fused_messages(self, query: str, history: str, previous_tool_calls: List[str] = None) -> List[dict]:
+        """Generate fused step messages for the configured prompt layout"""
+        if self.prompt_layout == "cached":
+            return self._build_messages(self.get_fused_state_prompt(query, history, previous_tool_calls))
+        return self._build_messages(self.get_fused_prompt(query, history, previous_tool_calls))
+
+    def get_final_result_messages(self, query: str, last_thought: str, history: str) -> List[dict]:
+        """Generate final result messages for the configured prompt layout"""
+        return self._build_messages(self.get_final_result_prompt(query, last_thought, history))
+
+    def _create_completion(self, messages: List[dict], **kwargs):
+        """Create a chat completion and record its token usage"""
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            **kwargs
+        )
+        self.usage.record(response)
+        return response
+
     def run(self, query: str) -> str:
+        """Run ReAct loop and keep the token usage of this run in ``usage_stats``"""
+        self.usage.reset()
+        self.run_stats = self._new_run_stats()
+        try:
+            return self._run_loop(query)
+        except BudgetExceeded as e:
+            # keep the steps taken so far, run_and_return_tool_trajectory reads them from last_step_log
+            self.run_stats["budget_exceeded"] = e.reason
+            return f"Stopped early: {e.reason}", self.last_step_log.history
+        finally:
+            self.usage_stats = self.usage.summary()
+            if self.run_stats["loop_detected"]:
+                # calls saved compared with running out the step budget
+                self.run_stats["saved_calls"] = max(0, self.max_steps * self._calls_per_step() - self.usage.calls)
+            if self.loop_detector is not None:
+                self.loop_detector.record_run(self.run_stats)
+
+    def _new_run_stats(self) -> dict:
+        return {"steps": 0, "loop_detected": None, "aborted_steps": 0, "saved_calls": 0, "budget_exceeded": None}
+
+    def _calls_per_step(self) -> int:
+        """LLM calls made by one step that executes a tool"""
+        calls = 1 if self.fused else 2
+        if not isinstance(self.observation_provider, StubObservationProvider):
+            calls += 1
+        return calls
+
+    def _thought_step(self, query: str, log: ReActStepLog) -> str:
+        """Ask the LLM for the next thought"""
+        thought_response = self._create_completion(
+            self.get_thought_messages(query, log.history, log.tool_trajectory),
+            max_tokens=500,
+            temperature=self.temperature
+        )
+        
+        thought = thought_response.choices[0].message.content.strip()
+        if not thought.startswith("Thought:"):
+            thought = f"Thought: {thought}"
+        return thought
+
+    def _action_step(self, query: str, thought: str, log: ReActStepLog):
+        """Ask the LLM for the next function call, returns the response message"""
+        action_response = self._create_completion(
+            self.get_action_messages(query, thought, log.history, log.tool_trajectory),
+            tools=self.get_tools_schema(),
+            tool_choice="auto",
+            temperature=self.temperature
+        )
+        return action_response.choices[0].message
+
+    def _fused_step(self, query: str, log: ReActStepLog):
+        """Ask for the thought and the function call in one completion"""
+        response = self._create_completion(
+            self.get_fused_messages(query, log.history, log.tool_trajectory),
+            tools=self.get_tools_schema(),
+            tool_choice="auto",
+            temperature=self.temperature
+        )
+        message = response.choices[0].message
+        
+        # Keep the thought on a single line so the Thought:/Action: history format stays parseable
+        content = (message.content or "").split("Action:")[0]
+        content = " ".join(content.replace("Thought:", " ").split())
+        if not content:
+            if message.tool_calls:
+                content = f"I need more information and will call {message.tool_calls[0].function.name}."
+            else:
+                content = "I have gathered sufficient information and can provide a comprehensive answer to this question."
+        return f"Thought: {content}", message
+
+    def _finish(self, query: str, thought: str, log: ReActStepLog):
+        """Record FINISH and generate the final result"""
+        log.add_finish()
+        
+        final_result = self._create_completion(
+            self.get_final_result_messages(query, thought.split("Thought: ")[-1], log.history),
+            temperature=self.temperature
+        )
+        
+        result = final_result.choices[0].message.content
+        return result, log.history
+
+    def _run_loop(self, query: str) -> str:
         """Run ReAct loop"""
         
-        history = ""
+        log = ReActStepLog()
+        self.last_step_log = log
         
         for step in range(self.max_steps):
-            
-            # Thought step: LLM thinks about current situation
-            thought_prompt = self.get_thought_prompt(query, history)
-            
-            thought_response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[{"role": "user", "content": thought_prompt}],
-                max_tokens=500,
-                temperature=self.temperature
-            )
-            
-            thought = thought_response.choices[0].message.content.strip()
-            if not thought.startswith("Thought:"):
-                thought = f"Thought: {thought}"
+            self.run_stats["steps"] = step + 1
+            with span(f"step {step + 1}", category="step"):
+                if self.fused:
+                    # Fused step: one completion returns the thought and the function call
+                    thought, action_message = self._fused_step(query, log)
+                    log.add_thought(thought)
+                else:
+                    # Thought step: LLM thinks about current situation
+                    thought = self._thought_step(query, log)
+                    log.add_thought(thought)
 
-            history += f"{thought}\n"
-            
-            # Action step: LLM decides next action
-            action_prompt = self.get_action_prompt(query, thought, history)
+                    # Action step: LLM decides next action
+                    action_message = self._action_step(query, thought, log)
             
-            tools_schema = [
-                {
-                    "type": "function",
-                    "function": {
-                        "name": name,
-                        "description": info["description"],
-                        "parameters": info["parameters"]
-                    }
-                }
-                for name, info in self.tools.items()
-            ]
-            
-            action_response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[{"role": "user", "content": action_prompt}],
-                tools=tools_schema,
-                tool_choice="auto",
-                temperature=self.temperature
-            )
-            
-            action_message = action_response.choices[0].message
-            
-            # Check if completed
-            if not action_message.tool_calls:
-                action_str = "Action: FINISH"
-                history += f"{action_str}\n"
-                
-                final_result = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[{"role": "user", "content": self.get_final_result_prompt(query, thought.split("Thought: ")[-1], history)}],
-                    temperature=self.temperature
-                )
-                
-                result = final_result.choices[0].message.content
-                return result, history
+                # Check if completed
+                if not action_message.tool_calls:
+                    return self._finish(query, thought, log)
 
             
-            # Execute tool call
-            tool_call = action_message.tool_calls[0]
-            tool_name = tool_call.function.name
-            args = json.loads(tool_call.function.arguments)
+                # Execute tool call
+                tool_call = action_message.tool_calls[0]
+                tool_name = tool_call.function.name
+                args = json.loads(tool_call.function.arguments)
+            
+                # Stop early instead of spending the remaining steps on a loop
+                if self.loop_detector is not None:
+                    loop_reason = self.loop_detector.check(log, tool_name, args)
+                    if loop_reason:
+                        self.run_stats["loop_detected"] = loop_reason
+                        self.run_stats["aborted_steps"] = self.max_steps - step
+                        if self.loop_detector.policy == "stop":
+                            return f"Stopped early: {loop_reason}", log.history
+                        return self._finish(query, thought, log)
             
-            action_str = f"Action: {tool_name}({args})"
-            history += f"{action_str}\n"
+                log.add_action(tool_name, args)
             
-            # Observation step: execute tool and get result
-            try:
-                get_tool_result_prompt = f"""
-                You need to **fully imagine** the execution result of this tool based on the current tool's name, description and parameters. The result should be beneficial for solving the problem. Only describe in one sentence what the tool did, this sentence should be in past tense.
-                Current scenario: {thought}
-                Tool name: {tool_name}
-                Tool description: {self.tools[tool_name]["description"]}
-                Tool parameters: {args}
-                """
-                tool_result = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[{"role": "user", "content": get_tool_result_prompt}],
-                )
-                observation = f"Observation: {tool_result.choices[0].message.content}"
-            except Exception as e:
-                observation = f"Observation: Tool execution error - {str(e)}"
+                # Observation step: execute tool and get result
+                try:
+                    observation = self.observation_provider.observe(self, tool_name, args, thought)
+                except BudgetExceeded:
+                    raise
+                except Exception as e:
+                    observation = f"Tool execution error - {str(e)}"
                 
-            history += f"{observation}\n"
+                log.add_observation(observation)
         
         result = "Unable to complete within specified steps"
-        return result, history
+        return result, log.history
     
     def run_and_return_tool_trajectory(self, query: str) -> List[str]:
-        result,history = self.run(query)
-        return self.parse_tool_trajectory(history)
+        self.run(query)
+        return list(self.last_step_log.tool_trajectory)
 
     def parse_tool_trajectory(self, history: str) -> List[str]:
         tool_trajectory = []
@@ -9,6 +9,12 @@ from .EarthAgent import EarthAgent
 from .Debate import DebateAgent
 from .CoT import ZeroShotCoTBasedAgent
 from .AFlow import AFlowAgent
+from .observation import (
+    ObservationProvider, LLMObservationProvider, CachedLLMObservationProvider, StubObservationProvider)
+from .step_log import ReActRecord, ReActStepLog
+from .loop_detector import LoopDetector
 
 __all__ = [
-    'BaseAgent', 'ReActAgent', 'PlanExecuteAgent', 'EarthAgent', 'DebateAgent', 'ZeroShotCoTBasedAgent', 'AFlowAgent']
+    'BaseAgent', 'ReActAgent', 'PlanExecuteAgent', 'EarthAgent', 'DebateAgent', 'ZeroShotCoTBasedAgent', 'AFlowAgent',
+    'ObservationProvider', 'LLMObservationProvider', 'CachedLLMObservationProvider', 'StubObservationProvider',
+    'ReActRecord', 'ReActStepLog', 'LoopDetector']
@@ -4,7 +4,7 @@ Base Agent interface for GeoPlan Benchmark.
 
 from abc import ABC, abstractmethod
 from typing import List, Callable, Optional, Dict, Any
-import inspect
+from geoplan_bench.tools.registry import ToolSet, add_tool_entry
 
 
 class BaseAgent(ABC):
@@ -55,42 +55,16 @@ class BaseAgent(ABC):
         Args:
             func: Tool function to add
         """
-        name = func.__name__
-        description = func.__doc__ or f"Execute {name} function"
-        
-        sig = inspect.signature(func)
-        parameters = {
-            "type": "object",
-            "properties": {},
-            "required": []
-        }
-        
-        for param_name, param in sig.parameters.items():
-            if param_name == 'self':
-                continue
-                
-            param_type = "string"
-            if param.annotation != inspect.Parameter.empty:
-                if param.annotation == int:
-                    param_type = "integer"
-                elif param.annotation == float:
-                    param_type = "number"
-                elif param.annotation == bool:
-                    param_type = "boolean"
-            
-            parameters["properties"][param_name] = {
-                "type": param_type,
-                "description": f"{param_name} parameter"
-            }
-            
-            if param.default == inspect.Parameter.empty:
-                parameters["required"].append(param_name)
-        
-        self.tools[name] = {
-            "func": func,
-            "description": description,
-            "parameters": parameters
-        }
+        self.tools = add_tool_entry(self.tools, func)
+
+    def set_tools(self, tools: ToolSet):
+        """
+        Use a prebuilt ToolSet, replacing the current tools.
+
+        Args:
+            tools: Tool set, e.g. get_tool_registry().subset([...])
+        """
+        self.tools = tools
     
     def parse_tool_trajectory(self, history: str) -> List[str]:
         """
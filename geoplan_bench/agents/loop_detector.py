@@ -0,0 +1,92 @@
+"""
+Programmatic loop detection for the ReAct loop.
+"""
+
+import threading
+from typing import Any, Dict, Optional
+
+from geoplan_bench.agents.step_log import ReActStepLog, call_fingerprint
+
+LOOP_POLICIES = ("finish", "stop")
+
+
+class LoopDetector:
+    """
+    Detect repeated or cyclic tool calls over a ReAct action log.
+
+    A candidate action is flagged when it repeats an earlier call with the
+    same arguments, repeats the same tool too many times in a row, or closes
+    a short cycle such as A, B, A, B. Each check looks up the call counts of
+    the step log and its last few tools, so it does not grow with the run.
+    """
+
+    def __init__(self, max_consecutive_tool: int = 2, max_identical_calls: int = 1,
+                 max_cycle_length: int = 3, policy: str = "finish"):
+        """
+        Args:
+            max_consecutive_tool: Allowed consecutive calls of one tool
+            max_identical_calls: Allowed calls with the same tool and arguments
+            max_cycle_length: Longest repeated tool sequence detected as a cycle
+            policy: "finish" triggers the final-result call, "stop" ends the run without it
+        """
+        if policy not in LOOP_POLICIES:
+            raise ValueError(f"Unknown loop policy: {policy}, expected one of {LOOP_POLICIES}")
+        self.max_consecutive_tool = max_consecutive_tool
+        self.max_identical_calls = max_identical_calls
+        self.max_cycle_length = max_cycle_length
+        self.policy = policy
+        self._lock = threading.Lock()
+        self.runs = 0
+        self.aborted_runs = 0
+        self.aborted_steps = 0
+        self.saved_calls = 0
+
+    @staticmethod
+    def fingerprint(tool_name: str, args: Dict[str, Any]) -> str:
+        """Canonical fingerprint of a tool call"""
+        return call_fingerprint(tool_name, args)
+
+    def check(self, log: ReActStepLog, tool_name: str, args: Dict[str, Any]) -> Optional[str]:
+        """
+        Check whether a candidate tool call continues a loop.
+
+        Args:
+            log: Step log of the run so far
+            tool_name: Candidate tool name
+            args: Candidate arguments
+
+        Returns:
+            Reason string if a loop is detected, otherwise None
+        """
+        if log.fingerprints[self.fingerprint(tool_name, args)] >= self.max_identical_calls:
+            return f"repeated_call:{tool_name}"
+
+        # the longest window looked at is a repeated cycle ending in the candidate
+        window = max(self.max_consecutive_tool, 2 * self.max_cycle_length - 1)
+        names = log.tool_trajectory[-window:] + [tool_name]
+        tail = names[-(self.max_consecutive_tool + 1):]
+        if len(tail) > self.max_consecutive_tool and len(set(tail)) == 1:
+            return f"repeated_tool:{tool_name}"
+
+        for length in range(2, self.max_cycle_length + 1):
+            if len(names) >= 2 * length and names[-length:] == names[-2 * length:-length]:
+                return f"cycle:{'->'.join(names[-length:])}"
+        return None
+
+    def record_run(self, run_stats: Dict[str, Any]):
+        """Accumulate the per-run counters of one ReAct run"""
+        with self._lock:
+            self.runs += 1
+            if run_stats.get("loop_detected"):
+                self.aborted_runs += 1
+                self.aborted_steps += run_stats.get("aborted_steps", 0)
+                self.saved_calls += run_stats.get("saved_calls", 0)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return counters accumulated over all runs"""
+        return {
+            "runs": self.runs,
+            "aborted_runs": self.aborted_runs,
+            "aborted_steps": self.aborted_steps,
+            "saved_calls": self.saved_calls,
+        }
@@ -0,0 +1,123 @@
+"""
+Observation providers for the ReAct loop.
+
+The benchmark tools are stubs, so a ReAct observation is either imagined by
+the LLM (original behaviour) or produced by calling the stub function.
+"""
+
+import json
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+from geoplan_bench.llm.telemetry import current_context
+
+# what besides (model, tool, args) a cached observation is keyed on:
+# "task": the task_id of the telemetry context, shared by all agents of one task
+# "thought": the thought that led to the call, which rarely repeats
+# "global": nothing, the same call gets the same observation in every task
+CACHE_SCOPES = ("task", "thought", "global")
+
+
+class ObservationProvider(ABC):
+    """Produce the observation text for one tool call of a ReAct agent."""
+
+    @abstractmethod
+    def observe(self, agent, tool_name: str, args: Dict[str, Any], scenario: str) -> str:
+        """
+        Produce the observation of a tool call.
+
+        Args:
+            agent: ReActAgent issuing the call
+            tool_name: Name of the called tool
+            args: Arguments of the call
+            scenario: Thought that led to the call
+
+        Returns:
+            Observation text, without the "Observation: " prefix
+        """
+        pass
+
+
+class LLMObservationProvider(ObservationProvider):
+    """Let the agent's LLM imagine the tool result (one completion per call)."""
+
+    def observe(self, agent, tool_name: str, args: Dict[str, Any], scenario: str) -> str:
+        response = agent._create_completion(
+            [{"role": "user", "content": agent.get_tool_result_prompt(scenario, tool_name, args)}],
+        )
+        return response.choices[0].message.content
+
+
+class CachedLLMObservationProvider(LLMObservationProvider):
+    """
+    LLM observation provider that memoizes results.
+
+    Share one instance between agents (e.g. all EarthAgent experts) and
+    tasks so identical (tool, args) calls within the cache scope are
+    imagined only once.
+    """
+
+    def __init__(self, max_size: Optional[int] = None, scope: str = "task"):
+        """
+        Args:
+            max_size: Maximum number of cached observations (None for unbounded)
+            scope: One of CACHE_SCOPES, what the observation is keyed on besides tool and args
+        """
+        if scope not in CACHE_SCOPES:
+            raise ValueError(f"Unknown cache scope: {scope}, expected one of {CACHE_SCOPES}")
+        self.max_size = max_size
+        self.scope = scope
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def cache_key(self, agent, tool_name: str, args: Dict[str, Any], scenario: str) -> tuple:
+        """Build the memoization key of a tool call"""
+        args_key = json.dumps(args, sort_keys=True, ensure_ascii=False, default=str)
+        if self.scope == "task":
+            scope_key = current_context().get("task_id")
+        elif self.scope == "thought":
+            scope_key = scenario
+        else:
+            scope_key = None
+        return (agent.model, tool_name, args_key, scope_key)
+
+    def observe(self, agent, tool_name: str, args: Dict[str, Any], scenario: str) -> str:
+        key = self.cache_key(agent, tool_name, args, scenario)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return self._cache[key]
+            self.misses += 1
+
+        observation = super().observe(agent, tool_name, args, scenario)
+
+        with self._lock:
+            self._cache[key] = observation
+            if self.max_size is not None and len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
+        return observation
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache hit/miss counters"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._cache),
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+class StubObservationProvider(ObservationProvider):
+    """
+    Deterministic provider that calls the stub function registered with the
+    tool (see geoplan_bench/tools/tools.py), without any LLM round-trip.
+    """
+
+    def observe(self, agent, tool_name: str, args: Dict[str, Any], scenario: str) -> str:
+        return str(agent.tools[tool_name]["func"](**args))
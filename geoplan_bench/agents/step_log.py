@@ -0,0 +1,86 @@
+"""
+Structured step log of a ReAct run.
+"""
+
+import json
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+
+def call_fingerprint(tool_name: str, args: Dict[str, Any]) -> str:
+    """Canonical fingerprint of a tool call"""
+    return f"{tool_name}:{json.dumps(args, sort_keys=True, ensure_ascii=False, default=str)}"
+
+
+@dataclass
+class ReActRecord:
+    """One Thought/Action/Observation entry of a ReAct run"""
+    kind: str  # "thought", "action", "finish" or "observation"
+    content: str
+    tool_name: Optional[str] = None
+    args: Dict[str, Any] = field(default_factory=dict)
+    fingerprint: Optional[str] = None  # call_fingerprint of an action
+
+    def render(self) -> str:
+        """Render the record as a history line"""
+        if self.kind == "thought":
+            return self.content
+        if self.kind == "action":
+            return f"Action: {self.tool_name}({self.args})"
+        if self.kind == "finish":
+            return "Action: FINISH"
+        return f"Observation: {self.content}"
+
+
+class ReActStepLog:
+    """
+    Typed records of a ReAct run.
+
+    The tool trajectory and action records are maintained as actions are
+    appended, and the ``Thought:/Action:/Observation:`` history string is only
+    rendered when it is read, so bookkeeping per step does not depend on history length.
+    """
+
+    def __init__(self):
+        self.records: List[ReActRecord] = []
+        self.tool_trajectory: List[str] = []
+        self.actions: List[ReActRecord] = []
+        # calls per call_fingerprint, for loop detection
+        self.fingerprints: Counter = Counter()
+        self._lines: List[str] = []
+        self._history: Optional[str] = ""
+
+    def _append(self, record: ReActRecord) -> ReActRecord:
+        self.records.append(record)
+        self._lines.append(f"{record.render()}\n")
+        self._history = None
+        return record
+
+    def add_thought(self, thought: str) -> ReActRecord:
+        """Append a thought, ``thought`` already starts with "Thought:" """
+        return self._append(ReActRecord(kind="thought", content=thought))
+
+    def add_action(self, tool_name: str, args: Dict[str, Any]) -> ReActRecord:
+        """Append a tool call"""
+        record = ReActRecord(kind="action", content=tool_name, tool_name=tool_name, args=args,
+                             fingerprint=call_fingerprint(tool_name, args))
+        self.tool_trajectory.append(tool_name)
+        self.actions.append(record)
+        self.fingerprints[record.fingerprint] += 1
+        return self._append(record)
+
+    def add_finish(self) -> ReActRecord:
+        """Append the FINISH action"""
+        return self._append(ReActRecord(kind="finish", content="FINISH"))
+
+    def add_observation(self, observation: str) -> ReActRecord:
+        """Append an observation, without the "Observation: " prefix"""
+        return self._append(ReActRecord(kind="observation", content=observation))
+
+    @property
+    def history(self) -> str:
+        """History string in the Thought:/Action:/Observation: format"""
+        if self._history is None:
+            self._history = "".join(self._lines)
+        return self._history
@@ -0,0 +1,56 @@
+"""
+Token usage accounting for agent LLM calls.
+"""
+
+import threading
+from typing import Dict, Any
+
+
+class UsageTracker:
+    """Accumulate the ``usage`` block of chat completion responses."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Clear all counters"""
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cached_tokens = 0
+
+    def record(self, response):
+        """
+        Record the usage of one completion response.
+
+        Args:
+            response: Chat completion response returned by the client
+        """
+        usage = getattr(response, "usage", None)
+        with self._lock:
+            self.calls += 1
+            if usage is None:
+                return
+            self.prompt_tokens += getattr(usage, "prompt_tokens", 0) or 0
+            self.completion_tokens += getattr(usage, "completion_tokens", 0) or 0
+            details = getattr(usage, "prompt_tokens_details", None)
+            if details is not None:
+                self.cached_tokens += getattr(details, "cached_tokens", 0) or 0
+
+    @property
+    def cached_token_ratio(self) -> float:
+        """Share of prompt tokens served from the provider prompt cache"""
+        if not self.prompt_tokens:
+            return 0.0
+        return self.cached_tokens / self.prompt_tokens
+
+    def summary(self) -> Dict[str, Any]:
+        """Return the counters as a JSON-serializable dict"""
+        return {
+            "calls": self.calls,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cached_tokens": self.cached_tokens,
+            "cached_token_ratio": self.cached_token_ratio,
+        }
@@ -23,6 +23,30 @@ Output in JSON format:
   "description": "DAG template based on actual needs in {domain} domain"
 }}"""
 
+DAG_REPAIR_PROMPT = """The following task dependency template for the remote sensing {domain} domain failed validation:
+
+{template}
+
+Problems found:
+{issues}
+
+Available tools:
+{tools_str}
+
+Requirements:
+1. Keep the valid nodes and edges unchanged and only fix the problems listed above
+2. Use only tool names from the available tools, exactly as written
+3. The graph must be a Directed Acyclic Graph
+4. It must contain a dependency chain of at least {min_path_length} tools from data acquisition to result output
+
+Output the corrected template in the same JSON format:
+{{
+  "domain": "{domain}",
+  "nodes": ["tool1", "tool2", "tool3", ...],
+  "edges": [["source_tool_1", "target_tool_1"], ["source_tool_2", "target_tool_2"], ...],
+  "description": "DAG template based on actual needs in {domain} domain"
+}}"""
+
 PARAMETERIZE_FLOW_PROMPT = """Complete parameters for the tool flow to generate instantiated tool calls:
 
 Tool sequence: {tools}
@@ -187,6 +211,28 @@ In the "thought" field, explain your step-by-step reasoning process.
 In the "answer" field, provide a clear sequence of tools/operations needed to complete the task.
 """
 
+STRUCTURED_TOOL_FLOW_PROMPT = """
+You are an expert in remote sensing task planning. Generate the sequence of tools that solves the given remote sensing task.
+
+Think step by step about what tools and operations are needed:
+1. Consider the type of remote sensing task (agriculture, disaster management, environmental monitoring, etc.)
+2. Think about the logical sequence of operations (data acquisition, preprocessing, analysis, output)
+3. Select appropriate tools for each step, using only tool names from the list below
+
+The tool flow must satisfy:
+1. Remote sensing tasks using satellite imagery include download_satellite_imagery, geometric_correction, atmospheric_correction in this order
+2. cloud_mask_removal follows the corrections if satellite imagery is used
+3. The flow ends with format_data or generate_analysis_reports
+
+Task: {input}
+
+Available tools:
+{tools}
+
+In the "thought" field, explain your step-by-step reasoning process.
+In the "tool_flow" field, list the tool names in execution order.
+"""
+
 SC_ENSEMBLE_PROMPT = """
 Several tool flow solutions have been generated for the same remote sensing task planning problem. They are as follows:
 {solutions}
@@ -0,0 +1,3 @@
+"""
+Data schemas for GeoPlan Benchmark.
+"""
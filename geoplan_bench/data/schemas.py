@@ -0,0 +1,88 @@
+"""
+Pydantic schemas used for structured LLM outputs.
+"""
+
+from typing import Any, Dict, List, Literal, Optional
+from pydantic import BaseModel
+
+
+class PlanStepSchema(BaseModel):
+    """One tool call of a Plan-and-Execute plan"""
+    tool: str
+    parameters: Optional[Dict[str, Any]] = None
+
+
+class PlanSchema(BaseModel):
+    """Plan returned by the Plan-and-Execute planning step"""
+    plan: List[PlanStepSchema]
+
+
+class EloAnswerSchema(BaseModel):
+    """Winner of a pairwise completeness comparison"""
+    answer: Literal["A", "B", "Tie"]
+
+
+class ComplexityChoiceSchema(BaseModel):
+    """Complexity level chosen for a task"""
+    complexity: Literal["Simple", "Medium", "Complex"]
+
+
+class ToolFlowSchema(BaseModel):
+    """Tool flow returned by a structured AFlow generation"""
+    thought: str
+    tool_flow: List[str]
+
+
+class CoTStepSchema(BaseModel):
+    """One reasoning step of a CoT answer"""
+    thought: str
+    tool: str
+
+
+class CoTAnswerSchema(BaseModel):
+    """CoT answer for one question of a batch"""
+    task_index: int
+    steps: List[CoTStepSchema]
+
+
+class CoTBatchSchema(BaseModel):
+    """CoT answers for a batch of questions"""
+    answers: List[CoTAnswerSchema]
+
+
+class ParameterizedToolSchema(BaseModel):
+    """One tool call of a parameterized flow"""
+    tool: str
+    params: Dict[str, Any] = {}
+
+
+class ParameterizedFlowSchema(BaseModel):
+    """Tool flow with parameters, returned by the flow parameterizer"""
+    parameterized_tools: List[ParameterizedToolSchema]
+
+
+class KeyStepsSchema(BaseModel):
+    """Key steps extracted from a ground truth tool flow"""
+    key_steps: List[str]
+
+
+class KeyToolsSchema(BaseModel):
+    """Key tools extracted from an agent tool flow"""
+    key_tools: List[str]
+
+
+class AgentSelectionSchema(BaseModel):
+    """Expert agent chosen by an EarthAgent selector, with its subtask"""
+    selected_agent: str
+    subtask: str = ""
+
+
+class SubtaskAssignmentSchema(BaseModel):
+    """One expert agent of a multi-agent EarthAgent selection"""
+    name: str
+    subtask: str = ""
+
+
+class AgentSelectionsSchema(BaseModel):
+    """Expert agents chosen by an EarthAgent selector"""
+    selected_agents: List[SubtaskAssignmentSchema] = []
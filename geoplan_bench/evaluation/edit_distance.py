@@ -0,0 +1,100 @@
+"""
+Weighted edit distance between tool flows.
+
+Dependency-free core of the structural metric, also used by agents to
+compare candidate tool flows locally.
+"""
+
+import os
+import json
+from typing import Callable, Dict, List, Optional, Sequence
+
+DEFAULT_TOOL_IMPORTANCE_PATH = os.path.join("data/tasks/filter_info", "tool_importance_analysis.json")
+
+
+def tool_flow_edit_distance(flow_a: Sequence[str], flow_b: Sequence[str],
+                            tool_cost: Optional[Callable[[str], float]] = None,
+                            substitution_cost: Optional[Callable[[str, str], float]] = None) -> float:
+    """
+    Edit distance where deleting/inserting a tool costs ``tool_cost(tool)``
+    and substituting two different tools costs ``substitution_cost(a, b)``.
+
+    Args:
+        flow_a: Sequence 1 (usually agent path)
+        flow_b: Sequence 2 (usually golden path)
+        tool_cost: Insertion/deletion cost of a tool, defaults to 1.0
+        substitution_cost: Cost of replacing one tool by another, defaults to 1.0
+
+    Returns:
+        Minimum total edit cost
+    """
+    if tool_cost is None:
+        tool_cost = lambda tool: 1.0
+    if substitution_cost is None:
+        substitution_cost = lambda tool_a, tool_b: 1.0
+
+    len1, len2 = len(flow_a), len(flow_b)
+    dp = [[0] * (len2 + 1) for _ in range(len1 + 1)]
+
+    # Initialize first row and column (insertion/deletion costs)
+    for i in range(1, len1 + 1):
+        dp[i][0] = dp[i-1][0] + tool_cost(flow_a[i-1])
+    for j in range(1, len2 + 1):
+        dp[0][j] = dp[0][j-1] + tool_cost(flow_b[j-1])
+
+    for i in range(1, len1 + 1):
+        for j in range(1, len2 + 1):
+            tool1 = flow_a[i-1]
+            tool2 = flow_b[j-1]
+            if tool1 == tool2:
+                # Exact match, no cost
+                dp[i][j] = dp[i-1][j-1]
+            else:
+                dp[i][j] = min(
+                    dp[i-1][j-1] + substitution_cost(tool1, tool2),  # substitution
+                    dp[i-1][j] + tool_cost(tool1),                   # deletion
+                    dp[i][j-1] + tool_cost(tool2)                    # insertion
+                )
+    return dp[len1][len2]
+
+
+def load_tool_costs(analysis_path: str = DEFAULT_TOOL_IMPORTANCE_PATH) -> Dict[str, float]:
+    """
+    Load the combined_cost of each tool from a tool importance analysis file.
+
+    Returns an empty dict when the file does not exist or cannot be read.
+    """
+    if not os.path.exists(analysis_path):
+        return {}
+    try:
+        with open(analysis_path, 'r', encoding='utf-8') as f:
+            analysis = json.load(f)
+    except Exception as e:
+        print(f"Warning: Failed to load tool importance analysis: {e}")
+        return {}
+    return {
+        tool: scores['combined_cost']
+        for tool, scores in analysis.get('tool_importance_scores', {}).items()
+        if 'combined_cost' in scores
+    }
+
+
+def medoid_index(candidates: List[Sequence[str]], tool_costs: Optional[Dict[str, float]] = None) -> int:
+    """
+    Index of the candidate with the smallest summed edit distance to the others.
+    Ties go to the earliest candidate.
+
+    Args:
+        candidates: Candidate tool flows
+        tool_costs: Insertion/deletion cost per tool, missing tools cost 1.0
+    """
+    tool_costs = tool_costs or {}
+    tool_cost = lambda tool: tool_costs.get(tool, 1.0)
+    n = len(candidates)
+    totals = [0.0] * n
+    for i in range(n):
+        for j in range(i + 1, n):
+            distance = tool_flow_edit_distance(candidates[i], candidates[j], tool_cost)
+            totals[i] += distance
+            totals[j] += distance
+    return min(range(n), key=lambda i: totals[i])
@@ -1,12 +1,27 @@
 """
 Evaluation metrics for GeoPlan Benchmark.
+
+Exports are imported on first access; StructuralEvaluator loads its embedding
+model only when instantiated.
 """
-from geoplan_bench.evaluation.metrics.correctness import CorrectnessEvaluator
-from geoplan_bench.evaluation.metrics.holistic import HolisticEvaluator
-from geoplan_bench.evaluation.metrics.structural import StructuralEvaluator
-
-__all__ = [
-    "CorrectnessEvaluator",
-    "HolisticEvaluator",
-    "StructuralEvaluator",
-]
\ No newline at end of file
+import importlib
+
+_EXPORTS = {
+    "CorrectnessEvaluator": "geoplan_bench.evaluation.metrics.correctness",
+    "HolisticEvaluator": "geoplan_bench.evaluation.metrics.holistic",
+    "StructuralEvaluator": "geoplan_bench.evaluation.metrics.structural",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
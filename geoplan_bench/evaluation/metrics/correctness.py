@@ -1,16 +1,12 @@
-import os
-import json
-from openai import OpenAI
+from geoplan_bench.llm import create_openai_client, json_mode_kwargs, parse_json_response
+from geoplan_bench.data.schemas import KeyStepsSchema, KeyToolsSchema
 from geoplan_bench.config.prompts import KEY_STEPS_EXTRACTION_PROMPT, KEY_TOOLS_EXTRACTION_PROMPT
 
 
 
 class CorrectnessEvaluator:
     def __init__(self, model="gpt-4o-mini"):
-        self.client = OpenAI(
-            api_key=os.getenv("OPENAI_API_KEY"),
-            base_url=os.getenv("OPENAI_API_BASE")
-        )
+        self.client = create_openai_client()
         self.model = model
 
     def generate_key_steps(self, question, ground_truth_tool_flow):
@@ -22,27 +18,15 @@ class CorrectnessEvaluator:
         
         response = self.client.chat.completions.create(
             model=self.model,
-            messages=[{"role": "user", "content": prompt}]
+            messages=[{"role": "user", "content": prompt}],
+            **json_mode_kwargs()
         )
-        try:
-            response_content = response.choices[0].message.content.strip()
-            
-            # try to extract JSON part
-            if "```json" in response_content:
-                json_start = response_content.find("```json") + 7
-                json_end = response_content.find("```", json_start)
-                response_content = response_content[json_start:json_end].strip()
-            elif "```" in response_content:
-                json_start = response_content.find("```") + 3
-                json_end = response_content.find("```", json_start)
-                response_content = response_content[json_start:json_end].strip()
-            
-            key_steps_data = json.loads(response_content)
-            key_steps = key_steps_data.get("key_steps", [])
-            
-        except (json.JSONDecodeError, KeyError, AttributeError) as e:
-            print(f"Key step parsing failed: {e}")
-            print(f"LLM response content: {response.choices[0].message.content[:200]}...")
+        key_steps_data = parse_json_response(response.choices[0].message.content, schema=KeyStepsSchema)
+        if key_steps_data is not None:
+            key_steps = key_steps_data["key_steps"]
+        else:
+            print("Key step parsing failed")
+            print(f"LLM response content: {(response.choices[0].message.content or '')[:200]}...")
             # use gold path prefix 70% as key steps
             key_steps = ground_truth_tool_flow[:max(1, int(len(ground_truth_tool_flow) * 0.7))]
         
@@ -57,27 +41,15 @@ class CorrectnessEvaluator:
         
         response = self.client.chat.completions.create(
             model=self.model,
-            messages=[{"role": "user", "content": prompt}]
+            messages=[{"role": "user", "content": prompt}],
+            **json_mode_kwargs()
         )
-        try:
-            response_content = response.choices[0].message.content.strip()
-            
-            # try to extract JSON part
-            if "```json" in response_content:
-                json_start = response_content.find("```json") + 7
-                json_end = response_content.find("```", json_start)
-                response_content = response_content[json_start:json_end].strip()
-            elif "```" in response_content:
-                json_start = response_content.find("```") + 3
-                json_end = response_content.find("```", json_start)
-                response_content = response_content[json_start:json_end].strip()
-            
-            key_tools_data = json.loads(response_content)
-            key_tools = key_tools_data.get("key_tools", [])
-            
-        except (json.JSONDecodeError, KeyError, AttributeError) as e:
-            print(f"Key tool parsing failed: {e}")
-            print(f"LLM response content: {response.choices[0].message.content[:200]}...")
+        key_tools_data = parse_json_response(response.choices[0].message.content, schema=KeyToolsSchema)
+        if key_tools_data is not None:
+            key_tools = key_tools_data["key_tools"]
+        else:
+            print("Key tool parsing failed")
+            print(f"LLM response content: {(response.choices[0].message.content or '')[:200]}...")
             # use gold path prefix 70% as key tools
             key_tools = agent_tool_flow[:max(1, int(len(agent_tool_flow) * 0.7))]
         
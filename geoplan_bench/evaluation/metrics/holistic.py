@@ -1,15 +1,11 @@
-import os
-from openai import OpenAI
+from geoplan_bench.llm import create_openai_client
 from geoplan_bench.config.prompts import COMPLETENESS_EVALUATION_PROMPT
 from geoplan_bench.data.schemas import EloAnswerSchema
 
 
 class HolisticEvaluator:
     def __init__(self, model="gpt-4o-mini"):
-        self.client = OpenAI(
-            api_key=os.getenv("OPENAI_API_KEY"),
-            base_url=os.getenv("OPENAI_API_BASE")
-        )
+        self.client = create_openai_client()
         self.model = model
 
     def evaluate_completeness_elo(self, agents_data, question, k_factor=32):
@@ -8,8 +8,7 @@ import re
 import json
 from typing import List, Dict, Tuple, Union
 
-from sklearn.metrics.pairwise import cosine_similarity
-from sentence_transformers import SentenceTransformer
+from geoplan_bench.evaluation.edit_distance import tool_flow_edit_distance
 
 
 class StructuralEvaluator:
@@ -74,6 +73,8 @@ class StructuralEvaluator:
         """Build tool semantic similarity model""" 
         tool_names = list(self.tool_descriptions.keys())
         descriptions = [self.tool_descriptions[name] for name in tool_names]
+        # imported here so that importing the metrics does not load torch
+        from sentence_transformers import SentenceTransformer
         self.sentence_model = SentenceTransformer('paraphrase-multilingual-MiniLM-L12-v2')
         self.tool_embeddings = self.sentence_model.encode(descriptions)
         self.tool_name_to_index = {name: i for i, name in enumerate(tool_names)}
@@ -108,6 +109,7 @@ class StructuralEvaluator:
             embedding_b = self.tool_embeddings[idx_b].reshape(1, -1)
             
             # Calculate semantic similarity
+            from sklearn.metrics.pairwise import cosine_similarity
             cos_sim = cosine_similarity(embedding_a, embedding_b)[0, 0]
             # Map similarity from [-1,1] range to [0,1] range
             similarity = max(0, (cos_sim + 1) / 2)
@@ -171,48 +173,12 @@ class StructuralEvaluator:
         if not isinstance(ground_truth_tool_flow, list):
             ground_truth_tool_flow = self._parse_tool_flow(ground_truth_tool_flow)
         len1, len2 = len(agent_tool_flow), len(ground_truth_tool_flow)
-        # Create dynamic programming matrix
-        dp = [[0] * (len2 + 1) for _ in range(len1 + 1)]
-        
-        # Initialize first row and column (insertion/deletion costs)
-        for i in range(1, len1 + 1):
-            tool = agent_tool_flow[i-1]
-            dp[i][0] = dp[i-1][0] + self.get_tool_cost(tool)
-        
-        for j in range(1, len2 + 1):
-            tool = ground_truth_tool_flow[j-1]
-            dp[0][j] = dp[0][j-1] + self.get_tool_cost(tool)
-        
-        # Fill dynamic programming matrix
-        for i in range(1, len1 + 1):
-            for j in range(1, len2 + 1):
-                tool1 = agent_tool_flow[i-1]
-                tool2 = ground_truth_tool_flow[j-1]
-                
-                if tool1 == tool2:
-                    # Exact match, no cost
-                    dp[i][j] = dp[i-1][j-1]
-                else:
-                    # Calculate costs for three operations
-                    
-                    # Substitution cost = 1 - similarity
-                    similarity = self.calculate_tool_similarity(tool1, tool2)
-                    substitution_cost = 1.0 - similarity
-                    
-                    # Deletion cost
-                    deletion_cost = self.get_tool_cost(tool1)
-                    
-                    # Insertion cost
-                    insertion_cost = self.get_tool_cost(tool2)
-                    
-                    # Choose minimum cost operation
-                    dp[i][j] = min(
-                        dp[i-1][j-1] + substitution_cost,  # substitution
-                        dp[i-1][j] + deletion_cost,        # deletion
-                        dp[i][j-1] + insertion_cost         # insertion
-                    )
-        
-        enhanced_edit_distance = dp[len1][len2]
+        # Substitution cost = 1 - similarity, insertion/deletion cost = tool importance cost
+        enhanced_edit_distance = tool_flow_edit_distance(
+            agent_tool_flow, ground_truth_tool_flow,
+            tool_cost=self.get_tool_cost,
+            substitution_cost=lambda tool1, tool2: 1.0 - self.calculate_tool_similarity(tool1, tool2)
+        )
         max_possible_cost = max(len1, len2) * 1.5
         similarity_score = 1 - (enhanced_edit_distance / max_possible_cost)
         return similarity_score, enhanced_edit_distance
@@ -0,0 +1,77 @@
+"""
+LLM client providers for GeoPlan Benchmark.
+"""
+
+from geoplan_bench.llm.providers import (
+    LLM_BACKENDS,
+    get_backend,
+    get_mock_llm,
+    set_mock_llm,
+    create_openai_client,
+    create_genai_client,
+)
+from geoplan_bench.llm.telemetry import (
+    LLMCallRecord,
+    TelemetryCollector,
+    OTelExporter,
+    PrometheusExporter,
+    get_collector,
+    telemetry_context,
+    propagate_context,
+)
+from geoplan_bench.llm.budget import (
+    Budget,
+    BudgetExceeded,
+    BudgetTracker,
+    budget_scope,
+)
+from geoplan_bench.llm.json_parsing import (
+    JSONParseError,
+    extract_json,
+    parse_json_response,
+    json_mode_kwargs,
+    get_parse_stats,
+    reset_parse_stats,
+)
+from geoplan_bench.llm.limits import (
+    get_concurrency_limit,
+    set_concurrency_limit,
+)
+from geoplan_bench.llm.tracing import (
+    Span,
+    Tracer,
+    get_tracer,
+    span,
+)
+
+__all__ = [
+    "LLM_BACKENDS",
+    "get_backend",
+    "get_mock_llm",
+    "set_mock_llm",
+    "create_openai_client",
+    "create_genai_client",
+    "LLMCallRecord",
+    "TelemetryCollector",
+    "OTelExporter",
+    "PrometheusExporter",
+    "get_collector",
+    "telemetry_context",
+    "propagate_context",
+    "Budget",
+    "BudgetExceeded",
+    "BudgetTracker",
+    "budget_scope",
+    "JSONParseError",
+    "extract_json",
+    "parse_json_response",
+    "json_mode_kwargs",
+    "get_parse_stats",
+    "reset_parse_stats",
+    "get_concurrency_limit",
+    "set_concurrency_limit",
+    "Span",
+    "Tracer",
+    "get_tracer",
+    "span",
+]
@@ -0,0 +1,111 @@
+"""
+Token, call and wall-time budgets for LLM calls.
+
+``budget_scope`` activates a Budget for the calls made inside the block. The
+instrumented clients check every active budget before a call and charge its
+tokens afterwards, raising BudgetExceeded once a limit is reached; agents catch
+it and return the trajectory they have so far. Limits are checked between
+calls, so a scope can overshoot by at most the tokens and duration of the call
+in flight.
+"""
+
+import time
+import threading
+import contextvars
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+_active_budgets = contextvars.ContextVar("geoplan_active_budgets", default=())
+
+
+class BudgetExceeded(Exception):
+    """Raised instead of an LLM call once a budget limit is reached"""
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+@dataclass
+class Budget:
+    """Limits for one scope, None means unlimited"""
+    max_tokens: Optional[int] = None
+    max_calls: Optional[int] = None
+    max_seconds: Optional[float] = None
+
+    def is_unlimited(self) -> bool:
+        return self.max_tokens is None and self.max_calls is None and self.max_seconds is None
+
+
+class BudgetTracker:
+    """Usage of one budget scope, shared by the threads the scope's context is propagated to"""
+
+    def __init__(self, budget: Optional[Budget] = None):
+        self.budget = budget or Budget()
+        self.tokens = 0
+        self.calls = 0
+        self.start = time.perf_counter()
+        self.exceeded: Optional[str] = None
+        self._lock = threading.Lock()
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.start
+
+    def _limit_reached(self) -> Optional[str]:
+        budget = self.budget
+        if budget.max_calls is not None and self.calls >= budget.max_calls:
+            return f"max_calls {budget.max_calls} reached"
+        if budget.max_tokens is not None and self.tokens >= budget.max_tokens:
+            return f"max_tokens {budget.max_tokens} reached ({self.tokens} used)"
+        if budget.max_seconds is not None and self.elapsed >= budget.max_seconds:
+            return f"max_seconds {budget.max_seconds} reached ({self.elapsed:.1f}s elapsed)"
+        return None
+
+    def reserve(self):
+        """Count a call, or raise BudgetExceeded if a limit is already reached"""
+        with self._lock:
+            reason = self.exceeded or self._limit_reached()
+            if reason:
+                self.exceeded = reason
+                raise BudgetExceeded(reason)
+            self.calls += 1
+
+    def charge(self, tokens: int):
+        with self._lock:
+            self.tokens += tokens
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "max_tokens": self.budget.max_tokens,
+            "max_calls": self.budget.max_calls,
+            "max_seconds": self.budget.max_seconds,
+            "tokens": self.tokens,
+            "calls": self.calls,
+            "elapsed_s": self.elapsed,
+            "exceeded": self.exceeded,
+        }
+
+
+@contextmanager
+def budget_scope(budget: Optional[Budget] = None):
+    """Enforce budget on the LLM calls made inside the block, yields its BudgetTracker; scopes nest"""
+    tracker = BudgetTracker(budget)
+    token = _active_budgets.set(_active_budgets.get() + (tracker,))
+    try:
+        yield tracker
+    finally:
+        _active_budgets.reset(token)
+
+
+def reserve_call():
+    """Check and count a call against every active budget"""
+    for tracker in _active_budgets.get():
+        tracker.reserve()
+
+
+def charge_tokens(tokens: int):
+    """Charge the tokens of a finished call to every active budget"""
+    for tracker in _active_budgets.get():
+        tracker.charge(tokens)
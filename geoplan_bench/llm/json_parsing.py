@@ -0,0 +1,152 @@
+"""
+Tolerant JSON extraction for LLM responses.
+
+extract_json tries, in order: the whole text, fenced ``` blocks, the first
+decodable object or array inside surrounding prose, and finally a truncated
+object with its open strings and brackets closed. parse_json_response adds
+optional validation against a pydantic schema and counts calls, repairs and
+failures per call site (the calling class and method), see get_parse_stats.
+
+json_mode_kwargs returns the request arguments that switch a provider to
+native JSON output; set GEOPLAN_NATIVE_JSON=0 for endpoints without it.
+"""
+
+import os
+import re
+import json
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from geoplan_bench.llm.telemetry import _caller
+
+_FENCE = re.compile(r'```(?:json|JSON)?\s*(.*?)```', re.DOTALL)
+_decoder = json.JSONDecoder()
+
+_stats_lock = threading.Lock()
+_stats: Dict[str, Dict[str, int]] = {}
+
+
+class JSONParseError(ValueError):
+    """No JSON value could be extracted from a response"""
+
+
+def json_mode_kwargs(provider: str = "openai") -> Dict[str, Any]:
+    """Keyword arguments requesting native JSON output from provider, empty when disabled"""
+    if os.getenv("GEOPLAN_NATIVE_JSON", "1") == "0":
+        return {}
+    if provider == "genai":
+        return {"config": {"response_mime_type": "application/json"}}
+    return {"response_format": {"type": "json_object"}}
+
+
+def _close_partial(text: str) -> str:
+    """Close the strings, arrays and objects left open by a truncated response"""
+    closers = []
+    in_string = False
+    escaped = False
+    for char in text:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "{[":
+            closers.append("}" if char == "{" else "]")
+        elif char in "}]" and closers:
+            closers.pop()
+    if in_string:
+        text += '"'
+    text = text.rstrip().rstrip(",")
+    if text.endswith(":"):
+        text += " null"
+    return text + "".join(reversed(closers))
+
+
+def _extract(text: str) -> Tuple[Any, str]:
+    """(value, strategy that found it)"""
+    stripped = text.strip()
+    try:
+        return json.loads(stripped), "direct"
+    except ValueError:
+        pass
+    for block in _FENCE.findall(stripped):
+        try:
+            return json.loads(block.strip()), "fenced"
+        except ValueError:
+            continue
+    # the outermost value that decodes, either complete or truncated at the end of the text
+    for match in re.finditer(r'[\{\[]', stripped):
+        try:
+            return _decoder.raw_decode(stripped, match.start())[0], "embedded"
+        except ValueError:
+            pass
+        try:
+            return json.loads(_close_partial(stripped[match.start():].replace("```", ""))), "partial"
+        except ValueError:
+            continue
+    raise JSONParseError(f"no JSON value found in response: {stripped[:80]!r}")
+
+
+def extract_json(text: Optional[str]) -> Any:
+    """First JSON value in text, raises JSONParseError if there is none"""
+    if not text:
+        raise JSONParseError("empty response")
+    return _extract(text)[0]
+
+
+def _count(site: str, key: str):
+    with _stats_lock:
+        counts = _stats.setdefault(site, {"calls": 0, "repaired": 0, "schema_errors": 0, "failures": 0})
+        counts[key] += 1
+
+
+def parse_json_response(content: Optional[str], schema=None, site: Optional[str] = None, default=None):
+    """
+    Parse an LLM response into JSON, or return default.
+
+    Args:
+        content: Response text
+        schema: Optional pydantic model the value must validate against,
+            the validated value is returned as a plain dict
+        site: Name the call is counted under, defaults to the calling Class.method
+        default: Returned when no valid value can be extracted
+    """
+    if site is None:
+        component, stage = _caller()
+        site = f"{component}.{stage}"
+    _count(site, "calls")
+    try:
+        if not content:
+            raise JSONParseError("empty response")
+        value, strategy = _extract(content)
+    except JSONParseError:
+        _count(site, "failures")
+        return default
+    if strategy != "direct":
+        _count(site, "repaired")
+    if schema is not None:
+        try:
+            value = schema.model_validate(value).model_dump()
+        except Exception:
+            _count(site, "schema_errors")
+            _count(site, "failures")
+            return default
+    return value
+
+
+def get_parse_stats() -> Dict[str, Dict[str, Any]]:
+    """Per call site counts with the failure rate"""
+    with _stats_lock:
+        stats = {site: dict(counts) for site, counts in _stats.items()}
+    for counts in stats.values():
+        counts["failure_rate"] = counts["failures"] / counts["calls"] if counts["calls"] else 0.0
+    return stats
+
+
+def reset_parse_stats():
+    with _stats_lock:
+        _stats.clear()
@@ -0,0 +1,63 @@
+"""
+Per-provider bounds on in-flight LLM calls.
+
+The instrumented clients hold a provider slot for the duration of every
+request attempt (not during retry backoff), so concurrent pipelines can run
+many jobs while keeping each provider within its rate or quota limits. Limits
+default to GEOPLAN_MAX_CONCURRENCY_OPENAI and GEOPLAN_MAX_CONCURRENCY_GENAI,
+unset means unbounded.
+"""
+
+import os
+import threading
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+PROVIDERS = ("openai", "genai")
+
+_lock = threading.Lock()
+_limits: Dict[str, Optional[int]] = {}
+_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+
+
+def _limit_from_env(provider: str) -> Optional[int]:
+    value = os.getenv(f"GEOPLAN_MAX_CONCURRENCY_{provider.upper()}")
+    return int(value) if value else None
+
+
+def get_concurrency_limit(provider: str) -> Optional[int]:
+    """Maximum in-flight calls for provider, None if unbounded"""
+    with _lock:
+        if provider not in _limits:
+            _limits[provider] = _limit_from_env(provider)
+        return _limits[provider]
+
+
+def set_concurrency_limit(provider: str, limit: Optional[int]):
+    """Bound in-flight calls for provider; calls already waiting keep the previous limit"""
+    if limit is not None and limit < 1:
+        raise ValueError(f"Concurrency limit must be at least 1, got {limit}")
+    with _lock:
+        _limits[provider] = limit
+        _semaphores.pop(provider, None)
+
+
+def _semaphore(provider: str) -> Optional[threading.BoundedSemaphore]:
+    limit = get_concurrency_limit(provider)
+    if limit is None:
+        return None
+    with _lock:
+        if provider not in _semaphores:
+            _semaphores[provider] = threading.BoundedSemaphore(limit)
+        return _semaphores[provider]
+
+
+@contextmanager
+def provider_slot(provider: str):
+    """Hold one of provider's call slots for the duration of the block"""
+    semaphore = _semaphore(provider)
+    if semaphore is None:
+        yield
+        return
+    with semaphore:
+        yield
@@ -0,0 +1,398 @@
+"""
+Offline mock LLM backend.
+
+MockLLM produces synthetic chat completions that match what each call site
+parses: structured outputs are synthesized from the requested JSON schema,
+tool-calling requests return a tool call from the offered tools, and free-text
+prompts are answered in the format their prompt asks for. Latency and errors
+follow configurable distributions so orchestration overhead can be measured
+without a provider.
+
+With a seed, the content of each completion is drawn from its own RNG, derived
+from the seed, the request and how often the same request was made before, so
+concurrent generation and agent threads get reproducible answers whatever
+their scheduling. Latency and errors come from one shared, locked RNG.
+"""
+
+import os
+import re
+import json
+import math
+import time
+import random
+import hashlib
+import threading
+import inspect
+import itertools
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+import openai
+from openai.types.chat import ChatCompletion, ParsedChatCompletion
+
+LATENCY_DISTRIBUTIONS = ("constant", "uniform", "exponential", "lognormal")
+
+
+class MockConfig:
+    """Latency, error and behaviour settings of the mock backend"""
+
+    def __init__(self, latency: float = 0.0, latency_distribution: str = "constant", latency_sigma: float = 0.5,
+                 error_rate: float = 0.0, error_codes: Tuple[int, ...] = (429, 500), finish_rate: float = 0.2,
+                 seed: Optional[int] = None):
+        """
+        Args:
+            latency: Mean latency per call in seconds
+            latency_distribution: One of LATENCY_DISTRIBUTIONS
+            latency_sigma: Sigma of the lognormal distribution, relative half-width of the uniform one
+            error_rate: Probability that a call fails
+            error_codes: HTTP status codes of failed calls, chosen uniformly
+            finish_rate: Probability that a tool-calling request answers without a tool call
+            seed: Random seed for reproducible completions
+        """
+        if latency_distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution: {latency_distribution}, expected one of {LATENCY_DISTRIBUTIONS}")
+        self.latency = latency
+        self.latency_distribution = latency_distribution
+        self.latency_sigma = latency_sigma
+        self.error_rate = error_rate
+        self.error_codes = tuple(error_codes)
+        self.finish_rate = finish_rate
+        self.seed = seed
+
+    @classmethod
+    def from_env(cls) -> "MockConfig":
+        """Read the GEOPLAN_MOCK_* environment variables"""
+        seed = os.getenv("GEOPLAN_MOCK_SEED")
+        error_codes = os.getenv("GEOPLAN_MOCK_ERROR_CODES", "429,500")
+        return cls(
+            latency=float(os.getenv("GEOPLAN_MOCK_LATENCY", "0")),
+            latency_distribution=os.getenv("GEOPLAN_MOCK_LATENCY_DISTRIBUTION", "constant"),
+            latency_sigma=float(os.getenv("GEOPLAN_MOCK_LATENCY_SIGMA", "0.5")),
+            error_rate=float(os.getenv("GEOPLAN_MOCK_ERROR_RATE", "0")),
+            error_codes=tuple(int(code) for code in error_codes.split(",") if code.strip()),
+            finish_rate=float(os.getenv("GEOPLAN_MOCK_FINISH_RATE", "0.2")),
+            seed=int(seed) if seed else None,
+        )
+
+
+class MockLLMError(Exception):
+    """A synthetic provider failure"""
+
+    def __init__(self, status_code: int):
+        super().__init__(f"Mock LLM error {status_code}")
+        self.status_code = status_code
+
+
+def _default_tool_names() -> List[str]:
+    import geoplan_bench.tools as tools
+    return [name for name, obj in inspect.getmembers(tools, inspect.isfunction) if not name.startswith('_')]
+
+
+class MockLLM:
+    """Synthetic completion generator shared by the in-process clients and the HTTP stand-in"""
+
+    def __init__(self, config: Optional[MockConfig] = None):
+        self.config = config or MockConfig()
+        self._shared_rng = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        # calls seen per request digest, so repeated requests get different answers
+        self._request_counts: Dict[bytes, int] = {}
+        self._ids = itertools.count()
+        self._tool_names = None
+        # (prompt marker, responder) pairs, the first marker found in the prompt wins
+        self.responders: List[Tuple[str, Callable[[str], str]]] = [
+            ("final_tool_trajectory", self._respond_debate),
+            ('"refined_tool_trajectory"', lambda prompt: json.dumps(
+                {"advice": "Keep the essential tools.", "refined_tool_trajectory": self._pick_tools(prompt)})),
+            ('"initial_tool_trajectory"', lambda prompt: json.dumps(
+                {"plan": "Acquire, process and analyze the data.", "initial_tool_trajectory": self._pick_tools(prompt)})),
+            ("selected_agents", self._respond_agent_list),
+            ("selected_agent", self._respond_agent),
+            ("key_steps", lambda prompt: json.dumps({"key_steps": self._pick_tools(prompt)})),
+            ("key_tools", lambda prompt: json.dumps({"key_tools": self._pick_tools(prompt)})),
+            ("parameterized_tools", self._respond_parameterized_flow),
+            ('"edges"', self._respond_dag),
+            ("solution_letter", lambda prompt: f"solution_letter: {self.rng.choice('ABC')}"),
+            ("step1:thought_1;tool_1_name", self._respond_cot),
+            ("['tool1_name'", lambda prompt: str(self._pick_tools(prompt))),
+            ("Output concise core question", self._respond_question),
+        ]
+
+    @property
+    def rng(self) -> random.Random:
+        """RNG of the completion being built by this thread, the shared RNG outside of one"""
+        return getattr(self._local, "rng", None) or self._shared_rng
+
+    @contextmanager
+    def _request_rng(self, key: str):
+        """Use an RNG derived from the seed and the request for the completion built inside the block"""
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        with self._lock:
+            occurrence = self._request_counts.get(digest, 0)
+            self._request_counts[digest] = occurrence + 1
+            seed = self._shared_rng.getrandbits(64) if self.config.seed is None else self.config.seed
+        self._local.rng = random.Random(f"{seed}:{digest.hex()}:{occurrence}")
+        try:
+            yield
+        finally:
+            self._local.rng = None
+
+    # ----- latency and errors -----
+
+    def sample_latency(self) -> float:
+        """Draw the latency of one call in seconds"""
+        with self._lock:
+            return self._sample_latency()
+
+    def _sample_latency(self) -> float:
+        config = self.config
+        if config.latency <= 0:
+            return 0.0
+        if config.latency_distribution == "uniform":
+            half_width = config.latency * config.latency_sigma
+            return max(0.0, self._shared_rng.uniform(config.latency - half_width, config.latency + half_width))
+        if config.latency_distribution == "exponential":
+            return self._shared_rng.expovariate(1.0 / config.latency)
+        if config.latency_distribution == "lognormal":
+            # mu chosen so that the mean of the distribution equals config.latency
+            sigma = config.latency_sigma
+            mu = math.log(config.latency) - sigma * sigma / 2
+            return self._shared_rng.lognormvariate(mu, sigma)
+        return config.latency
+
+    def sample_error(self) -> Optional[int]:
+        """Status code of a failed call, or None"""
+        with self._lock:
+            if self.config.error_codes and self._shared_rng.random() < self.config.error_rate:
+                return self._shared_rng.choice(self.config.error_codes)
+        return None
+
+    def simulate_call(self):
+        """Sleep for one sampled latency and raise MockLLMError for a sampled failure"""
+        latency = self.sample_latency()
+        if latency:
+            time.sleep(latency)
+        status_code = self.sample_error()
+        if status_code is not None:
+            raise MockLLMError(status_code)
+
+    # ----- completions -----
+
+    def complete(self, model: str, messages: List[Dict[str, Any]], tools: Optional[List[Dict]] = None,
+                 json_schema: Optional[Dict] = None) -> Dict[str, Any]:
+        """
+        Build a chat completion as a JSON dict, without latency or errors.
+
+        Args:
+            model: Requested model name, echoed back
+            messages: Chat messages
+            tools: Tools offered for function calling
+            json_schema: JSON schema of a structured-output request
+        """
+        prompt = "\n".join(str(message.get("content") or "") for message in messages)
+        key = json.dumps([prompt, [tool["function"]["name"] for tool in tools or []], json_schema], default=str)
+        with self._request_rng(key):
+            message, finish_reason = self._message(prompt, tools, json_schema)
+
+        prompt_tokens = max(1, len(prompt) // 4)
+        completion_tokens = max(1, len(json.dumps(message)) // 4)
+        return {
+            "id": f"chatcmpl-mock-{next(self._ids)}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "finish_reason": finish_reason, "message": message}],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+
+    def _message(self, prompt: str, tools: Optional[List[Dict]], json_schema: Optional[Dict]) -> Tuple[Dict, str]:
+        """(assistant message, finish reason) of a completion"""
+        message = {"role": "assistant", "content": None}
+        finish_reason = "stop"
+        if json_schema is not None:
+            message["content"] = json.dumps(self.synthesize(json_schema, json_schema, prompt))
+        elif tools and self.rng.random() >= self.config.finish_rate:
+            tool = self.rng.choice(tools)["function"]
+            arguments = self.synthesize(tool.get("parameters") or {}, {}, prompt)
+            message["content"] = "Thought: I should call the next tool."
+            message["tool_calls"] = [{
+                "id": f"call_{next(self._ids)}",
+                "type": "function",
+                "function": {"name": tool["name"], "arguments": json.dumps(arguments)}
+            }]
+            finish_reason = "tool_calls"
+        else:
+            message["content"] = self.respond(prompt)
+        return message, finish_reason
+
+    def respond(self, prompt: str) -> str:
+        """Free-text answer in the format the prompt asks for"""
+        for marker, responder in self.responders:
+            if marker in prompt:
+                return responder(prompt)
+        return "Thought: I will analyze the request with the available tools."
+
+    def synthesize(self, schema: Dict, root: Dict, prompt: str = "", index: int = 0, name: str = "") -> Any:
+        """
+        Generate a value that is valid under a JSON schema.
+
+        Args:
+            schema: Schema of the value
+            root: Root schema holding $defs
+            prompt: Prompt text, tool-like string fields pick tools mentioned in it
+            index: Position in the enclosing array
+            name: Name of the enclosing property
+        """
+        if "$ref" in schema:
+            ref = schema["$ref"].split("/")[-1]
+            return self.synthesize(root.get("$defs", root.get("definitions", {}))[ref], root, prompt, index, name)
+        if "const" in schema:
+            return schema["const"]
+        if "enum" in schema:
+            return self.rng.choice(schema["enum"])
+        for key in ("anyOf", "oneOf", "allOf"):
+            if key in schema:
+                options = [option for option in schema[key] if option.get("type") != "null"] or schema[key]
+                return self.synthesize(options[0], root, prompt, index, name)
+
+        schema_type = schema.get("type", "string")
+        if isinstance(schema_type, list):
+            schema_type = next((t for t in schema_type if t != "null"), "string")
+        if schema_type == "object":
+            properties = schema.get("properties", {})
+            if not properties:
+                return {}
+            return {key: self.synthesize(sub_schema, root, prompt, index, key) for key, sub_schema in properties.items()}
+        if schema_type == "array":
+            count = max(schema.get("minItems", 1), self.rng.randint(1, 4))
+            return [self.synthesize(schema.get("items", {}), root, prompt, i, name) for i in range(count)]
+        if schema_type == "integer":
+            # array position keeps index fields such as task_index distinct
+            return index
+        if schema_type == "number":
+            return round(self.rng.random(), 3)
+        if schema_type == "boolean":
+            return self.rng.random() < 0.5
+        return self._pick_tools(prompt, 1)[0] if "tool" in name else "mock value"
+
+    # ----- free-text responders -----
+
+    def tool_names(self) -> List[str]:
+        if self._tool_names is None:
+            self._tool_names = _default_tool_names()
+        return self._tool_names
+
+    def _pick_tools(self, prompt: str, count: Optional[int] = None) -> List[str]:
+        """Pick tools mentioned in the prompt, in order of first mention"""
+        mentioned = [name for name in self.tool_names() if name in prompt]
+        candidates = sorted(mentioned, key=prompt.index) or self.tool_names()
+        count = min(count or self.rng.randint(min(3, len(candidates)), min(8, len(candidates))), len(candidates))
+        picked = sorted(self.rng.sample(range(len(candidates)), count))
+        return [candidates[i] for i in picked]
+
+    def _listed_names(self, prompt: str) -> List[str]:
+        return re.findall(r'^\s*- (\w+):', prompt, re.MULTILINE)
+
+    def _respond_debate(self, prompt: str) -> str:
+        return json.dumps({"final_tool_trajectory": self._pick_tools(prompt)})
+
+    def _respond_agent(self, prompt: str) -> str:
+        names = self._listed_names(prompt) or ["generalChatBotAgent"]
+        return json.dumps({"selected_agent": self.rng.choice(names), "subtask": "Complete the task."})
+
+    def _respond_agent_list(self, prompt: str) -> str:
+        names = self._listed_names(prompt)
+        selected = self.rng.sample(names, min(len(names), self.rng.randint(1, 3)))
+        return json.dumps({"selected_agents": [{"name": name, "subtask": "Complete the subtask."} for name in selected]})
+
+    def _respond_parameterized_flow(self, prompt: str) -> str:
+        match = re.search(r"\[('[^\]]*')\]", prompt)
+        flow = re.findall(r"'(\w+)'", match.group(1)) if match else self._pick_tools(prompt)
+        return json.dumps({"parameterized_tools": [{"tool": tool, "params": {}} for tool in flow]})
+
+    def _respond_dag(self, prompt: str) -> str:
+        nodes = self._pick_tools(prompt, min(12, len(self.tool_names())))
+        edges = [[nodes[i], nodes[i + 1]] for i in range(len(nodes) - 1)]
+        return json.dumps({"nodes": nodes, "edges": edges})
+
+    def _respond_question(self, prompt: str) -> str:
+        tool = self._pick_tools(prompt, 1)[0].replace("_", " ")
+        return f"How can we {tool} for the study area over the last {self.rng.randint(2, 20)} years?"
+
+    def _respond_cot(self, prompt: str) -> str:
+        tools = self._pick_tools(prompt)
+        return "\n".join(f"step{i + 1}:use {tool};{tool}" for i, tool in enumerate(tools))
+
+
+def _status_error(status_code: int) -> openai.APIStatusError:
+    """The openai exception a real provider failure with this status would raise"""
+    request = httpx.Request("POST", "http://mock-llm/v1/chat/completions")
+    response = httpx.Response(status_code, request=request)
+    message = f"Mock LLM error {status_code}"
+    if status_code == 429:
+        return openai.RateLimitError(message, response=response, body=None)
+    if status_code >= 500:
+        return openai.InternalServerError(message, response=response, body=None)
+    return openai.APIStatusError(message, response=response, body=None)
+
+
+class _MockChatCompletions:
+    def __init__(self, llm: MockLLM):
+        self.llm = llm
+
+    def _call(self, model: str, messages: List[Dict], tools=None, json_schema=None) -> Dict[str, Any]:
+        try:
+            self.llm.simulate_call()
+        except MockLLMError as e:
+            raise _status_error(e.status_code)
+        return self.llm.complete(model, messages, tools=tools, json_schema=json_schema)
+
+    def create(self, model: str, messages: List[Dict], tools=None, **kwargs) -> ChatCompletion:
+        return ChatCompletion.model_validate(self._call(model, messages, tools=tools))
+
+    def parse(self, model: str, messages: List[Dict], response_format=None, **kwargs) -> ParsedChatCompletion:
+        completion = self._call(model, messages, json_schema=response_format.model_json_schema())
+        message = completion["choices"][0]["message"]
+        message["parsed"] = response_format.model_validate_json(message["content"])
+        return ParsedChatCompletion[response_format].model_validate(completion)
+
+
+class _Namespace:
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+class MockOpenAIClient:
+    """In-process stand-in for ``openai.OpenAI`` covering chat completions and structured parsing"""
+
+    def __init__(self, llm: Optional[MockLLM] = None):
+        self.llm = llm or MockLLM()
+        completions = _MockChatCompletions(self.llm)
+        self.chat = _Namespace(completions=completions)
+        self.beta = _Namespace(chat=_Namespace(completions=completions))
+
+
+class _MockGenAIModels:
+    def __init__(self, llm: MockLLM):
+        self.llm = llm
+
+    def generate_content(self, model: str, contents, **kwargs):
+        self.llm.simulate_call()
+        if not isinstance(contents, list):
+            contents = [contents]
+        completion = self.llm.complete(model, [{"role": "user", "content": str(part)} for part in contents])
+        return _Namespace(text=completion["choices"][0]["message"]["content"])
+
+
+class MockGenAIClient:
+    """In-process stand-in for ``google.genai.Client`` covering ``models.generate_content``"""
+
+    def __init__(self, llm: Optional[MockLLM] = None):
+        self.llm = llm or MockLLM()
+        self.models = _MockGenAIModels(self.llm)
@@ -0,0 +1,123 @@
+"""
+Local HTTP stand-in for the OpenAI and Gemini APIs backed by MockLLM.
+
+Serves ``POST /v1/chat/completions`` and ``POST /v1beta/models/<model>:generateContent``
+so the real clients, including their HTTP stack and retries, can be exercised offline:
+
+    python -m geoplan_bench.llm.mock_server --port 8100 --latency 0.5 --latency-distribution lognormal
+    export OPENAI_API_BASE=http://127.0.0.1:8100/v1 GEMINI_API_BASE=http://127.0.0.1:8100
+"""
+
+import json
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+from geoplan_bench.llm.mock import LATENCY_DISTRIBUTIONS, MockConfig, MockLLM, MockLLMError
+
+
+class MockLLMRequestHandler(BaseHTTPRequestHandler):
+    """Request handler, the MockLLM is attached to the server as ``server.llm``"""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status_code: int, payload: dict):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        llm = self.server.llm
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        try:
+            llm.simulate_call()
+        except MockLLMError as e:
+            self._send_json(e.status_code, {"error": {"message": str(e), "type": "mock_error", "code": e.status_code}})
+            return
+
+        path = self.path.split("?")[0]
+        if path.endswith("/chat/completions"):
+            json_schema = None
+            response_format = request.get("response_format") or {}
+            if response_format.get("type") == "json_schema":
+                json_schema = response_format["json_schema"]["schema"]
+            completion = llm.complete(request.get("model", "mock"), request.get("messages", []),
+                                      tools=request.get("tools"), json_schema=json_schema)
+            self._send_json(200, completion)
+        elif ":generateContent" in path:
+            model = path.rsplit("/", 1)[-1].split(":")[0]
+            texts = [part.get("text", "") for content in request.get("contents", []) for part in content.get("parts", [])]
+            completion = llm.complete(model, [{"role": "user", "content": "\n".join(texts)}])
+            text = completion["choices"][0]["message"]["content"]
+            self._send_json(200, {
+                "candidates": [{"content": {"role": "model", "parts": [{"text": text}]}, "finishReason": "STOP"}],
+                "usageMetadata": {
+                    "promptTokenCount": completion["usage"]["prompt_tokens"],
+                    "candidatesTokenCount": completion["usage"]["completion_tokens"],
+                    "totalTokenCount": completion["usage"]["total_tokens"],
+                },
+            })
+        else:
+            self._send_json(404, {"error": {"message": f"Unknown path {path}"}})
+
+
+def start_mock_server(host: str = "127.0.0.1", port: int = 0, config: Optional[MockConfig] = None) -> ThreadingHTTPServer:
+    """
+    Start the stand-in on a background thread.
+
+    Args:
+        host: Bind address
+        port: Port, 0 picks a free one (see ``server.server_address``)
+        config: Mock settings, defaults to the GEOPLAN_MOCK_* environment variables
+
+    Returns:
+        The running server, stop it with ``shutdown()``
+    """
+    server = ThreadingHTTPServer((host, port), MockLLMRequestHandler)
+    server.daemon_threads = True
+    server.llm = MockLLM(config or MockConfig.from_env())
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local HTTP stand-in for the OpenAI and Gemini APIs")
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Bind address")
+    parser.add_argument("--port", type=int, default=8100, help="Port")
+    parser.add_argument("--latency", type=float, default=0.0, help="Mean latency per call in seconds")
+    parser.add_argument("--latency-distribution", type=str, default="constant", choices=LATENCY_DISTRIBUTIONS,
+                        help="Latency distribution")
+    parser.add_argument("--latency-sigma", type=float, default=0.5, help="Lognormal sigma or uniform relative half-width")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probability that a call fails")
+    parser.add_argument("--finish-rate", type=float, default=0.2,
+                        help="Probability that a tool-calling request answers without a tool call")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed")
+    args = parser.parse_args()
+
+    config = MockConfig(
+        latency=args.latency,
+        latency_distribution=args.latency_distribution,
+        latency_sigma=args.latency_sigma,
+        error_rate=args.error_rate,
+        finish_rate=args.finish_rate,
+        seed=args.seed,
+    )
+    server = ThreadingHTTPServer((args.host, args.port), MockLLMRequestHandler)
+    server.llm = MockLLM(config)
+    print(f"Mock LLM server listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+LLM client factories.
+
+Components create their clients here instead of instantiating ``OpenAI`` or
+``genai.Client`` directly, so the backend can be switched with the
+GEOPLAN_LLM_BACKEND environment variable:
+
+- ``openai`` (default): real clients, honouring OPENAI_API_BASE and GEMINI_API_BASE,
+  which can point at a local HTTP stand-in (``python -m geoplan_bench.llm.mock_server``)
+- ``mock``: in-process mock clients configured by the GEOPLAN_MOCK_* variables
+
+Clients are wrapped by ``geoplan_bench.llm.telemetry``, which records every
+call and retries transient failures up to GEOPLAN_LLM_MAX_RETRIES times.
+"""
+
+import os
+from typing import Optional
+
+from geoplan_bench.llm.telemetry import instrument_genai_client, instrument_openai_client
+
+LLM_BACKENDS = ("openai", "mock")
+
+_mock_llm = None
+
+
+def get_backend() -> str:
+    backend = os.getenv("GEOPLAN_LLM_BACKEND", "openai")
+    if backend not in LLM_BACKENDS:
+        raise ValueError(f"Unknown LLM backend: {backend}, expected one of {LLM_BACKENDS}")
+    return backend
+
+
+def get_mock_llm():
+    """MockLLM shared by all in-process mock clients of this process"""
+    global _mock_llm
+    if _mock_llm is None:
+        from geoplan_bench.llm.mock import MockConfig, MockLLM
+        _mock_llm = MockLLM(MockConfig.from_env())
+    return _mock_llm
+
+
+def set_mock_llm(llm):
+    """Replace the shared MockLLM, e.g. to change latency between experiment runs"""
+    global _mock_llm
+    _mock_llm = llm
+
+
+def get_max_retries() -> int:
+    return int(os.getenv("GEOPLAN_LLM_MAX_RETRIES", "2"))
+
+
+def create_openai_client(api_key: Optional[str] = None, base_url: Optional[str] = None):
+    """
+    Create an OpenAI-compatible chat client.
+
+    Args:
+        api_key: API key, defaults to OPENAI_API_KEY
+        base_url: API base URL, defaults to OPENAI_API_BASE
+    """
+    if get_backend() == "mock":
+        from geoplan_bench.llm.mock import MockOpenAIClient
+        client = MockOpenAIClient(get_mock_llm())
+    else:
+        from openai import OpenAI
+        # retries are done by the telemetry wrapper so they can be counted
+        client = OpenAI(
+            api_key=api_key or os.getenv("OPENAI_API_KEY"),
+            base_url=base_url or os.getenv("OPENAI_API_BASE"),
+            max_retries=0
+        )
+    return instrument_openai_client(client, max_retries=get_max_retries())
+
+
+def create_genai_client(api_key: Optional[str] = None, base_url: Optional[str] = None):
+    """
+    Create a Gemini client.
+
+    Args:
+        api_key: API key, defaults to GEMINI_API_KEY
+        base_url: API base URL, defaults to GEMINI_API_BASE
+    """
+    if get_backend() == "mock":
+        from geoplan_bench.llm.mock import MockGenAIClient
+        client = MockGenAIClient(get_mock_llm())
+    else:
+        from google import genai
+        base_url = base_url or os.getenv("GEMINI_API_BASE")
+        http_options = {"base_url": base_url} if base_url else None
+        client = genai.Client(
+            api_key=api_key or os.getenv("GEMINI_API_KEY"),
+            http_options=http_options
+        )
+    return instrument_genai_client(client, max_retries=get_max_retries())
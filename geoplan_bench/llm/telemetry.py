@@ -0,0 +1,447 @@
+"""
+Per-call telemetry for LLM interactions.
+
+Every client created by ``geoplan_bench.llm`` is wrapped so that each call is
+checked against the active budgets (see budget.py) and recorded with its
+component, agent, task_id, stage, model, latency, token usage and retries.
+Component and stage default to the calling class and
+method; agent and task_id come from ``telemetry_context``. Records are kept by
+a process-wide TelemetryCollector, which aggregates them and forwards them to
+optional OpenTelemetry and Prometheus exporters.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import threading
+import contextvars
+from array import array
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from statistics import median
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from geoplan_bench.llm.budget import charge_tokens, reserve_call
+from geoplan_bench.llm.limits import provider_slot
+
+_context = contextvars.ContextVar("geoplan_telemetry_context", default={})
+
+# wrappers whose caller is the interesting frame
+_HELPER_FRAMES = {"_create_completion", "<lambda>"}
+
+RETRYABLE_STATUS_CODES = {408, 409, 429}
+
+
+@dataclass
+class LLMCallRecord:
+    """One LLM call"""
+    component: str
+    stage: str
+    model: str
+    provider: str
+    start_time: float
+    latency_s: float
+    agent: Optional[str] = None
+    task_id: Optional[str] = None
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+    retries: int = 0
+    error: Optional[str] = None
+    # part of latency_s spent waiting for a provider slot (see limits.py)
+    wait_s: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@contextmanager
+def telemetry_context(**fields):
+    """Attach fields such as task_id, agent or stage to the LLM calls made inside the block"""
+    token = _context.set({**_context.get(), **fields})
+    try:
+        yield
+    finally:
+        _context.reset(token)
+
+
+def current_context() -> Dict[str, Any]:
+    return dict(_context.get())
+
+
+def propagate_context(func: Callable) -> Callable:
+    """Run func in a copy of the current telemetry context, e.g. on executor threads"""
+    context = contextvars.copy_context()
+
+    def run(*args, **kwargs):
+        return context.copy().run(func, *args, **kwargs)
+    return run
+
+
+def _caller():
+    """(component, stage) of the first frame outside this package and completion helpers"""
+    frame = sys._getframe(2)
+    while frame is not None and (
+            frame.f_globals.get("__name__", "").startswith("geoplan_bench.llm")
+            or frame.f_code.co_name in _HELPER_FRAMES):
+        frame = frame.f_back
+    if frame is None:
+        return "unknown", "unknown"
+    owner = frame.f_locals.get("self")
+    component = type(owner).__name__ if owner is not None else frame.f_globals.get("__name__", "unknown")
+    return component, frame.f_code.co_name
+
+
+def _usage_counts(response) -> Dict[str, int]:
+    """Token counts of an OpenAI or Gemini response"""
+    usage = getattr(response, "usage", None)
+    if usage is not None:
+        details = getattr(usage, "prompt_tokens_details", None)
+        return {
+            "prompt_tokens": getattr(usage, "prompt_tokens", 0) or 0,
+            "completion_tokens": getattr(usage, "completion_tokens", 0) or 0,
+            "cached_tokens": (getattr(details, "cached_tokens", 0) or 0) if details is not None else 0,
+        }
+    metadata = getattr(response, "usage_metadata", None)
+    if metadata is not None:
+        return {
+            "prompt_tokens": getattr(metadata, "prompt_token_count", 0) or 0,
+            "completion_tokens": getattr(metadata, "candidates_token_count", 0) or 0,
+            "cached_tokens": getattr(metadata, "cached_content_token_count", 0) or 0,
+        }
+    return {}
+
+
+def is_retryable(error: Exception) -> bool:
+    """Whether a provider error is transient, following the openai client's retry rules"""
+    import openai
+    if isinstance(error, (openai.APIConnectionError, openai.APITimeoutError)):
+        return True
+    status_code = getattr(error, "status_code", None) or getattr(error, "code", None)
+    return isinstance(status_code, int) and (status_code in RETRYABLE_STATUS_CODES or status_code >= 500)
+
+
+def summarize(records: Iterable[LLMCallRecord]) -> Dict[str, Any]:
+    """Call count, errors, retries, latency and tokens of a set of records"""
+    records = list(records)
+    latencies = [record.latency_s for record in records]
+    return {
+        "calls": len(records),
+        "errors": sum(1 for record in records if record.error),
+        "retries": sum(record.retries for record in records),
+        "latency_s": sum(latencies),
+        "latency_p50_s": median(latencies) if latencies else 0.0,
+        "latency_max_s": max(latencies) if latencies else 0.0,
+        "prompt_tokens": sum(record.prompt_tokens for record in records),
+        "completion_tokens": sum(record.completion_tokens for record in records),
+        "cached_tokens": sum(record.cached_tokens for record in records),
+    }
+
+
+def summarize_by(records: Iterable[LLMCallRecord], field: str) -> Dict[str, Dict[str, Any]]:
+    """summarize() per value of a record field"""
+    groups: Dict[str, List[LLMCallRecord]] = {}
+    for record in records:
+        groups.setdefault(str(getattr(record, field)), []).append(record)
+    return {key: summarize(group) for key, group in groups.items()}
+
+
+class _Aggregate:
+    """Running summarize() of records that are no longer kept"""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.latencies = array("d")
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cached_tokens = 0
+
+    def add(self, record: LLMCallRecord):
+        self.calls += 1
+        self.errors += 1 if record.error else 0
+        self.retries += record.retries
+        self.latencies.append(record.latency_s)
+        self.prompt_tokens += record.prompt_tokens
+        self.completion_tokens += record.completion_tokens
+        self.cached_tokens += record.cached_tokens
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "retries": self.retries,
+            "latency_s": sum(self.latencies),
+            "latency_p50_s": median(self.latencies) if self.latencies else 0.0,
+            "latency_max_s": max(self.latencies) if self.latencies else 0.0,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cached_tokens": self.cached_tokens,
+        }
+
+
+class TelemetryCollector:
+    """
+    Thread-safe store of LLMCallRecords with listeners for streaming exporters.
+
+    Records are indexed by task_id. drain(task_id) releases a finished task's
+    records; the run-wide summary() is kept as running aggregates, so it
+    still covers drained tasks.
+    """
+
+    BREAKDOWNS = ("agent", "component", "stage")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._records: Dict[Optional[str], List[LLMCallRecord]] = {}
+        self._listeners: List[Callable[[LLMCallRecord], None]] = []
+        self._reset_aggregates()
+
+    def _reset_aggregates(self):
+        self._total = _Aggregate()
+        self._breakdowns: Dict[str, Dict[str, _Aggregate]] = {field: {} for field in self.BREAKDOWNS}
+
+    def add_listener(self, listener: Callable[[LLMCallRecord], None]):
+        """Call listener with every new record, e.g. an exporter's ``export``"""
+        self._listeners.append(listener)
+
+    def record(self, record: LLMCallRecord):
+        with self._lock:
+            self._records.setdefault(record.task_id, []).append(record)
+            self._total.add(record)
+            for field, groups in self._breakdowns.items():
+                key = str(getattr(record, field))
+                if key not in groups:
+                    groups[key] = _Aggregate()
+                groups[key].add(record)
+        for listener in self._listeners:
+            try:
+                listener(record)
+            except Exception as e:
+                print(f"Warning: telemetry listener failed: {e}")
+
+    def records(self, task_id: Optional[str] = None) -> List[LLMCallRecord]:
+        """Records of task_id, or all records not drained yet in start order"""
+        with self._lock:
+            if task_id is not None:
+                return list(self._records.get(task_id, ()))
+            records = [record for task_records in self._records.values() for record in task_records]
+        return sorted(records, key=lambda record: record.start_time)
+
+    def drain(self, task_id: Optional[str]) -> List[LLMCallRecord]:
+        """Remove and return the records of a finished task, they stay counted in summary()"""
+        with self._lock:
+            return self._records.pop(task_id, [])
+
+    def reset(self):
+        with self._lock:
+            self._records = {}
+            self._reset_aggregates()
+
+    def summary(self, task_id: Optional[str] = None) -> Dict[str, Any]:
+        """Totals and per-agent, per-component and per-stage breakdowns, of the whole run when task_id is None"""
+        if task_id is not None:
+            records = self.records(task_id)
+            return {
+                "total": summarize(records),
+                **{f"by_{field}": summarize_by(records, field) for field in self.BREAKDOWNS},
+            }
+        with self._lock:
+            return {
+                "total": self._total.to_dict(),
+                **{f"by_{field}": {key: aggregate.to_dict() for key, aggregate in groups.items()}
+                   for field, groups in self._breakdowns.items()},
+            }
+
+    def export_jsonl(self, path: str, task_id: Optional[str] = None):
+        """Write the raw records not drained yet as JSON lines"""
+        with open(path, "w", encoding="utf-8") as f:
+            for record in self.records(task_id):
+                f.write(json.dumps(record.to_dict(), ensure_ascii=False) + "\n")
+
+
+_collector = None
+_collector_lock = threading.Lock()
+
+
+def get_collector() -> TelemetryCollector:
+    """Process-wide collector, exporters configured by environment variables are attached on creation"""
+    global _collector
+    if _collector is None:
+        with _collector_lock:
+            if _collector is None:
+                collector = TelemetryCollector()
+                _attach_exporters_from_env(collector)
+                _collector = collector
+    return _collector
+
+
+def _attach_exporters_from_env(collector: TelemetryCollector):
+    """GEOPLAN_OTEL_ENDPOINT, GEOPLAN_PROMETHEUS_PORT and GEOPLAN_PROMETHEUS_PUSHGATEWAY"""
+    otel_endpoint = os.getenv("GEOPLAN_OTEL_ENDPOINT")
+    if otel_endpoint:
+        collector.add_listener(OTelExporter(endpoint=otel_endpoint).export)
+    prometheus_port = os.getenv("GEOPLAN_PROMETHEUS_PORT")
+    pushgateway = os.getenv("GEOPLAN_PROMETHEUS_PUSHGATEWAY")
+    if prometheus_port or pushgateway:
+        exporter = PrometheusExporter(port=int(prometheus_port) if prometheus_port else None, pushgateway=pushgateway)
+        collector.add_listener(exporter.export)
+
+
+class OTelExporter:
+    """Export each record as an OpenTelemetry span over OTLP/HTTP (requires opentelemetry-sdk)"""
+
+    def __init__(self, endpoint: str = "http://localhost:4318/v1/traces", service_name: str = "geoplan-bench"):
+        try:
+            from opentelemetry.sdk.resources import Resource
+            from opentelemetry.sdk.trace import TracerProvider
+            from opentelemetry.sdk.trace.export import BatchSpanProcessor
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        except ImportError as e:
+            raise ImportError(
+                "OpenTelemetry export requires opentelemetry-sdk and opentelemetry-exporter-otlp-proto-http, "
+                "install them with `pip install geoplan-bench[telemetry]`") from e
+        self.provider = TracerProvider(resource=Resource.create({"service.name": service_name}))
+        self.provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter(endpoint=endpoint)))
+        self.tracer = self.provider.get_tracer("geoplan_bench.llm")
+
+    def export(self, record: LLMCallRecord):
+        start_ns = int(record.start_time * 1e9)
+        span = self.tracer.start_span(f"llm {record.component}.{record.stage}", start_time=start_ns)
+        for key, value in record.to_dict().items():
+            if value is not None:
+                span.set_attribute(f"geoplan.{key}", value)
+        span.end(end_time=start_ns + int(record.latency_s * 1e9))
+
+    def shutdown(self):
+        self.provider.shutdown()
+
+
+class PrometheusExporter:
+    """Expose records as Prometheus metrics on a port and/or push them to a Pushgateway (requires prometheus-client)"""
+
+    LABELS = ("component", "agent", "stage", "model")
+
+    def __init__(self, port: Optional[int] = None, pushgateway: Optional[str] = None, job: str = "geoplan_bench"):
+        try:
+            import prometheus_client
+        except ImportError as e:
+            raise ImportError(
+                "Prometheus export requires prometheus-client, install it with `pip install geoplan-bench[telemetry]`") from e
+        self._prometheus = prometheus_client
+        self.pushgateway = pushgateway
+        self.job = job
+        self.registry = prometheus_client.CollectorRegistry()
+        self.latency = prometheus_client.Histogram(
+            "geoplan_llm_call_latency_seconds", "LLM call latency", self.LABELS, registry=self.registry,
+            buckets=(0.1, 0.25, 0.5, 1, 2, 5, 10, 20, 40, 80))
+        self.calls = prometheus_client.Counter(
+            "geoplan_llm_calls_total", "LLM calls", self.LABELS + ("status",), registry=self.registry)
+        self.tokens = prometheus_client.Counter(
+            "geoplan_llm_tokens_total", "LLM tokens", self.LABELS + ("type",), registry=self.registry)
+        self.retries = prometheus_client.Counter(
+            "geoplan_llm_retries_total", "LLM call retries", self.LABELS, registry=self.registry)
+        if port is not None:
+            prometheus_client.start_http_server(port, registry=self.registry)
+
+    def export(self, record: LLMCallRecord):
+        labels = [str(getattr(record, label)) for label in self.LABELS]
+        self.latency.labels(*labels).observe(record.latency_s)
+        self.calls.labels(*labels, "error" if record.error else "ok").inc()
+        self.retries.labels(*labels).inc(record.retries)
+        for token_type in ("prompt_tokens", "completion_tokens", "cached_tokens"):
+            self.tokens.labels(*labels, token_type).inc(getattr(record, token_type))
+        if self.pushgateway:
+            self._prometheus.push_to_gateway(self.pushgateway, job=self.job, registry=self.registry)
+
+
+class _InstrumentedCall:
+    """Wrap a completion function with retries and telemetry"""
+
+    def __init__(self, func: Callable, provider: str, max_retries: int):
+        self.func = func
+        self.provider = provider
+        self.max_retries = max_retries
+
+    def __call__(self, *args, **kwargs):
+        from geoplan_bench.llm.tracing import span
+        reserve_call()
+        component, stage = _caller()
+        context = current_context()
+        record = LLMCallRecord(
+            component=context.get("component", component),
+            stage=context.get("stage", stage),
+            model=str(kwargs.get("model", "")),
+            provider=self.provider,
+            start_time=time.time(),
+            latency_s=0.0,
+            agent=context.get("agent"),
+            task_id=context.get("task_id"),
+        )
+        with span(f"llm {record.component}.{record.stage}", category="llm", model=record.model) as call_span:
+            try:
+                return self._call(record, args, kwargs)
+            finally:
+                call_span.attributes.update(
+                    retries=record.retries, prompt_tokens=record.prompt_tokens,
+                    completion_tokens=record.completion_tokens, error=record.error)
+
+    def _call(self, record: LLMCallRecord, args, kwargs):
+        start = time.perf_counter()
+        try:
+            while True:
+                try:
+                    wait_start = time.perf_counter()
+                    with provider_slot(self.provider):
+                        record.wait_s += time.perf_counter() - wait_start
+                        response = self.func(*args, **kwargs)
+                    break
+                except Exception as e:
+                    if record.retries >= self.max_retries or not is_retryable(e):
+                        record.error = type(e).__name__
+                        raise
+                    # exponential backoff with jitter, as the openai client does
+                    time.sleep(min(8.0, 0.5 * 2 ** record.retries) * (1 - 0.25 * random.random()))
+                    record.retries += 1
+            for key, value in _usage_counts(response).items():
+                setattr(record, key, value)
+            charge_tokens(record.prompt_tokens + record.completion_tokens)
+            return response
+        finally:
+            record.latency_s = time.perf_counter() - start
+            get_collector().record(record)
+
+
+class _Proxy:
+    """Delegate attribute access to a wrapped object, with selected attributes replaced"""
+
+    def __init__(self, wrapped, **overrides):
+        self._wrapped = wrapped
+        self.__dict__.update(overrides)
+
+    def __getattr__(self, name):
+        return getattr(self._wrapped, name)
+
+
+def instrument_openai_client(client, max_retries: int = 2):
+    """Wrap chat.completions.create and beta.chat.completions.parse of an OpenAI-compatible client"""
+    completions = _Proxy(
+        client.chat.completions,
+        create=_InstrumentedCall(client.chat.completions.create, "openai", max_retries))
+    parse_completions = _Proxy(
+        client.beta.chat.completions,
+        parse=_InstrumentedCall(client.beta.chat.completions.parse, "openai", max_retries))
+    return _Proxy(
+        client,
+        chat=_Proxy(client.chat, completions=completions),
+        beta=_Proxy(client.beta, chat=_Proxy(client.beta.chat, completions=parse_completions)))
+
+
+def instrument_genai_client(client, max_retries: int = 2):
+    """Wrap models.generate_content of a Gemini client"""
+    return _Proxy(
+        client,
+        models=_Proxy(client.models, generate_content=_InstrumentedCall(client.models.generate_content, "genai", max_retries)))
@@ -0,0 +1,207 @@
+"""
+Hierarchical timing spans for agent runs.
+
+Spans nest through a context variable, so a run records a tree such as
+task -> agent -> layer/round -> expert/debater -> step -> llm. Every LLM call
+made through an instrumented client becomes a leaf span. Finished spans are
+kept per task by a process-wide Tracer and can be exported as Chrome trace-event JSON
+(chrome://tracing, Perfetto, speedscope) or folded stacks for flamegraph.pl,
+and summarized per level to show the critical path and the time that running
+sibling spans in parallel would save.
+"""
+
+import json
+import time
+import threading
+import itertools
+import contextvars
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from geoplan_bench.llm.telemetry import current_context
+
+_current_span = contextvars.ContextVar("geoplan_current_span", default=None)
+_span_ids = itertools.count(1)
+
+# perf_counter is monotonic but has no epoch, this maps it to wall clock time
+_EPOCH = time.time() - time.perf_counter()
+
+
+@dataclass
+class Span:
+    """One timed block"""
+    name: str
+    category: str
+    span_id: int
+    parent_id: Optional[int]
+    start: float
+    end: Optional[float] = None
+    thread_id: int = 0
+    task_id: Optional[str] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration(self) -> float:
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "category": self.category,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_time": _EPOCH + self.start,
+            "duration_s": self.duration,
+            "thread_id": self.thread_id,
+            "task_id": self.task_id,
+            "attributes": self.attributes,
+        }
+
+
+def folded_stacks(spans: List[Span]) -> Dict[str, float]:
+    """Self seconds per "root;child;leaf" stack of a set of spans"""
+    by_id = {span.span_id: span for span in spans}
+    child_time: Dict[int, float] = {}
+    for span in spans:
+        if span.parent_id in by_id:
+            child_time[span.parent_id] = child_time.get(span.parent_id, 0.0) + span.duration
+    stacks: Dict[str, float] = {}
+    for span in spans:
+        frames = []
+        node = span
+        while node is not None:
+            frames.append(node.name.replace(";", ","))
+            node = by_id.get(node.parent_id)
+        stack = ";".join(reversed(frames))
+        # children running in parallel can exceed the parent's duration
+        stacks[stack] = stacks.get(stack, 0.0) + max(0.0, span.duration - child_time.get(span.span_id, 0.0))
+    return stacks
+
+
+class Tracer:
+    """
+    Thread-safe store of finished spans, bucketed by task_id.
+
+    release(task_id) drops a finished task's spans after folding them into
+    the run-wide stacks, so export_folded() still covers released tasks.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._spans: Dict[Optional[str], List[Span]] = {}
+        self._released_stacks: Dict[str, float] = {}
+
+    def add(self, span: Span):
+        with self._lock:
+            self._spans.setdefault(span.task_id, []).append(span)
+
+    def spans(self, task_id: Optional[str] = None) -> List[Span]:
+        """Spans of task_id, or all spans not released yet"""
+        with self._lock:
+            if task_id is not None:
+                spans = list(self._spans.get(task_id, ()))
+            else:
+                spans = [span for task_spans in self._spans.values() for span in task_spans]
+        return sorted(spans, key=lambda span: span.start)
+
+    def release(self, task_id: Optional[str]):
+        """Drop the spans of a finished task, keeping its folded stacks for export_folded()"""
+        with self._lock:
+            spans = self._spans.pop(task_id, [])
+        stacks = folded_stacks(spans)
+        with self._lock:
+            for stack, seconds in stacks.items():
+                self._released_stacks[stack] = self._released_stacks.get(stack, 0.0) + seconds
+
+    def reset(self):
+        with self._lock:
+            self._spans = {}
+            self._released_stacks = {}
+
+    def export_chrome_trace(self, path: str, task_id: Optional[str] = None):
+        """Write complete ("X") trace events, one row per thread"""
+        events = []
+        for span in self.spans(task_id):
+            events.append({
+                "name": span.name,
+                "cat": span.category,
+                "ph": "X",
+                "ts": (_EPOCH + span.start) * 1e6,
+                "dur": span.duration * 1e6,
+                "pid": 1,
+                "tid": span.thread_id,
+                "args": {"span_id": span.span_id, "parent_id": span.parent_id,
+                         "task_id": span.task_id, **span.attributes},
+            })
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, ensure_ascii=False)
+
+    def export_folded(self, path: str, task_id: Optional[str] = None):
+        """
+        Write folded stacks ("root;child;leaf self_microseconds") for flamegraph.pl or speedscope,
+        of the whole run including released tasks when task_id is None
+        """
+        stacks = folded_stacks(self.spans(task_id))
+        if task_id is None:
+            with self._lock:
+                for stack, seconds in self._released_stacks.items():
+                    stacks[stack] = stacks.get(stack, 0.0) + seconds
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, seconds in stacks.items():
+                f.write(f"{stack} {int(seconds * 1e6)}\n")
+
+    def level_summary(self, task_id: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+        """
+        Time per span category and the gain from running siblings in parallel.
+
+        For every parent, the children of one category are taken as a level:
+        ``sequential_s`` is their summed duration and ``critical_path_s`` the
+        longest of them, which is what the level would take if the siblings ran
+        concurrently. ``parallel_gain_s`` is the difference; it is only
+        realizable where the siblings are independent (experts of one layer,
+        the opening debater responses), not for the steps of a ReAct loop.
+        """
+        spans = self.spans(task_id)
+        siblings: Dict[tuple, List[float]] = {}
+        for span in spans:
+            siblings.setdefault((span.parent_id, span.category), []).append(span.duration)
+        summary: Dict[str, Dict[str, float]] = {}
+        for (_, category), durations in siblings.items():
+            level = summary.setdefault(category, {"spans": 0, "sequential_s": 0.0, "critical_path_s": 0.0, "parallel_gain_s": 0.0})
+            level["spans"] += len(durations)
+            level["sequential_s"] += sum(durations)
+            level["critical_path_s"] += max(durations)
+            level["parallel_gain_s"] += sum(durations) - max(durations)
+        return summary
+
+
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    """Process-wide tracer"""
+    return _tracer
+
+
+@contextmanager
+def span(name: str, category: str = "span", **attributes):
+    """Time the block as a child of the current span; the task_id comes from telemetry_context"""
+    parent = _current_span.get()
+    current = Span(
+        name=name,
+        category=category,
+        span_id=next(_span_ids),
+        parent_id=parent.span_id if parent is not None else None,
+        start=time.perf_counter(),
+        thread_id=threading.get_ident(),
+        task_id=current_context().get("task_id"),
+        attributes=attributes,
+    )
+    token = _current_span.set(current)
+    try:
+        yield current
+    finally:
+        _current_span.reset(token)
+        current.end = time.perf_counter()
+        _tracer.add(current)
@@ -1,34 +1,37 @@
 """
 Pipeline modules for task generation and evaluation.
+
+Exports are imported on first access, so importing the package does not load
+the LLM clients, agents or embedding models.
 """
 
-from geoplan_bench.pipeline.task_generation import (
-    DAGTaskTemplateGenerator,
-    ToolFlowGenerator,
-    ToolFlowParameterizer,
-    TaskGenerator,
-    RemoteSensingTaskPipeline)
-from geoplan_bench.pipeline.task_evaluation import (
-    RemoteSensingTaskEval,
-    execute_task_evaluation_pipeline)
-from geoplan_bench.pipeline.task_validation import (
-    filter_tasks,
-    load_all_tasks,
-    is_domain_relevant,
-    is_complexity_relevant,
-    generate_report)
-
-__all__ = [
-    "DAGTaskTemplateGenerator",
-    "ToolFlowGenerator",
-    "ToolFlowParameterizer",
-    "TaskGenerator",
-    "RemoteSensingTaskPipeline",
-    "RemoteSensingTaskEval",
-    "execute_task_evaluation_pipeline",
-    "filter_tasks",
-    "load_all_tasks",
-    "is_domain_relevant",
-    "is_complexity_relevant",
-    "generate_report"
-]
+import importlib
+
+_EXPORTS = {
+    "DAGTaskTemplateGenerator": "geoplan_bench.pipeline.task_generation",
+    "ToolFlowGenerator": "geoplan_bench.pipeline.task_generation",
+    "ToolFlowParameterizer": "geoplan_bench.pipeline.task_generation",
+    "TaskGenerator": "geoplan_bench.pipeline.task_generation",
+    "RemoteSensingTaskPipeline": "geoplan_bench.pipeline.task_generation",
+    "RemoteSensingTaskEval": "geoplan_bench.pipeline.task_evaluation",
+    "execute_task_evaluation_pipeline": "geoplan_bench.pipeline.task_evaluation",
+    "filter_tasks": "geoplan_bench.pipeline.task_validation",
+    "load_all_tasks": "geoplan_bench.pipeline.task_validation",
+    "is_domain_relevant": "geoplan_bench.pipeline.task_validation",
+    "is_complexity_relevant": "geoplan_bench.pipeline.task_validation",
+    "generate_report": "geoplan_bench.pipeline.task_validation",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -0,0 +1,82 @@
+"""
+Diverse longest paths in a DAG template.
+
+Enumerating simple paths between sources and sinks is exponential in the size
+of the DAG. Instead, each round runs one longest-path dynamic program over the
+topological order, in O(V + E), with node weights that decay every time a node
+appears in an earlier candidate. The first round returns the overall longest
+path; later rounds are pulled towards unused nodes, sources and sinks. A
+candidate is accepted when it shares at most ``max_overlap`` of its nodes with
+every accepted path, so k paths cost O(k * (V + E)).
+"""
+
+from typing import Dict, Hashable, List, Optional
+
+import networkx as nx
+
+
+def path_overlap(path_a: List[Hashable], path_b: List[Hashable]) -> float:
+    """Shared nodes as a fraction of the shorter path"""
+    if not path_a or not path_b:
+        return 0.0
+    return len(set(path_a) & set(path_b)) / min(len(path_a), len(path_b))
+
+
+def weighted_longest_path(graph: nx.DiGraph, order: List[Hashable], weight: Dict[Hashable, float]) -> List[Hashable]:
+    """Maximum node-weight path, computed in one pass over a topological order"""
+    best: Dict[Hashable, float] = {}
+    parent: Dict[Hashable, Optional[Hashable]] = {}
+    for node in order:
+        previous = max(graph.predecessors(node), key=lambda pred: best[pred], default=None)
+        best[node] = weight[node] + (best[previous] if previous is not None else 0.0)
+        parent[node] = previous
+    if not best:
+        return []
+    node = max(order, key=lambda n: best[n])
+    path = []
+    while node is not None:
+        path.append(node)
+        node = parent[node]
+    return path[::-1]
+
+
+def diverse_longest_paths(graph: nx.DiGraph, k: int = 5, max_overlap: float = 0.5, min_length: int = 4,
+                          reuse_weight: float = 0.5, max_rounds: Optional[int] = None) -> List[List[Hashable]]:
+    """
+    Up to k long, mutually diverse paths of a DAG, longest first.
+
+    Args:
+        graph: Directed acyclic graph, raises networkx.NetworkXUnfeasible on cycles
+        k: Number of paths to return
+        max_overlap: Largest accepted path_overlap with any already accepted path
+        min_length: Shortest accepted path, in nodes
+        reuse_weight: Weight factor applied to a node each time it appears in a candidate
+        max_rounds: DP rounds before giving up, defaults to 3 * k
+
+    Returns:
+        Accepted paths; when fewer than k pass the overlap limit, the remaining
+        slots are filled with the least overlapping rejected candidates.
+    """
+    order = list(nx.topological_sort(graph))
+    uses = dict.fromkeys(order, 0)
+    accepted: List[List[Hashable]] = []
+    rejected: List[List[Hashable]] = []
+    seen = set()
+    for _ in range(max_rounds or 3 * k):
+        if len(accepted) >= k:
+            break
+        path = weighted_longest_path(graph, order, {node: reuse_weight ** uses[node] for node in order})
+        for node in path:
+            uses[node] += 1
+        if len(path) < min_length or tuple(path) in seen:
+            continue
+        seen.add(tuple(path))
+        if all(path_overlap(path, other) <= max_overlap for other in accepted):
+            accepted.append(path)
+        else:
+            rejected.append(path)
+
+    rejected.sort(key=lambda path: (max(path_overlap(path, other) for other in accepted), -len(path)))
+    paths = accepted + rejected[:k - len(accepted)]
+    paths.sort(key=len, reverse=True)
+    return paths
@@ -0,0 +1,194 @@
+"""
+Validation and repair of generated DAG templates.
+
+Gemini output can be unparseable, cyclic, use tool names that are not in
+geoplan_bench.tools or list edges whose endpoints are missing from the nodes.
+repair_dag_template fixes what it can without another LLM call: near-miss
+names are mapped onto registered tools, unknown tools and malformed edges are
+dropped, missing endpoints are added and back-edges are removed until the graph
+is acyclic. Its report tells the caller whether the result can still yield a
+flow, so a paid regeneration is only spent on templates that cannot be repaired.
+"""
+
+import re
+import inspect
+import difflib
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import networkx as nx
+
+import geoplan_bench.tools as tools
+
+EMBEDDING_MODEL = 'paraphrase-multilingual-MiniLM-L12-v2'
+
+
+def registered_tool_names() -> List[str]:
+    """Public functions of geoplan_bench.tools"""
+    return [name for name, obj in inspect.getmembers(tools) if inspect.isfunction(obj) and not name.startswith('_')]
+
+
+def normalize_tool_name(name: str) -> str:
+    """snake_case form of a tool name as written by an LLM, e.g. "Calculate NDVI()" -> "calculate_ndvi" """
+    name = re.sub(r'\(.*\)$', '', str(name).strip())
+    name = re.sub(r'([a-z0-9])([A-Z])', r'\1_\2', name)
+    return "_".join(re.findall(r'[a-z0-9]+', name.lower()))
+
+
+class ToolNameMatcher:
+    """
+    Map generated tool names onto registered tools.
+
+    Tries, in order: the exact name, the normalized name, the same words in a
+    different order, difflib string similarity and cosine similarity of
+    sentence embeddings of the names. The embedding model is only loaded for
+    names the cheaper checks cannot place.
+    """
+
+    def __init__(self, tool_names: Optional[List[str]] = None, string_cutoff: float = 0.85,
+                 embedding_cutoff: float = 0.85, use_embeddings: bool = True):
+        self.tool_names = list(tool_names or registered_tool_names())
+        self._tool_name_set = set(self.tool_names)
+        self.string_cutoff = string_cutoff
+        self.embedding_cutoff = embedding_cutoff
+        self.use_embeddings = use_embeddings
+        self._by_normalized = {normalize_tool_name(name): name for name in self.tool_names}
+        self._by_words = {"_".join(sorted(key.split("_"))): name for key, name in self._by_normalized.items()}
+        self._cache: Dict[str, Optional[str]] = {}
+        self._model = None
+        self._tool_embeddings = None
+        self._lock = threading.Lock()
+
+    def match(self, name: str) -> Optional[str]:
+        """Registered tool for name, or None if nothing is close enough"""
+        if name in self._cache:
+            return self._cache[name]
+        if name in self._tool_name_set:
+            return name
+        normalized = normalize_tool_name(name)
+        match = self._by_normalized.get(normalized) or self._by_words.get("_".join(sorted(normalized.split("_"))))
+        if match is None:
+            close = difflib.get_close_matches(normalized, list(self._by_normalized), n=1, cutoff=self.string_cutoff)
+            match = self._by_normalized[close[0]] if close else None
+        if match is None and self.use_embeddings and normalized:
+            match = self._embedding_match(normalized)
+        self._cache[name] = match
+        return match
+
+    def _embedding_match(self, normalized: str) -> Optional[str]:
+        import numpy as np
+        with self._lock:
+            if self._model is None:
+                try:
+                    from sentence_transformers import SentenceTransformer
+                    self._model = SentenceTransformer(EMBEDDING_MODEL)
+                except Exception as e:
+                    print(f"Embedding name matching unavailable, using string similarity only: {e}")
+                    self.use_embeddings = False
+                    return None
+                self._tool_embeddings = self._model.encode(
+                    [name.replace("_", " ") for name in self.tool_names], normalize_embeddings=True)
+            embedding = self._model.encode([normalized.replace("_", " ")], normalize_embeddings=True)[0]
+        similarities = np.asarray(self._tool_embeddings) @ embedding
+        best = int(np.argmax(similarities))
+        return self.tool_names[best] if similarities[best] >= self.embedding_cutoff else None
+
+
+def _new_report() -> dict:
+    return {
+        "valid": False,
+        "usable": False,
+        "renamed": {},
+        "dropped_nodes": [],
+        "dropped_edges": [],
+        "added_nodes": [],
+        "removed_back_edges": [],
+        "longest_path": 0,
+        "issues": [],
+    }
+
+
+def repair_dag_template(dag_template, matcher: Optional[ToolNameMatcher] = None,
+                        min_path_length: int = 4) -> Tuple[Optional[dict], dict]:
+    """
+    Validate a parsed DAG template and repair it where possible.
+
+    Args:
+        dag_template: Parsed template, anything else (e.g. None) is reported as unusable
+        matcher: Tool name matcher, a default one is built when not given
+        min_path_length: Nodes the longest path needs for the template to be usable
+
+    Returns:
+        (repaired template or None, report); report["valid"] is True when no
+        change was needed and report["usable"] when the result has a path of
+        at least min_path_length tools.
+    """
+    report = _new_report()
+    if not isinstance(dag_template, dict) or not isinstance(dag_template.get('nodes'), list) \
+            or not isinstance(dag_template.get('edges'), list):
+        report["issues"].append("template is not a JSON object with 'nodes' and 'edges' lists")
+        return None, report
+    matcher = matcher or ToolNameMatcher()
+
+    def resolve(name):
+        if not isinstance(name, str):
+            return None
+        match = matcher.match(name)
+        if match is not None and match != name:
+            report["renamed"][name] = match
+        return match
+
+    graph = nx.DiGraph()
+    for node in dag_template['nodes']:
+        match = resolve(node)
+        if match is None:
+            report["dropped_nodes"].append(node)
+        else:
+            graph.add_node(match)
+
+    for edge in dag_template['edges']:
+        if not isinstance(edge, (list, tuple)) or len(edge) != 2:
+            report["dropped_edges"].append(edge)
+            continue
+        source, target = resolve(edge[0]), resolve(edge[1])
+        if source is None or target is None or source == target:
+            report["dropped_edges"].append(list(edge))
+            continue
+        for endpoint in (source, target):
+            if endpoint not in graph:
+                graph.add_node(endpoint)
+                report["added_nodes"].append(endpoint)
+        graph.add_edge(source, target)
+
+    # break every cycle at the edge that closes it
+    while True:
+        try:
+            cycle = nx.find_cycle(graph)
+        except nx.NetworkXNoCycle:
+            break
+        source, target = cycle[-1][:2]
+        graph.remove_edge(source, target)
+        report["removed_back_edges"].append([source, target])
+
+    if report["renamed"]:
+        report["issues"].append(f"renamed {len(report['renamed'])} tool names to registered tools")
+    if report["dropped_nodes"]:
+        report["issues"].append(f"dropped unknown tools: {report['dropped_nodes']}")
+    if report["dropped_edges"]:
+        report["issues"].append(f"dropped {len(report['dropped_edges'])} malformed or unknown edges")
+    if report["added_nodes"]:
+        report["issues"].append(f"added edge endpoints missing from nodes: {report['added_nodes']}")
+    if report["removed_back_edges"]:
+        report["issues"].append(f"removed back-edges closing cycles: {report['removed_back_edges']}")
+
+    report["longest_path"] = len(nx.dag_longest_path(graph)) if graph.number_of_nodes() else 0
+    report["usable"] = report["longest_path"] >= min_path_length
+    if not report["usable"]:
+        report["issues"].append(f"longest dependency chain has {report['longest_path']} tools, "
+                                f"at least {min_path_length} are needed")
+    report["valid"] = not report["issues"]
+
+    repaired = dict(dag_template)
+    repaired['nodes'] = list(graph.nodes())
+    repaired['edges'] = [list(edge) for edge in graph.edges()]
+    return repaired, report
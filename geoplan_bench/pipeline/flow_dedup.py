@@ -0,0 +1,123 @@
+"""
+Near-duplicate checks for tool flows before questions are generated.
+
+Flows extracted from one DAG, and from DAGs of the same domain, are often
+prefixes of each other or share most of their tools. FlowIndex holds the
+ground-truth flows of the tasks generated so far; a candidate flow that nearly
+duplicates an indexed flow is skipped before any
+parameterization or question generation call is paid for it.
+
+Near-duplicates are found with ToolFlowLSH, so generation and filter_tasks
+share one definition of a near-duplicate flow (see flow_minhash).
+"""
+
+import os
+import json
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from geoplan_bench.pipeline.flow_minhash import ToolFlowLSH
+
+
+def load_task_flows(task_dir: str) -> List[List[str]]:
+    """ground_truth_tool_flow of every task file in task_dir, empty if it does not exist; unreadable files are skipped"""
+    flows = []
+    if os.path.isdir(task_dir):
+        for filename in os.listdir(task_dir):
+            if not filename.endswith('.json'):
+                continue
+            try:
+                with open(os.path.join(task_dir, filename), 'r', encoding='utf-8') as f:
+                    task = json.load(f)
+            except Exception as e:
+                print(f"Warning: Failed to load task from {filename}: {e}")
+                continue
+            if isinstance(task, dict) and task.get('ground_truth_tool_flow'):
+                flows.append(task['ground_truth_tool_flow'])
+    return flows
+
+
+class FlowIndex:
+    """
+    Thread-safe index of ground-truth tool flows.
+
+    Args:
+        flows: Flows to index initially, e.g. those of previously generated tasks
+        threshold: Similarity at or above which a candidate is a duplicate
+    """
+
+    def __init__(self, flows: Optional[Iterable[Sequence[str]]] = None, threshold: float = 0.8):
+        self.threshold = threshold
+        self._flows: Dict[int, Tuple[str, ...]] = {}
+        self._lsh = ToolFlowLSH(threshold=threshold)
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self.checked = 0
+        self.skipped = 0
+        for flow in flows or []:
+            self._add(tuple(flow))
+
+    @classmethod
+    def from_task_dir(cls, task_dir: str, threshold: float = 0.8) -> "FlowIndex":
+        """Index of the flows of the task files in task_dir"""
+        return cls(load_task_flows(task_dir), threshold=threshold)
+
+    def __len__(self):
+        return len(self._flows)
+
+    def _add(self, flow: Tuple[str, ...]) -> int:
+        flow_id = self._next_id
+        self._next_id += 1
+        self._flows[flow_id] = flow
+        self._lsh.insert(flow_id, flow)
+        return flow_id
+
+    def _find(self, flow: Tuple[str, ...]) -> Optional[Tuple[Tuple[str, ...], float]]:
+        matches = self._lsh.query(flow)
+        if not matches:
+            return None
+        flow_id, score = matches[0]
+        return self._flows[flow_id], score
+
+    def find_duplicate(self, flow: Sequence[str]) -> Optional[Tuple[List[str], float]]:
+        """Most similar indexed flow and its similarity, None if no flow reaches the threshold"""
+        with self._lock:
+            match = self._find(tuple(flow))
+        return (list(match[0]), match[1]) if match else None
+
+    def add(self, flow: Sequence[str]):
+        with self._lock:
+            self._add(tuple(flow))
+
+    def claim(self, flow: Sequence[str]) -> bool:
+        """
+        Index flow unless it duplicates an indexed flow.
+
+        Returns True if flow was added and its task should be generated. The
+        check and the insert are atomic, so concurrent jobs never both claim
+        near-identical flows; call release if the claimed flow yields no task.
+        """
+        flow = tuple(flow)
+        with self._lock:
+            self.checked += 1
+            if not flow or self._find(flow) is not None:
+                self.skipped += 1
+                return False
+            self._add(flow)
+            return True
+
+    def release(self, flow: Sequence[str]):
+        """Remove a claimed flow again"""
+        flow = tuple(flow)
+        with self._lock:
+            for flow_id in reversed(self._flows):
+                if self._flows[flow_id] == flow:
+                    break
+            else:
+                return
+            del self._flows[flow_id]
+            self._lsh.remove(flow_id)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"indexed": len(self._flows), "checked": self.checked, "skipped": self.skipped}
@@ -0,0 +1,195 @@
+"""
+MinHash/LSH near-duplicate index over ground-truth tool flows.
+
+Two flows are near-duplicates when flow_similarity, their longest common
+subsequence divided by the length of the shorter flow, reaches the threshold.
+This is the definition used both when tasks are generated (FlowIndex) and
+when they are filtered (dedupe_tool_flows); see docs/usage.md.
+
+Only LSH candidates are compared. A flow is represented by its shingles, the
+runs of shingle_size consecutive tools with start and end markers, and gets a
+MinHash signature of num_perm hashes whose agreement estimates the Jaccard
+similarity of two shingle sets. Signatures are split into bands; flows sharing
+any band land in the same bucket, so inserting or querying n flows costs O(n)
+instead of the O(n^2) of pairwise comparison. Bands and rows are chosen so
+that pairs whose shingle sets are at the threshold share a band with
+probability at least 1 - max_false_negative (0.95 by default, e.g. 18 bands of
+7 rows for threshold 0.8 and 128 hashes). Pairs whose tool pairs mostly
+differ, such as a short prefix of a much longer flow, rarely become
+candidates and are not near-duplicates even if their flow_similarity is high.
+"""
+
+import zlib
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+_SHIFT = np.uint64(32)
+
+
+def longest_common_subsequence(flow_a: Sequence[Hashable], flow_b: Sequence[Hashable]) -> int:
+    """Length of the longest common subsequence of two flows"""
+    if len(flow_a) < len(flow_b):
+        flow_a, flow_b = flow_b, flow_a
+    previous = [0] * (len(flow_b) + 1)
+    for tool_a in flow_a:
+        current = [0]
+        for j, tool_b in enumerate(flow_b):
+            current.append(previous[j] + 1 if tool_a == tool_b else max(previous[j + 1], current[j]))
+        previous = current
+    return previous[-1]
+
+
+def flow_similarity(flow_a: Sequence[Hashable], flow_b: Sequence[Hashable]) -> float:
+    """Longest common subsequence as a fraction of the shorter flow"""
+    if not flow_a or not flow_b:
+        return 0.0
+    return longest_common_subsequence(flow_a, flow_b) / min(len(flow_a), len(flow_b))
+
+
+def flow_shingles(flow: Sequence[str], shingle_size: int = 2) -> List[str]:
+    """Runs of shingle_size consecutive tools, padded with start and end markers"""
+    padded = ["^"] + [str(tool) for tool in flow] + ["$"]
+    size = min(shingle_size, len(padded))
+    return sorted({"\x1f".join(padded[i:i + size]) for i in range(len(padded) - size + 1)})
+
+
+def collision_probability(similarity: float, bands: int, rows: int) -> float:
+    """Probability that two flows with this Jaccard similarity share at least one band"""
+    return 1 - (1 - similarity ** rows) ** bands
+
+
+def lsh_bands(threshold: float, num_perm: int, max_false_negative: float = 0.05) -> Tuple[int, int]:
+    """
+    (bands, rows) with bands * rows <= num_perm such that pairs at the threshold
+    share a band with probability at least 1 - max_false_negative. Among those,
+    the most rows per band is chosen, which keeps the fewest dissimilar candidates.
+    Falls back to one row per band when no choice reaches the target.
+    """
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        if collision_probability(threshold, bands, rows) >= 1 - max_false_negative:
+            best = (bands, rows)
+    return best
+
+
+class ToolFlowLSH:
+    """
+    Near-duplicate index of tool flows.
+
+    Args:
+        threshold: flow_similarity at or above which flows are near-duplicates, and the shingle
+            Jaccard similarity the LSH bands are sized for
+        num_perm: Hash functions per signature; more is more accurate and slower
+        shingle_size: Consecutive tools per shingle
+        seed: Seed of the hash functions, indexes to compare must share it
+        max_false_negative: Largest probability that a pair at the threshold never becomes a candidate
+    """
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 128, shingle_size: int = 2, seed: int = 1,
+                 max_false_negative: float = 0.05):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = np.random.RandomState(seed)
+        # multiply-add-shift hashing of the 32-bit shingle hashes, a must be odd
+        self._a = rng.randint(0, np.iinfo(np.uint64).max, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.randint(0, np.iinfo(np.uint64).max, size=num_perm, dtype=np.uint64)
+        self.bands, self.rows = lsh_bands(threshold, num_perm, max_false_negative)
+        self._buckets: List[Dict[bytes, List[Hashable]]] = [{} for _ in range(self.bands)]
+        self._signatures: Dict[Hashable, np.ndarray] = {}
+        self._flows: Dict[Hashable, Tuple[str, ...]] = {}
+
+    def __len__(self):
+        return len(self._signatures)
+
+    def __contains__(self, key):
+        return key in self._signatures
+
+    def signature(self, flow: Sequence[str]) -> np.ndarray:
+        """MinHash signature of flow's shingles"""
+        return self.signatures([flow])[0]
+
+    def signatures(self, flows: Sequence[Sequence[str]], chunk_size: int = 4096) -> np.ndarray:
+        """(len(flows), num_perm) signatures, computed chunk_size flows at a time"""
+        result = np.empty((len(flows), self.num_perm), dtype=np.uint32)
+        for start in range(0, len(flows), chunk_size):
+            shingle_sets = [flow_shingles(flow, self.shingle_size) for flow in flows[start:start + chunk_size]]
+            hashes = np.array([zlib.crc32(shingle.encode("utf-8")) for shingles in shingle_sets for shingle in shingles],
+                              dtype=np.uint64)
+            offsets = np.cumsum([0] + [len(shingles) for shingles in shingle_sets[:-1]])
+            # tool flows share few distinct shingles, so each is permuted once per chunk
+            unique, inverse = np.unique(hashes, return_inverse=True)
+            with np.errstate(over="ignore"):
+                permuted = ((np.outer(self._a, unique) + self._b[:, None]) >> _SHIFT).astype(np.uint32)
+            result[start:start + len(shingle_sets)] = np.minimum.reduceat(permuted[:, inverse], offsets, axis=1).T
+        return result
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [signature[band * self.rows:(band + 1) * self.rows].tobytes() for band in range(self.bands)]
+
+    def insert(self, key: Hashable, flow: Sequence[str], signature: Optional[np.ndarray] = None):
+        """Index flow under key, raises ValueError if key is already indexed"""
+        if key in self._signatures:
+            raise ValueError(f"Flow key already indexed: {key}")
+        signature = self.signature(flow) if signature is None else signature
+        self._signatures[key] = signature
+        self._flows[key] = tuple(flow)
+        for buckets, band_key in zip(self._buckets, self._band_keys(signature)):
+            buckets.setdefault(band_key, []).append(key)
+
+    def remove(self, key: Hashable):
+        """Remove the flow indexed under key, raises KeyError if it is not indexed"""
+        signature = self._signatures.pop(key)
+        del self._flows[key]
+        for buckets, band_key in zip(self._buckets, self._band_keys(signature)):
+            bucket = buckets[band_key]
+            bucket.remove(key)
+            if not bucket:
+                del buckets[band_key]
+
+    def query(self, flow: Sequence[str], threshold: Optional[float] = None,
+              signature: Optional[np.ndarray] = None) -> List[Tuple[Hashable, float]]:
+        """
+        Indexed near-duplicates of flow as (key, flow_similarity), most similar first.
+
+        threshold may be raised above the index threshold, lower values miss
+        pairs that never share a band. signature skips recomputing the
+        signature when it is already known, e.g. from signatures().
+        """
+        threshold = self.threshold if threshold is None else threshold
+        signature = self.signature(flow) if signature is None else signature
+        candidates = set()
+        for buckets, band_key in zip(self._buckets, self._band_keys(signature)):
+            candidates.update(buckets.get(band_key, ()))
+        matches = []
+        for key in candidates:
+            similarity = flow_similarity(flow, self._flows[key])
+            if similarity >= threshold:
+                matches.append((key, similarity))
+        matches.sort(key=lambda match: match[1], reverse=True)
+        return matches
+
+
+def dedupe_tool_flows(tasks: Iterable[dict], threshold: float = 0.8, num_perm: int = 128,
+                      shingle_size: int = 2) -> Tuple[List[dict], List[Tuple[str, str, float]]]:
+    """
+    Drop tasks whose ground_truth_tool_flow nearly duplicates that of an earlier task.
+
+    Returns:
+        (kept tasks, [(removed task_id, task_id it duplicates, flow_similarity)])
+    """
+    tasks = list(tasks)
+    index = ToolFlowLSH(threshold=threshold, num_perm=num_perm, shingle_size=shingle_size)
+    signatures = index.signatures([task['ground_truth_tool_flow'] for task in tasks])
+    kept, removed = [], []
+    for position, task in enumerate(tasks):
+        matches = index.query(task['ground_truth_tool_flow'], signature=signatures[position])
+        if matches:
+            original, similarity = matches[0]
+            removed.append((task.get('task_id'), tasks[original].get('task_id'), similarity))
+            continue
+        index.insert(position, task['ground_truth_tool_flow'], signature=signatures[position])
+        kept.append(task)
+    return kept, removed
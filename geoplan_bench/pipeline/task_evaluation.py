@@ -3,7 +3,8 @@ import json
 import re
 from tqdm import tqdm
 
-from openai import OpenAI
+from geoplan_bench.llm import (BudgetExceeded, budget_scope, create_openai_client, get_collector, get_parse_stats,
+    get_tracer, span, telemetry_context)
 from dotenv import load_dotenv
 from dotenv.main import logger
 
@@ -16,64 +17,70 @@ load_dotenv()
 
 
 class RemoteSensingTaskEval:
-    def __init__(self, model="gpt-4o-mini"):
-        self.client = OpenAI(
-            api_key=os.getenv("OPENAI_API_KEY"), 
-            base_url=os.getenv("OPENAI_API_BASE")
-        )
+    def __init__(self, model="gpt-4o-mini", observation_provider=None, loop_detector=None, budget=None):
+        self.client = create_openai_client()
         self.model = model
         self.pipeline = RemoteSensingTaskPipeline(model)
         self.correctness_evaluator = CorrectnessEvaluator(model)
         self.holistic_evaluator = HolisticEvaluator(model)
         self.structural_evaluator = StructuralEvaluator()
-    
-    def _parse_json_response(self, content):
-        try:
-            if "```json" in content:
-                json_str = re.search(r'```json\s*(\{.*?\})\s*```', content, re.DOTALL).group(1)
-            elif "```" in content:
-                json_str = re.search(r'```\s*(\{.*?\})\s*```', content, re.DOTALL).group(1)
-            else:
-                json_str = content
-            return json.loads(json_str)
-        except:
-            return None
+        # shared by the ReAct agents of every task so repeated observations are deduplicated
+        self.observation_provider = observation_provider
+        # optional LoopDetector shared the same way, its stats() aggregate over all tasks
+        self.loop_detector = loop_detector
+        # optional Budget applied to each agent run of each task, evaluator calls are not counted
+        self.budget = budget
     
     def evaluate_task(self,task):
+        # every LLM call made for this task is recorded with its task_id
+        with telemetry_context(task_id=task.get('task_id', 'unknown_task')):
+            with span("task", category="task"):
+                return self._evaluate_task(task)
+
+    def _evaluate_task(self,task):
         task_id = task.get('task_id', 'unknown_task')
         question = task['question']
         ground_truth_tool_trajectory=task['ground_truth_tool_flow']
 
 
-        react_agent = create_react_agent()
+        react_agent = create_react_agent(observation_provider=self.observation_provider, loop_detector=self.loop_detector)
         plan_and_execute_agent = create_plan_and_execute_agent()
-        earth_agent = create_earth_agent()
+        earth_agent = create_earth_agent(observation_provider=self.observation_provider, loop_detector=self.loop_detector)
         debate_agent = create_debate_agent()
         zero_shot_cot_based_agent = create_zero_shot_cot_based_agent()
         aflow_agent = create_aflow_agent()
 
-
-        react_agent_tool_trajectory = react_agent.run_and_return_tool_trajectory(question)
-        plan_and_execute_agent_tool_trajectory = plan_and_execute_agent.run_and_return_tool_trajectory(question)
-        earth_agent_tool_trajectory = earth_agent.run_and_return_tool_trajectory(question)
-        debate_agent_tool_trajectory = debate_agent.run_and_return_tool_trajectory(question)
-        zero_shot_cot_based_agent_tool_trajectory = zero_shot_cot_based_agent.run_and_return_tool_trajectory(question)
-        aflow_agent_tool_trajectory = aflow_agent.run_and_return_tool_trajectory(question)
-        agents_results = {
-            "ReAct": react_agent_tool_trajectory,
-            "Plan-and-Execute": plan_and_execute_agent_tool_trajectory,
-            "EarthAgent": earth_agent_tool_trajectory,
-            "Debate": debate_agent_tool_trajectory,
-            "CoT": zero_shot_cot_based_agent_tool_trajectory,
-            "AFlow": aflow_agent_tool_trajectory
+        agents = {
+            "ReAct": react_agent,
+            "Plan-and-Execute": plan_and_execute_agent,
+            "EarthAgent": earth_agent,
+            "Debate": debate_agent,
+            "CoT": zero_shot_cot_based_agent,
+            "AFlow": aflow_agent
         }
+        agents_results = {}
+        budget_usage = {}
+        loop_stats = {}
+        for agent_name, agent in agents.items():
+            with telemetry_context(agent=agent_name), span(agent_name, category="agent"), budget_scope(self.budget) as budget:
+                try:
+                    agents_results[agent_name] = agent.run_and_return_tool_trajectory(question)
+                except BudgetExceeded as e:
+                    # agents without a partial result of their own
+                    logger.error(f"{agent_name} stopped on task {task_id}: {e.reason}")
+                    agents_results[agent_name] = []
+            budget_usage[agent_name] = budget.to_dict()
+            run_stats = self._loop_stats(agent) if self.loop_detector is not None else None
+            if run_stats is not None:
+                loop_stats[agent_name] = run_stats
 
         eval_results = {}
 
         holistic_metric_score = self.holistic_evaluator.compute_completeness_score(agents_results, question)
 
         for agent_name, agent_tool_trajectory in agents_results.items():
-            key_steps, key_tools, key_step_recall, key_tool_precision, F1_score = self.correctness_evaluator.compute_correctness_score(question, ground_truth_tool_trajectory, agent_tool_trajectory)
+            with telemetry_context(agent=agent_name):
+                key_steps, key_tools, key_step_recall, key_tool_precision, F1_score = self.correctness_evaluator.compute_correctness_score(question, ground_truth_tool_trajectory, agent_tool_trajectory)
             tool_flow_similarity, enhanced_edit_distance = self.structural_evaluator.compute_structural_score(agent_tool_trajectory, ground_truth_tool_trajectory)
             # store results
             eval_results[agent_name] = {
@@ -86,14 +93,40 @@ class RemoteSensingTaskEval:
                 "enhanced_edit_distance": enhanced_edit_distance,
                 "tool_flow_similarity": tool_flow_similarity,
                 "completeness_score": holistic_metric_score[agent_name],
+                "budget": budget_usage[agent_name],
             }
+            if agent_name in loop_stats:
+                eval_results[agent_name]["loop"] = loop_stats[agent_name]
 
         return eval_results
 
+    @staticmethod
+    def _loop_stats(agent):
+        """run_stats of a ReAct agent, summed over the experts for EarthAgent; None for agents without a ReAct loop"""
+        if hasattr(agent, "run_stats"):
+            return dict(agent.run_stats)
+        experts = [expert for layer in (getattr(agent, "layer1_agents", {}), getattr(agent, "layer2_agents", {}),
+                                        getattr(agent, "layer3_agents", {})) for expert in layer.values()]
+        if not experts:
+            return None
+        return {
+            "steps": sum(expert.run_stats["steps"] for expert in experts),
+            "loops_detected": {expert.name: expert.run_stats["loop_detected"]
+                               for expert in experts if expert.run_stats["loop_detected"]},
+            "aborted_steps": sum(expert.run_stats["aborted_steps"] for expert in experts),
+            "saved_calls": sum(expert.run_stats["saved_calls"] for expert in experts),
+        }
 
-def execute_task_evaluation_pipeline(start_from_task_index: int = 0, end_to_task_index: int = None):
-    """eval range: [start_from_task_index:end_to_task_index]"""
-    pipeline = RemoteSensingTaskEval()
+
+def execute_task_evaluation_pipeline(start_from_task_index: int = 0, end_to_task_index: int = None, budget=None,
+                                     loop_detector=None, observation_provider=None):
+    """
+    eval range: [start_from_task_index:end_to_task_index], budget caps every agent run,
+    loop_detector (a LoopDetector) ends ReAct runs early on repeated or cyclic tool calls,
+    observation_provider is shared by the ReAct agents of every task (e.g. a CachedLLMObservationProvider)
+    """
+    pipeline = RemoteSensingTaskEval(budget=budget, loop_detector=loop_detector,
+                                     observation_provider=observation_provider)
     eval_results = []
     tasks = []
     # eval path
@@ -126,18 +159,33 @@ def execute_task_evaluation_pipeline(start_from_task_index: int = 0, end_to_task
             
             # update progress bar description
             pbar.set_description(f"Evaluate {''.join(re.findall(r'[A-Z]', domain))}-{complexity}")
+            telemetry = get_collector()
             try:
                 eval_results = pipeline.evaluate_task(task)
             except Exception as e:
                 logger.error(f"\nEvaluate task id:{task_id},index:{task_idx+start_from_task_index} failed: {e}")
+                telemetry.drain(task_id)
+                get_tracer().release(task_id)
                 continue
             # save the result for this task
             result_data = {
                 "task_info": task,
                 "eval_result": eval_results,
+                "telemetry": {
+                    "summary": telemetry.summary(task_id),
+                    "calls": [record.to_dict() for record in telemetry.records(task_id)],
+                    "levels": get_tracer().level_summary(task_id),
+                },
             }
+            # nested timing spans, open in chrome://tracing or https://ui.perfetto.dev
+            os.makedirs("data/eval_results/traces", exist_ok=True)
+            get_tracer().export_chrome_trace(os.path.join("data/eval_results/traces", f"trace_{task_id}.json"), task_id)
             with open(os.path.join("data/eval_results", f"eval_{task_id}.json"), 'w', encoding='utf-8') as f:
                 json.dump(result_data, f, ensure_ascii=False, indent=2)
+            # the records and spans are in the eval and trace files now, telemetry_summary.json and
+            # all_tasks.folded only need the aggregates
+            telemetry.drain(task_id)
+            get_tracer().release(task_id)
             task_evaluated_num += 1
             pbar.set_postfix({
                 'Evaluated': task_evaluated_num,
@@ -148,6 +196,17 @@ def execute_task_evaluation_pipeline(start_from_task_index: int = 0, end_to_task
             # update progress bar
             pbar.update(1)
 
+    # per-agent, per-component and per-stage totals over all evaluated tasks
+    with open(os.path.join("data/eval_results", "telemetry_summary.json"), 'w', encoding='utf-8') as f:
+        summary = dict(get_collector().summary(), json_parsing=get_parse_stats())
+        if loop_detector is not None:
+            summary["loop_detector"] = loop_detector.stats()
+        if hasattr(observation_provider, "stats"):
+            summary["observations"] = observation_provider.stats()
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+    os.makedirs("data/eval_results/traces", exist_ok=True)
+    get_tracer().export_folded(os.path.join("data/eval_results/traces", "all_tasks.folded"))
+
 
 
 
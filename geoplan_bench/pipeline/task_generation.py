@@ -4,28 +4,35 @@ Task generation pipeline for GeoPlan Benchmark.
 
 import os
 import json
-import re
 import inspect
 from tqdm import tqdm
 from uuid import uuid4
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import networkx as nx
-from openai import OpenAI
-from google import genai
+from geoplan_bench.llm import (create_openai_client, create_genai_client, json_mode_kwargs, parse_json_response,
+                               propagate_context)
+from geoplan_bench.data.schemas import ParameterizedFlowSchema
+from geoplan_bench.pipeline.dag_paths import diverse_longest_paths
+from geoplan_bench.pipeline.dag_validation import ToolNameMatcher, repair_dag_template
+from geoplan_bench.pipeline.flow_dedup import FlowIndex, load_task_flows
 
 import geoplan_bench.tools as tools
 from geoplan_bench.config.constants import (
     DOMAINS, EMPTY_DAG_TEMPLATE, EMPTY_TOOL_FLOW, EMPTY_PARAMETERIZED_TOOL_FLOW, DOMAIN_DESCRIPTIONS)
-from geoplan_bench.config.prompts import DAG_TEMPLATE_PROMPT, PARAMETERIZE_FLOW_PROMPT, GENERATE_TASK_PROMPT
+from geoplan_bench.config.prompts import (
+    DAG_TEMPLATE_PROMPT, DAG_REPAIR_PROMPT, PARAMETERIZE_FLOW_PROMPT, GENERATE_TASK_PROMPT)
 
 
 class DAGTaskTemplateGenerator:
-    def __init__(self, model="gemini-2.5-pro"):
-        self.client = genai.Client(
-            api_key=os.getenv("GEMINI_API_KEY")
-        )
+    def __init__(self, model="gemini-2.5-pro", max_repair_calls=1, min_path_length=4):
+        self.client = create_genai_client()
         self.model = model
         self.tools_info = self._get_all_tools()
+        self.name_matcher = ToolNameMatcher()
+        # LLM calls allowed per template when local repair leaves no usable flow
+        self.max_repair_calls = max_repair_calls
+        self.min_path_length = min_path_length
     
     def _get_all_tools(self):
         tool_info = []
@@ -35,18 +42,6 @@ class DAGTaskTemplateGenerator:
                 tool_info.append(f"{name}: {doc.strip()}")
         return tool_info
     
-    def _parse_json_response(self, content):
-        try:
-            if "```json" in content:
-                json_str = re.search(r'```json\s*(\{.*?\})\s*```', content, re.DOTALL).group(1)
-            elif "```" in content:
-                json_str = re.search(r'```\s*(\{.*?\})\s*```', content, re.DOTALL).group(1)
-            else:
-                json_str = content
-            return json.loads(json_str)
-        except:
-            return None
-    
     def generate_dag_template(self, domain, complexity, output_dir="data/tasks/dag_templates"):
         tools_str = "\n".join(self.tools_info)
 
@@ -69,81 +64,69 @@ class DAGTaskTemplateGenerator:
         
         response = self.client.models.generate_content(
             model=self.model,
-            contents=[prompt]
+            contents=[prompt],
+            **json_mode_kwargs("genai")
         )
-        if not os.path.exists(output_dir):
-            os.makedirs(output_dir)
+        dag_template, report = self.validate_dag_template(parse_json_response(response.text))
+        
+        for _ in range(self.max_repair_calls):
+            if report["usable"]:
+                break
+            # unparseable output is regenerated, otherwise only the reported problems are fixed
+            if dag_template is None:
+                repair_prompt = prompt
+            else:
+                repair_prompt = DAG_REPAIR_PROMPT.format(
+                    domain=domain,
+                    template=json.dumps(dag_template, ensure_ascii=False),
+                    issues="\n".join(f"- {issue}" for issue in report["issues"]),
+                    tools_str=tools_str,
+                    min_path_length=self.min_path_length
+                )
+            response = self.client.models.generate_content(
+                model=self.model,
+                contents=[repair_prompt],
+                **json_mode_kwargs("genai")
+            )
+            dag_template, report = self.validate_dag_template(parse_json_response(response.text))
+        # the repair report goes to a subdirectory, so readers listing the templates' *.json files do not see it
+        report_dir = os.path.join(output_dir, "validation")
+        os.makedirs(report_dir, exist_ok=True)
         
         template_id = str(uuid4())
         filename = f"dag_template_{domain}_{complexity}_{template_id}.json"
         filepath = os.path.join(output_dir, filename)
         with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(self._parse_json_response(response.text), f, ensure_ascii=False, indent=2)
-        return self._parse_json_response(response.text), filename
+            json.dump(dag_template, f, ensure_ascii=False, indent=2)
+        with open(os.path.join(report_dir, filename), "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        if not report["usable"]:
+            print(f"Discarding DAG template {filename}: {'; '.join(report['issues'])}")
+            return None, filename
+        return dag_template, filename
+
+    def validate_dag_template(self, dag_template):
+        """Repair a parsed template, returns (template, validation report)"""
+        return repair_dag_template(dag_template, self.name_matcher, self.min_path_length)
 
 
 class ToolFlowGenerator:
-    def __init__(self, model="gpt-4o-mini"):
-        self.client = OpenAI(
-            api_key=os.getenv("OPENAI_API_KEY"), 
-            base_url=os.getenv("OPENAI_API_BASE")
-        )
+    def __init__(self, model="gpt-4o-mini", num_flows=5, max_overlap=0.5):
+        self.client = create_openai_client()
         self.model = model
-    
-    def _parse_json_response(self, content):
-        try:
-            if "```json" in content:
-                json_str = re.search(r'```json\s*(\{.*?\})\s*```', content, re.DOTALL).group(1)
-            elif "```" in content:
-                json_str = re.search(r'```\s*(\{.*?\})\s*```', content, re.DOTALL).group(1)
-            else:
-                json_str = content
-            return json.loads(json_str)
-        except:
-            return None
+        # flows extracted per DAG and the largest node overlap allowed between them
+        self.num_flows = num_flows
+        self.max_overlap = max_overlap
     
     def _find_longest_paths_with_networkx(self, dag_template):
-        """Use NetworkX to find longest paths in DAG"""
+        """Use NetworkX to find long, diverse paths in DAG"""
         try:
             G = nx.DiGraph()
             G.add_nodes_from(dag_template['nodes'])
             G.add_edges_from(dag_template['edges'])
             
-            # Find all source nodes (in-degree = 0) and sink nodes (out-degree = 0)
-            source_nodes = [n for n in G.nodes() if G.in_degree(n) == 0]
-            sink_nodes = [n for n in G.nodes() if G.out_degree(n) == 0]
-            
-            longest_paths = []
-            
-            # Method 1: use nx.dag_longest_path to find longest path in the whole graph
-            try:
-                overall_longest = nx.dag_longest_path(G)
-                if len(overall_longest) > 5:
-                    longest_paths.append(overall_longest)
-            except:
-                pass
-            
-            # Method 2: use nx.all_simple_paths to find all simple paths
-            for source in source_nodes[:2]:
-                for sink in sink_nodes[:2]:
-                    try:
-                        simple_paths = list(nx.all_simple_paths(G, source, sink, cutoff=15))
-                        simple_paths.sort(key=len, reverse=True)
-                        longest_paths.extend(simple_paths[:3])
-                    except:
-                        continue
-            
-            # Remove duplicates and sort by length
-            unique_paths = []
-            seen = set()
-            for path in longest_paths:
-                path_tuple = tuple(path)
-                if path_tuple not in seen and len(path) > 3:
-                    seen.add(path_tuple)
-                    unique_paths.append(path)
-            
-            unique_paths.sort(key=len, reverse=True)
-            return unique_paths[:5]
+            # one longest-path DP per returned path, instead of enumerating all simple paths
+            return diverse_longest_paths(G, k=self.num_flows, max_overlap=self.max_overlap)
             
         except Exception as e:
             print(f"NetworkX path finding failed: {e}")
@@ -158,7 +141,7 @@ class ToolFlowGenerator:
                 return []
             
             flows = []
-            for path in longest_paths[:5]:
+            for path in longest_paths[:self.num_flows]:
                 flows.append(path)
             
             return flows
@@ -170,10 +153,7 @@ class ToolFlowGenerator:
 
 class ToolFlowParameterizer:
     def __init__(self, model="gpt-4o-mini"):
-        self.client = OpenAI(
-            api_key=os.getenv("OPENAI_API_KEY"), 
-            base_url=os.getenv("OPENAI_API_BASE")
-        )
+        self.client = create_openai_client()
         self.model = model
         self.tools_info = self._get_all_tools()
     
@@ -189,18 +169,6 @@ class ToolFlowParameterizer:
                 }
         return tool_funcs
     
-    def _parse_json_response(self, content):
-        try:
-            if "```json" in content:
-                json_str = re.search(r'```json\s*(\{.*?\})\s*```', content, re.DOTALL).group(1)
-            elif "```" in content:
-                json_str = re.search(r'```\s*(\{.*?\})\s*```', content, re.DOTALL).group(1)
-            else:
-                json_str = content
-            return json.loads(json_str)
-        except:
-            return None
-    
     def parameterize_flow(self, flow):
         tools_details = []
         for tool_name in flow:
@@ -216,17 +184,16 @@ class ToolFlowParameterizer:
         
         response = self.client.chat.completions.create(
             model=self.model,
-            messages=[{"role": "user", "content": prompt}]
+            messages=[{"role": "user", "content": prompt}],
+            **json_mode_kwargs()
         )
         
-        return self._parse_json_response(response.choices[0].message.content)
+        return parse_json_response(response.choices[0].message.content, schema=ParameterizedFlowSchema)
 
 
 class TaskGenerator:
     def __init__(self, model="gemini-2.5-pro"):
-        self.client = genai.Client(
-            api_key=os.getenv("GEMINI_API_KEY")
-        )
+        self.client = create_genai_client()
         self.model = model
     
     def generate_task_from_flow(self, parameterized_flow):
@@ -247,11 +214,14 @@ class TaskGenerator:
 
 
 class RemoteSensingTaskPipeline:
-    def __init__(self, model="gpt-4o-mini"):
+    def __init__(self, model="gpt-4o-mini", dedup_threshold=0.8):
         self.dag_generator = DAGTaskTemplateGenerator(model="gemini-2.5-pro")
         self.flow_generator = ToolFlowGenerator(model)
         self.parameterizer = ToolFlowParameterizer(model)
         self.task_generator = TaskGenerator(model="gemini-2.5-pro")
+        # flows of generated tasks; near-duplicate flows are skipped before any call is paid for them,
+        # None disables the check
+        self.flow_index = FlowIndex(threshold=dedup_threshold) if dedup_threshold is not None else None
     
     def generate_task_with_ground_truth(self, complexity, domain):
         # 1. Generate DAG template
@@ -264,24 +234,23 @@ class RemoteSensingTaskPipeline:
         if not tool_flows:
             return EMPTY_TOOL_FLOW
         
-        # 3. Parameterize all tool flows
-        parameterized_flows = []
-        for flow in tool_flows:
-            parameterized_flow = self.parameterizer.parameterize_flow(flow)
-            if not parameterized_flow:
-                return EMPTY_PARAMETERIZED_TOOL_FLOW
-            parameterized_flows.append(parameterized_flow)
+        # skip flows that duplicate the flow of an already generated task
+        if self.flow_index is not None:
+            tool_flows = [flow for flow in tool_flows if self.flow_index.claim(flow)]
+            if not tool_flows:
+                return EMPTY_TOOL_FLOW
         
-        # 4. Generate task based on parameterized tool flows
-        questions = []
-        for parameterized_flow in parameterized_flows:
-            question = self.task_generator.generate_task_from_flow(parameterized_flow)
-            questions.append(question)
+        # 3-4. Parameterize each tool flow and generate its question, flows run concurrently
+        with ThreadPoolExecutor(max_workers=len(tool_flows)) as executor:
+            questions = list(executor.map(propagate_context(self.generate_question_for_flow), tool_flows))
 
-        # 5. Package complete result
+        # 5. Package complete result, flows that failed are dropped
         tasks = []
-        for i, question in enumerate(questions):
-            flow = tool_flows[i]
+        for flow, question in zip(tool_flows, questions):
+            if not question:
+                if self.flow_index is not None:
+                    self.flow_index.release(flow)
+                continue
             task_id = str(uuid4())
             tasks.append({
                 "task_id": task_id,
@@ -291,33 +260,67 @@ class RemoteSensingTaskPipeline:
                 "question": question,
                 "ground_truth_tool_flow": flow,
             })
+        if not tasks:
+            return EMPTY_PARAMETERIZED_TOOL_FLOW
         
         return tasks
+
+    def generate_question_for_flow(self, flow):
+        """Parameterize one tool flow and generate its question, None if either step fails"""
+        try:
+            parameterized_flow = self.parameterizer.parameterize_flow(flow)
+            if not parameterized_flow or 'parameterized_tools' not in parameterized_flow:
+                print(f"Dropping flow {flow}: parameterization failed")
+                return None
+            return self.task_generator.generate_task_from_flow(parameterized_flow)
+        except Exception as e:
+            print(f"Dropping flow {flow}: {e}")
+            return None
     
-    def generate_batch_tasks(self, num_dags=5):
-        "Generate and Save"
+    def generate_batch_tasks(self, num_dags=5, max_workers=4, output_dir="data/tasks/raw"):
+        """
+        Generate and save tasks for every domain x complexity x num_dags job.
+
+        Jobs run on max_workers threads and are saved as each one completes; the
+        calls of all jobs share the per-provider concurrency limits (see
+        geoplan_bench.llm.set_concurrency_limit). Tasks already in output_dir
+        are indexed first, so their flows are not generated again. Returns all
+        generated tasks.
+        """
+        if self.flow_index is not None:
+            for flow in load_task_flows(output_dir):
+                self.flow_index.add(flow)
         domains = DOMAINS
         complexities = ["Simple", "Medium", "Complex"]
+        jobs = [(domain, complexity) for domain in domains for _ in range(num_dags) for complexity in complexities]
+        failed_results = (EMPTY_DAG_TEMPLATE, EMPTY_TOOL_FLOW, EMPTY_PARAMETERIZED_TOOL_FLOW)
+        all_tasks = []
         
-        total_dag_num = len(domains) * num_dags * len(complexities)
-        
-        with tqdm(total=total_dag_num, desc="Generating DAG templates and tasks", 
-                  unit="task", ncols=100) as pbar:
-            
-            for domain_idx, domain in enumerate(domains):
-                for dag_idx in range(num_dags):
-                    for complexity_idx, complexity in enumerate(complexities):
-                        pbar.set_description(f"{domain}-{complexity} (DAG {dag_idx+1}/{num_dags})")
-                        
-                        tasks = self.generate_task_with_ground_truth(complexity, domain)
-                        if not tasks:
-                            continue
-                        # save tasks to file
-                        self.export_tasks(tasks, output_dir="data/tasks/raw")
-                        
-                        pbar.update(1)
+        with tqdm(total=len(jobs), desc="Generating DAG templates and tasks", 
+                  unit="dag", ncols=100) as pbar, ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(propagate_context(self.generate_task_with_ground_truth), complexity, domain): (domain, complexity)
+                for domain, complexity in jobs
+            }
+            for future in as_completed(futures):
+                domain, complexity = futures[future]
+                try:
+                    tasks = future.result()
+                except Exception as e:
+                    print(f"\nGeneration failed for {domain}-{complexity}: {e}")
+                    tasks = None
+                if tasks and tasks not in failed_results:
+                    # save tasks to file
+                    self.export_tasks(tasks, output_dir=output_dir)
+                    all_tasks.extend(tasks)
+                pbar.set_description(f"{domain}-{complexity} ({len(all_tasks)} tasks)")
+                pbar.update(1)
         
         print(f"\nTasks generated successfully!")
+        if self.flow_index is not None:
+            stats = self.flow_index.stats()
+            print(f"Skipped {stats['skipped']} of {stats['checked']} flows as near-duplicates before question generation")
+        return all_tasks
     
     def export_tasks(self, tasks, output_dir="data/tasks/raw"):
         if not os.path.exists(output_dir):
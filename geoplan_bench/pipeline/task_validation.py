@@ -1,9 +1,8 @@
 import json
 import os
 from datetime import datetime
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
 from geoplan_bench.config.constants import DOMAIN_KEYWORDS, DOMAINS
+from geoplan_bench.pipeline.flow_minhash import dedupe_tool_flows
 
 
 def load_all_tasks(tasks_dir="tasks"):
@@ -40,8 +39,8 @@ def is_complexity_relevant(ground_truth_tool_flow, complexity):
     return True
 
 
-def filter_tasks(task_dir="data/tasks/raw"):
-    """Execute task filtering"""
+def filter_tasks(task_dir="data/tasks/raw", flow_dedup_threshold=0.8):
+    """Execute task filtering, flow_dedup_threshold=None keeps tasks with near-duplicate tool flows"""
     print("Starting task filtering...")
     tasks = []
     if os.path.exists(task_dir):
@@ -83,11 +82,21 @@ def filter_tasks(task_dir="data/tasks/raw"):
     
     print(f"Domain relevance filtering: {len(complexity_filtered)} -> {len(domain_filtered)}")
     
-    # 4. Use SentenceTransformer to filter semantically duplicate questions
+    # 4. Filter out tasks whose tool flow nearly duplicates an earlier task's, whatever the question wording
+    if flow_dedup_threshold is not None:
+        flow_filtered, _ = dedupe_tool_flows(domain_filtered, threshold=flow_dedup_threshold)
+    else:
+        flow_filtered = domain_filtered
+    
+    print(f"Tool flow deduplication filtering: {len(domain_filtered)} -> {len(flow_filtered)}")
+    
+    # 5. Use SentenceTransformer to filter semantically duplicate questions
     print("Loading SentenceTransformer model...")
+    from sentence_transformers import SentenceTransformer
+    from sklearn.metrics.pairwise import cosine_similarity
     model = SentenceTransformer('all-MiniLM-L6-v2')
     
-    questions = [task['question'] for task in domain_filtered]
+    questions = [task['question'] for task in flow_filtered]
     print("Computing question embeddings...")
     embeddings = model.encode(questions)
     
@@ -103,12 +112,13 @@ def filter_tasks(task_dir="data/tasks/raw"):
             if similarity_matrix[i][j] > threshold:
                 to_remove.add(j)  # Remove later duplicate items
     
-    semantic_filtered = [task for i, task in enumerate(domain_filtered) if i not in to_remove]
+    semantic_filtered = [task for i, task in enumerate(flow_filtered) if i not in to_remove]
     
-    print(f"Semantic deduplication filtering: {len(domain_filtered)} -> {len(semantic_filtered)}")
+    print(f"Semantic deduplication filtering: {len(flow_filtered)} -> {len(semantic_filtered)}")
     
     return semantic_filtered, {
         'original_count': len(tasks),
+        'flow_dedup_filtered_count': len(flow_filtered),
         'domain_filtered_count': len(domain_filtered),
         'complexity_filtered_count': len(complexity_filtered),
         'tool_flow_filtered_count': len(tool_flow_filtered),
@@ -116,7 +126,8 @@ def filter_tasks(task_dir="data/tasks/raw"):
         'removed_by_domain': len(complexity_filtered) - len(domain_filtered),
         'removed_by_complexity': len(tool_flow_filtered) - len(complexity_filtered),
         'removed_by_tool_flow': len(tasks) - len(tool_flow_filtered),
-        'removed_by_semantic': len(domain_filtered) - len(semantic_filtered)
+        'removed_by_flow_duplicate': len(domain_filtered) - len(flow_filtered),
+        'removed_by_semantic': len(flow_filtered) - len(semantic_filtered)
     }
 
 
@@ -190,6 +201,7 @@ def main():
     print(f"Original task count: {stats['original_count']}")
     print(f"Removed by domain: {stats['removed_by_domain']}")
     print(f"Removed by tool flow: {stats['removed_by_tool_flow']}")
+    print(f"Removed by duplicate tool flow: {stats['removed_by_flow_duplicate']}")
     print(f"Removed by semantic similarity: {stats['removed_by_semantic']}")
     print(f"Final task count: {stats['final_count']}")
     print(f"Retention rate: {stats['final_count']/stats['original_count']*100:.1f}%")
@@ -0,0 +1,217 @@
+"""
+Prebuilt registry of the benchmark tools.
+
+ToolRegistry inspects every tool of geoplan_bench/tools/tools.py once and keeps
+its agent entry ({"func", "description", "parameters"}), function-calling
+schema and catalogue line. Agents hold ToolSets, read-only ordered views of
+some of those tools whose catalogue and schema are joined once and shared by
+every agent holding the same set, so equipping an agent is an assignment
+instead of one inspect.signature call per tool. Entries are shared and must
+not be modified.
+"""
+
+import json
+import inspect
+import threading
+from collections.abc import Mapping
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import geoplan_bench.tools as tools
+
+
+def tool_parameters(func: Callable) -> Dict[str, Any]:
+    """JSON schema of func's parameters, typed from int/float/bool annotations and string otherwise"""
+    parameters = {
+        "type": "object",
+        "properties": {},
+        "required": []
+    }
+    for param_name, param in inspect.signature(func).parameters.items():
+        if param_name == 'self':
+            continue
+
+        param_type = "string"
+        if param.annotation != inspect.Parameter.empty:
+            if param.annotation == int:
+                param_type = "integer"
+            elif param.annotation == float:
+                param_type = "number"
+            elif param.annotation == bool:
+                param_type = "boolean"
+
+        parameters["properties"][param_name] = {
+            "type": param_type,
+            "description": f"{param_name} parameter"
+        }
+
+        # If no default value, then required parameter
+        if param.default == inspect.Parameter.empty:
+            parameters["required"].append(param_name)
+    return parameters
+
+
+@lru_cache(maxsize=1024)
+def tool_entry(func: Callable) -> Dict[str, Any]:
+    """Agent tool entry of func, inspected once per function"""
+    name = func.__name__
+    return {"func": func, "description": func.__doc__ or f"Execute {name} function",
+            "parameters": tool_parameters(func)}
+
+
+def function_schema(name: str, entry: Dict[str, Any]) -> Dict[str, Any]:
+    """Function-calling schema of a tool entry"""
+    return {
+        "type": "function",
+        "function": {
+            "name": name,
+            "description": entry["description"],
+            "parameters": entry["parameters"]
+        }
+    }
+
+
+def catalogue_line(name: str, entry: Dict[str, Any]) -> str:
+    """Line of a tool in the catalogue listed in prompts"""
+    return f"- {name}: {entry['description']}"
+
+
+class ToolSet(Mapping):
+    """
+    Read-only ordered mapping of tool name -> entry.
+
+    Args:
+        entries: Tool entries in catalogue order
+        schemas: Precomputed function_schema of the entries, built when missing
+        lines: Precomputed catalogue_line of the entries, built when missing
+    """
+
+    def __init__(self, entries: Dict[str, Dict[str, Any]], schemas: Optional[Dict[str, Dict[str, Any]]] = None,
+                 lines: Optional[Dict[str, str]] = None):
+        self._entries = dict(entries)
+        self.names = tuple(self._entries)
+        self.index = {name: position for position, name in enumerate(self.names)}
+        self._schemas = schemas
+        self._lines = lines
+        self._schema = None
+        self._schema_json = None
+        self._catalogue = None
+
+    def __getitem__(self, name):
+        return self._entries[name]
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self._entries
+
+    def __repr__(self):
+        return f"ToolSet({len(self)} tools)"
+
+    def schema(self) -> List[Dict[str, Any]]:
+        """Function-calling schema of all tools"""
+        if self._schema is None:
+            self._schema = [self._schemas[name] if self._schemas else function_schema(name, entry)
+                            for name, entry in self._entries.items()]
+        return self._schema
+
+    def schema_json(self) -> str:
+        """Serialized ``tools`` fragment of a request body"""
+        if self._schema_json is None:
+            self._schema_json = json.dumps(self.schema(), ensure_ascii=False)
+        return self._schema_json
+
+    def catalogue(self) -> str:
+        """Tool catalogue listed in prompts, one "- name: description" line per tool"""
+        if self._catalogue is None:
+            self._catalogue = "\n".join(self._lines[name] if self._lines else catalogue_line(name, entry)
+                                        for name, entry in self._entries.items())
+        return self._catalogue
+
+
+class ToolRegistry:
+    """
+    Immutable registry of tool functions.
+
+    Args:
+        funcs: Tool functions in catalogue order
+    """
+
+    def __init__(self, funcs: Iterable[Callable]):
+        entries = {func.__name__: tool_entry(func) for func in funcs}
+        self._schemas = {name: function_schema(name, entry) for name, entry in entries.items()}
+        self._lines = {name: catalogue_line(name, entry) for name, entry in entries.items()}
+        self.tools = ToolSet(entries, self._schemas, self._lines)
+        self.names = self.tools.names
+        self.index = self.tools.index
+        self._subsets: Dict[tuple, ToolSet] = {self.names: self.tools}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_module(cls, module) -> "ToolRegistry":
+        """Registry of the functions listed in module.__all__"""
+        return cls(getattr(module, name) for name in module.__all__)
+
+    def __getitem__(self, name):
+        return self.tools[name]
+
+    def __contains__(self, name):
+        return name in self.tools
+
+    def __len__(self):
+        return len(self.tools)
+
+    def subset(self, names: Optional[Iterable[str]] = None) -> ToolSet:
+        """
+        ToolSet of the named tools in the given order, all tools when names is None.
+
+        Subsets are cached, so agents asking for the same tools share one
+        ToolSet and its joined catalogue and schema. Raises KeyError for names
+        that are not registered.
+        """
+        key = self.names if names is None else tuple(names)
+        with self._lock:
+            subset = self._subsets.get(key)
+            if subset is None:
+                unknown = [name for name in key if name not in self.tools]
+                if unknown:
+                    raise KeyError(f"Unknown tools: {unknown}")
+                subset = ToolSet({name: self.tools[name] for name in key}, self._schemas, self._lines)
+                self._subsets[key] = subset
+        return subset
+
+    def exclude(self, *names: str) -> ToolSet:
+        """ToolSet of all tools but the named ones, in registry order"""
+        return self.subset(name for name in self.names if name not in names)
+
+
+@lru_cache(maxsize=None)
+def get_tool_registry() -> ToolRegistry:
+    """Registry of geoplan_bench.tools, built on first use"""
+    return ToolRegistry.from_module(tools)
+
+
+def add_tool_entry(agent_tools: Mapping, func: Callable) -> Dict[str, Dict[str, Any]]:
+    """Agent tools with the entry of func added; a shared ToolSet is copied first, a dict is updated in place"""
+    if isinstance(agent_tools, ToolSet):
+        agent_tools = dict(agent_tools)
+    agent_tools[func.__name__] = tool_entry(func)
+    return agent_tools
+
+
+def tools_catalogue(agent_tools: Mapping) -> str:
+    """Catalogue of an agent's tools, precomputed for a ToolSet"""
+    if isinstance(agent_tools, ToolSet):
+        return agent_tools.catalogue()
+    return "\n".join(catalogue_line(name, entry) for name, entry in agent_tools.items())
+
+
+def tools_schema(agent_tools: Mapping) -> List[Dict[str, Any]]:
+    """Function-calling schema of an agent's tools, precomputed for a ToolSet"""
+    if isinstance(agent_tools, ToolSet):
+        return agent_tools.schema()
+    return [function_schema(name, entry) for name, entry in agent_tools.items()]
@@ -1,24 +1,32 @@
 """
 Utility modules for GeoPlan Benchmark.
+
+Exports are imported on first access, so importing the package does not load
+the agents or the analysis dependencies.
 """
 
-from geoplan_bench.utils.arena import (
-    create_earth_agent,
-    create_plan_and_execute_agent,
-    create_react_agent,
-    create_zero_shot_cot_based_agent,
-    create_debate_agent,
-    create_arena
-)
-
-from geoplan_bench.utils.importance import  analyze_tool_importance_from_tasks
-
-__all__ = [
-    "create_earth_agent",
-    "create_plan_and_execute_agent",
-    "create_react_agent",
-    "create_zero_shot_cot_based_agent",
-    "create_debate_agent",
-    "create_arena",
-    "analyze_tool_importance_from_tasks",
-]
+import importlib
+
+_EXPORTS = {
+    "create_earth_agent": "geoplan_bench.utils.arena",
+    "create_plan_and_execute_agent": "geoplan_bench.utils.arena",
+    "create_react_agent": "geoplan_bench.utils.arena",
+    "create_zero_shot_cot_based_agent": "geoplan_bench.utils.arena",
+    "create_debate_agent": "geoplan_bench.utils.arena",
+    "create_arena": "geoplan_bench.utils.arena",
+    "analyze_tool_importance_from_tasks": "geoplan_bench.utils.importance",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -4,32 +4,48 @@ based on global dependency graph to calculate the out-degree centrality and Page
 """
 
 import json
+import uuid
 import networkx as nx
-from typing import Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime
 import os
-import matplotlib.pyplot as plt
 
 
 class ToolImportanceAnalyzer:
     """tool importance analyzer"""
     
-    def __init__(self, base_cost: float = 1.0, alpha: float = 1.0):
+    BACKENDS = ("networkx", "scipy")
+    
+    def __init__(self, base_cost: float = 1.0, alpha: float = 1.0, backend: str = "networkx"):
         """
         initialize analyzer
         
         Args:
             base_cost: base cost
             alpha: PageRank weight adjustment coefficient
+            backend: "networkx", or "scipy" to compute centralities on a sparse
+                matrix, which is much faster for graphs with thousands of nodes
         """
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown centrality backend: {backend}, expected one of {self.BACKENDS}")
         self.base_cost = base_cost
         self.alpha = alpha
+        self.backend = backend
+        # CSR form of global_graph for the scipy backend, rebuilt when the graph changes
+        self._graph_version = 0
+        self._sparse_graph_cache = None
         self.global_graph = nx.DiGraph()
         self.dag_templates = []
         self.tool_importance_scores = {}
         self.output_dir = "data/tasks/filter_info"
+        # incremental state: tool flow of every task in the graph, keyed by task_id, and
+        # the task_id, mtime and size of every loaded task file of task_dir, so updates only apply the deltas
+        self.task_flows: Dict[str, List[str]] = {}
+        self.task_files: Dict[str, Dict[str, Any]] = {}
+        self.task_dir: Optional[str] = None
+        # previous PageRank vector, used to warm-start the next computation
+        self.pagerank_scores: Dict[str, float] = {}
         
-
     
     def load_templates(self, dir_path: str = "dag_templates") -> List[Dict]:
         """load DAG templates from directory"""
@@ -67,39 +83,161 @@ class ToolImportanceAnalyzer:
         """build dependency graph from task tool flows"""
         print("Building dependency graph from tool flows...")
         self.global_graph = nx.DiGraph()
+        self.task_flows = {}
+        self.task_files = {}
+        self.task_dir = None
+        self.pagerank_scores = {}
+        self.add_tasks(tasks)
         
-        edge_weights = {}
+        print(f"Dependency graph built:")
+        print(f"  - number of nodes: {self.global_graph.number_of_nodes()}")
+        print(f"  - number of edges: {self.global_graph.number_of_edges()}")
+        
+        return self.global_graph
+    
+    def _apply_tool_flow(self, tool_flow: List[str], delta: int):
+        """add delta to the weight of every transition of tool_flow, dropping edges and nodes that reach zero"""
+        self._graph_version += 1
+        for source, target in zip(tool_flow, tool_flow[1:]):
+            if source is None or target is None:
+                continue
+            if self.global_graph.has_edge(source, target):
+                weight = self.global_graph[source][target]['weight'] + delta
+            else:
+                weight = delta
+            if weight > 0:
+                self.global_graph.add_edge(source, target, weight=weight)
+                continue
+            if self.global_graph.has_edge(source, target):
+                self.global_graph.remove_edge(source, target)
+            for node in (source, target):
+                if self.global_graph.has_node(node) and self.global_graph.degree(node) == 0:
+                    self.global_graph.remove_node(node)
+    
+    def add_tasks(self, tasks: List[Dict]) -> int:
+        """
+        add the tool flows of tasks to the graph
+        
+        Tasks are keyed by task_id; a task already in the graph is replaced.
+        Tasks without a task_id get a fresh uuid4, so they never replace
+        another task.
         
+        Returns:
+            number of tasks added
+        """
+        added = 0
         for task in tasks:
             tool_flow = task.get('ground_truth_tool_flow', [])
-            if not isinstance(tool_flow, list) or len(tool_flow) < 2:
+            if not isinstance(tool_flow, list):
                 continue
-            
-            for i in range(len(tool_flow) - 1):
-                source = tool_flow[i]
-                target = tool_flow[i + 1]
-                
-                if source is None or target is None:
-                    continue
-                
-                if not self.global_graph.has_node(source):
-                    self.global_graph.add_node(source)
-                if not self.global_graph.has_node(target):
-                    self.global_graph.add_node(target)
-                
-                edge_key = (source, target)
-                if edge_key not in edge_weights:
-                    edge_weights[edge_key] = 0
-                edge_weights[edge_key] += 1
+            task_id = task.get('task_id') or str(uuid.uuid4())
+            if task_id in self.task_flows:
+                self._apply_tool_flow(self.task_flows[task_id], -1)
+            self.task_flows[task_id] = list(tool_flow)
+            self._apply_tool_flow(tool_flow, 1)
+            added += 1
+        return added
+    
+    def remove_tasks(self, task_ids: List[str]) -> int:
+        """
+        remove the tool flows of previously added tasks from the graph
         
-        for (source, target), weight in edge_weights.items():
-            self.global_graph.add_edge(source, target, weight=weight)
+        Returns:
+            number of tasks removed, unknown task ids are ignored
+        """
+        removed = 0
+        for task_id in task_ids:
+            tool_flow = self.task_flows.pop(task_id, None)
+            if tool_flow is None:
+                continue
+            self._apply_tool_flow(tool_flow, -1)
+            removed += 1
+        return removed
+    
+    def update_from_directory(self, task_dir: str = "data/tasks/filtered") -> Tuple[int, int]:
+        """
+        sync the graph with the task files in task_dir
         
-        print(f"Dependency graph built:")
-        print(f"  - number of nodes: {self.global_graph.number_of_nodes()}")
-        print(f"  - number of edges: {self.global_graph.number_of_edges()}")
+        Only files not seen before, or whose mtime or size changed, are read;
+        tasks whose file has disappeared or changed are removed. The graph is
+        rebuilt from scratch when it was built from another directory.
         
-        return self.global_graph
+        Returns:
+            (number of tasks added, number of tasks removed)
+        """
+        task_dir_path = os.path.abspath(task_dir)
+        if self.task_dir is not None and self.task_dir != task_dir_path:
+            print(f"Rebuilding dependency graph: state was built from {self.task_dir}")
+            self.build_graph_from_tool_flows([])
+        self.task_dir = task_dir_path
+        
+        file_stats = {}
+        if os.path.exists(task_dir):
+            for filename in os.listdir(task_dir):
+                if not filename.endswith('.json'):
+                    continue
+                try:
+                    stat = os.stat(os.path.join(task_dir, filename))
+                except OSError:
+                    continue
+                file_stats[filename] = (stat.st_mtime_ns, stat.st_size)
+        gone = [filename for filename, entry in self.task_files.items()
+                if (entry.get('mtime'), entry.get('size')) != file_stats.get(filename)]
+        removed = self.remove_tasks([self.task_files.pop(filename)['task_id'] for filename in gone])
+        
+        new_tasks = []
+        for filename in sorted(set(file_stats) - set(self.task_files)):
+            try:
+                with open(os.path.join(task_dir, filename), 'r', encoding='utf-8') as f:
+                    task = json.load(f)
+            except Exception as e:
+                print(f"Warning: Failed to load task from {filename}: {e}")
+                continue
+            tool_flow = task.get('ground_truth_tool_flow') if isinstance(task, dict) else None
+            if isinstance(tool_flow, list) and len(tool_flow) > 0:
+                task = dict(task, task_id=task.get('task_id', filename))
+                mtime, size = file_stats[filename]
+                self.task_files[filename] = {'task_id': task['task_id'], 'mtime': mtime, 'size': size}
+                new_tasks.append(task)
+        added = self.add_tasks(new_tasks)
+        print(f"Updated dependency graph from {task_dir}: {added} tasks added, {removed} removed")
+        return added, removed
+    
+    def save_state(self, filepath: str = "tool_importance_state.json"):
+        """persist the task flows and PageRank vector for later incremental updates"""
+        state = {
+            'edge_weights': [[source, target, data['weight']] for source, target, data in self.global_graph.edges(data=True)],
+            'task_flows': self.task_flows,
+            'task_files': self.task_files,
+            'task_dir': self.task_dir,
+            'pagerank_scores': self.pagerank_scores
+        }
+        filepath = os.path.join(self.output_dir, filepath)
+        if not os.path.exists(self.output_dir):
+            os.makedirs(self.output_dir)
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False)
+    
+    def load_state(self, filepath: str = "tool_importance_state.json") -> bool:
+        """restore a state saved by save_state, False if there is none"""
+        filepath = os.path.join(self.output_dir, filepath)
+        if not os.path.exists(filepath):
+            return False
+        try:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except Exception as e:
+            print(f"Warning: Failed to load tool importance state from {filepath}: {e}")
+            return False
+        self.global_graph = nx.DiGraph()
+        self.global_graph.add_weighted_edges_from(state.get('edge_weights', []))
+        self.task_flows = state.get('task_flows', {})
+        # files recorded by an older state without mtime and size are read again
+        self.task_files = {filename: entry if isinstance(entry, dict) else {'task_id': entry}
+                           for filename, entry in state.get('task_files', {}).items()}
+        self.task_dir = state.get('task_dir')
+        self.pagerank_scores = state.get('pagerank_scores', {})
+        return True
     
     def build_global_dependency_graph(self) -> nx.DiGraph:
         """
@@ -153,9 +291,18 @@ class ToolImportanceAnalyzer:
         """
         visualize global dependency graph
         """
+        import matplotlib.pyplot as plt
         nx.draw(self.global_graph, with_labels=True)
         plt.show()
     
+    def _sparse_graph(self):
+        """(node order, CSR adjacency matrix) of global_graph, cached until the graph is replaced or updated"""
+        from geoplan_bench.utils.sparse_centrality import graph_to_csr
+        key = (id(self.global_graph), self._graph_version)
+        if self._sparse_graph_cache is None or self._sparse_graph_cache[0] != key:
+            self._sparse_graph_cache = (key, graph_to_csr(self.global_graph))
+        return self._sparse_graph_cache[1]
+    
     def calculate_out_degree_centrality(self) -> Dict[str, float]:
         """
         calculate out-degree centrality
@@ -166,7 +313,12 @@ class ToolImportanceAnalyzer:
         print("calculating out-degree centrality...")
         
         # calculate the out-degree of each node
-        out_degrees = dict(self.global_graph.out_degree())
+        if self.backend == "scipy":
+            from geoplan_bench.utils.sparse_centrality import sparse_out_degree
+            nodes, matrix = self._sparse_graph()
+            out_degrees = dict(zip(nodes, sparse_out_degree(matrix).tolist()))
+        else:
+            out_degrees = dict(self.global_graph.out_degree())
         
         if not out_degrees:
             return {}
@@ -197,14 +349,27 @@ class ToolImportanceAnalyzer:
         if self.global_graph.number_of_nodes() == 0:
             return {}
         
+        # warm-start from the previous vector, restricted to the nodes still in the graph
+        nstart = {node: self.pagerank_scores.get(node, 0.0) for node in self.global_graph}
+        if not any(nstart.values()):
+            nstart = None
+        
         try:
             # use edge weights to calculate PageRank
-            pagerank_scores = nx.pagerank(
-                self.global_graph, 
-                alpha=alpha, 
-                max_iter=max_iter,
-                weight='weight'
-            )
+            if self.backend == "scipy":
+                from geoplan_bench.utils.sparse_centrality import sparse_pagerank
+                nodes, matrix = self._sparse_graph()
+                start = [nstart[node] for node in nodes] if nstart else None
+                pagerank_scores = dict(zip(nodes, sparse_pagerank(matrix, alpha, max_iter, nstart=start).tolist()))
+            else:
+                pagerank_scores = nx.pagerank(
+                    self.global_graph, 
+                    alpha=alpha, 
+                    max_iter=max_iter,
+                    weight='weight',
+                    nstart=nstart
+                )
+            self.pagerank_scores = pagerank_scores
             print(f"PageRank centrality calculated")
             return pagerank_scores
         except Exception as e:
@@ -279,7 +444,7 @@ class ToolImportanceAnalyzer:
                 'generated_at': datetime.now().isoformat(),
                 'source': source,
                 'total_templates': len(self.dag_templates) if source == "dag_templates" else 0,
-                'total_tasks': len(self.dag_templates) if source == "tasks" else 0,
+                'total_tasks': (len(self.task_flows) or len(self.dag_templates)) if source == "tasks" else 0,
                 'total_tools': len(self.tool_importance_scores),
                 'graph_nodes': self.global_graph.number_of_nodes(),
                 'graph_edges': self.global_graph.number_of_edges(),
@@ -326,18 +491,26 @@ class ToolImportanceAnalyzer:
         for i, (tool, score) in enumerate(self.get_top_important_tools(10, 'pagerank_centrality'), 1):
             print(f"  {i:2d}. {tool:<40} {score:.4f}")
 
-def analyze_tool_importance_from_tasks(task_dir: str = "data/tasks/filtered"):
-    """analyze tool importance from filtered tasks"""
-    analyzer = ToolImportanceAnalyzer(base_cost=1.0, alpha=1.0)
-    tasks = analyzer.load_tasks_from_directory(task_dir)
-    if not tasks:
+def analyze_tool_importance_from_tasks(task_dir: str = "data/tasks/filtered", incremental: bool = True,
+                                       backend: str = "networkx"):
+    """
+    analyze tool importance from filtered tasks
+    
+    With incremental, the graph state saved by the previous run is updated with
+    the task files added to or removed from task_dir instead of being rebuilt.
+    backend selects the centrality implementation, see ToolImportanceAnalyzer.
+    """
+    analyzer = ToolImportanceAnalyzer(base_cost=1.0, alpha=1.0, backend=backend)
+    if incremental:
+        analyzer.load_state()
+    analyzer.update_from_directory(task_dir)
+    if not analyzer.task_flows:
         print(f"Warning: No tasks found in {task_dir}, skipping tool importance analysis")
         return analyzer
     
-    analyzer.dag_templates = tasks
-    analyzer.build_graph_from_tool_flows(tasks)
     analyzer.calculate_tool_importance()
     analyzer.save_importance_analysis(source="tasks")
+    analyzer.save_state()
     return analyzer
 
 
@@ -0,0 +1,59 @@
+"""
+Script to plan many tasks with the CoT agent in batch mode.
+
+  run:   pack several questions into one structured-output request
+  write: write an OpenAI Batch API input JSONL file, one request per task
+  read:  turn a Batch API output JSONL file into tool trajectories per task
+"""
+
+import os
+import sys
+import json
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def load_tasks(task_dir: str):
+    tasks = []
+    for filename in sorted(os.listdir(task_dir)):
+        if filename.endswith(".json"):
+            with open(os.path.join(task_dir, filename), "r", encoding="utf-8") as f:
+                tasks.append(json.load(f))
+    return tasks
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch-mode CoT planning")
+    parser.add_argument("command", choices=["run", "write", "read"], help="Batch operation")
+    parser.add_argument("--task-dir", type=str, default="data/tasks/filtered", help="Directory containing task files")
+    parser.add_argument("--batch-size", type=int, default=10, help="Questions per request for run")
+    parser.add_argument("--batch-file", type=str, default="data/cot_batch_input.jsonl",
+                        help="Batch API input file for write, output file for read")
+    parser.add_argument("--output", type=str, default="data/cot_batch_trajectories.json",
+                        help="Trajectories JSON written by run and read")
+    args = parser.parse_args()
+    # imported after argument parsing so --help does not load the agents
+    from geoplan_bench.utils.arena import create_zero_shot_cot_based_agent
+
+    agent = create_zero_shot_cot_based_agent()
+
+    if args.command == "read":
+        trajectories = agent.read_batch_results(args.batch_file)
+    else:
+        tasks = load_tasks(args.task_dir)
+        task_ids = [task["task_id"] for task in tasks]
+        questions = [task["question"] for task in tasks]
+        if args.command == "write":
+            agent.write_batch_file(questions, args.batch_file, custom_ids=task_ids)
+            print(f"Wrote {len(questions)} requests to {args.batch_file}")
+            return
+        trajectories = dict(zip(task_ids, agent.run_batch(questions, batch_size=args.batch_size)))
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(trajectories, f, ensure_ascii=False, indent=2)
+    print(f"Saved {len(trajectories)} trajectories to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,7 +8,7 @@ import argparse
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from geoplan_bench.pipeline.task_evaluation import execute_task_evaluation_pipeline
+from geoplan_bench.llm import Budget
 
 
 def main():
@@ -25,15 +25,61 @@ def main():
         default=None,
         help="End task index (inclusive)"
     )
+    parser.add_argument(
+        "--max-tokens",
+        type=int,
+        default=None,
+        help="Token budget per agent per task"
+    )
+    parser.add_argument(
+        "--max-calls",
+        type=int,
+        default=None,
+        help="LLM call budget per agent per task"
+    )
+    parser.add_argument(
+        "--max-seconds",
+        type=float,
+        default=None,
+        help="Wall time budget per agent per task"
+    )
+    parser.add_argument(
+        "--loop-policy",
+        choices=["finish", "stop"],
+        default=None,
+        help="Enable loop detection for the ReAct agents and EarthAgent experts: "
+             "'finish' goes to the final answer, 'stop' ends the run (default: off)"
+    )
+    parser.add_argument(
+        "--observations",
+        choices=["llm", "cached", "stub"],
+        default="llm",
+        help="Tool observations of the ReAct agents and EarthAgent experts: 'llm' imagines each one, "
+             "'cached' reuses them across agents and tasks, 'stub' calls the stub tools (default: llm)"
+    )
     
     args = parser.parse_args()
+    # imported after argument parsing so --help does not load the pipeline
+    from geoplan_bench.pipeline.task_evaluation import execute_task_evaluation_pipeline
+    budget = Budget(max_tokens=args.max_tokens, max_calls=args.max_calls, max_seconds=args.max_seconds)
+    loop_detector = None
+    if args.loop_policy:
+        from geoplan_bench.agents.loop_detector import LoopDetector
+        loop_detector = LoopDetector(policy=args.loop_policy)
+    observation_provider = None
+    if args.observations != "llm":
+        from geoplan_bench.agents.observation import CachedLLMObservationProvider, StubObservationProvider
+        observation_provider = CachedLLMObservationProvider() if args.observations == "cached" else StubObservationProvider()
     
     print("Starting evaluation pipeline...")
     print(f"Task range: [{args.start_index}:{args.end_index}]")
     
     execute_task_evaluation_pipeline(
         start_from_task_index=args.start_index,
-        end_to_task_index=args.end_index
+        end_to_task_index=args.end_index,
+        budget=None if budget.is_unlimited() else budget,
+        loop_detector=loop_detector,
+        observation_provider=observation_provider
     )
     
     print("Evaluation completed!")
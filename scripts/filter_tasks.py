@@ -9,9 +9,6 @@ import argparse
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from geoplan_bench.pipeline.task_validation import filter_tasks
-from geoplan_bench.utils.importance import analyze_tool_importance_from_tasks
-
 
 def main():
     parser = argparse.ArgumentParser(description="Filter tasks for GeoPlan Benchmark")
@@ -27,11 +24,26 @@ def main():
         default="data/tasks/filtered",
         help="Output directory for filtered tasks"
     )
+    parser.add_argument(
+        "--flow-dedup-threshold",
+        type=float,
+        default=0.8,
+        help="Estimated tool flow similarity at which a later task is removed as a duplicate"
+    )
+    parser.add_argument(
+        "--no-flow-dedup",
+        action="store_true",
+        help="Keep tasks with near-duplicate tool flows"
+    )
     
     args = parser.parse_args()
+    # imported after argument parsing so --help does not load the pipeline
+    from geoplan_bench.pipeline.task_validation import filter_tasks
+    from geoplan_bench.utils.importance import analyze_tool_importance_from_tasks
     
     print("Filtering tasks...")
-    filtered_tasks, stats = filter_tasks(args.input_dir)
+    filtered_tasks, stats = filter_tasks(args.input_dir,
+                                         flow_dedup_threshold=None if args.no_flow_dedup else args.flow_dedup_threshold)
     print(f"Filtered to {len(filtered_tasks)} tasks")
     
     # Save filtered tasks
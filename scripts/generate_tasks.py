@@ -8,7 +8,7 @@ import argparse
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from geoplan_bench.pipeline.task_generation import RemoteSensingTaskPipeline
+from geoplan_bench.llm import set_concurrency_limit
 
 
 def main():
@@ -25,15 +25,49 @@ def main():
         default="data/tasks/raw",
         help="Output directory for generated tasks"
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Number of DAG generation jobs run concurrently"
+    )
+    parser.add_argument(
+        "--max-openai-concurrency",
+        type=int,
+        default=None,
+        help="Maximum in-flight OpenAI calls across all jobs"
+    )
+    parser.add_argument(
+        "--max-genai-concurrency",
+        type=int,
+        default=None,
+        help="Maximum in-flight Gemini calls across all jobs"
+    )
+    parser.add_argument(
+        "--dedup-threshold",
+        type=float,
+        default=0.8,
+        help="Flow similarity at which a candidate flow is skipped as a near-duplicate (1.0 skips only contained flows)"
+    )
+    parser.add_argument(
+        "--no-dedup",
+        action="store_true",
+        help="Generate tasks for near-duplicate flows too"
+    )
     
     args = parser.parse_args()
+    # imported after argument parsing so --help does not load the pipeline
+    from geoplan_bench.pipeline.task_generation import RemoteSensingTaskPipeline
+    if args.max_openai_concurrency:
+        set_concurrency_limit("openai", args.max_openai_concurrency)
+    if args.max_genai_concurrency:
+        set_concurrency_limit("genai", args.max_genai_concurrency)
     
     print("Starting task generation...")
-    pipeline = RemoteSensingTaskPipeline()
-    tasks = pipeline.generate_batch_tasks(num_dags=args.num_dags)
+    pipeline = RemoteSensingTaskPipeline(dedup_threshold=None if args.no_dedup else args.dedup_threshold)
+    tasks = pipeline.generate_batch_tasks(num_dags=args.num_dags, max_workers=args.workers, output_dir=args.output_dir)
     
-    output_path = pipeline.export_tasks(tasks, output_dir=args.output_dir)
-    print(f"Tasks exported to: {output_path}")
+    print(f"Tasks exported to: {args.output_dir}")
     print(f"Total tasks generated: {len(tasks)}")
 
 
@@ -29,6 +29,13 @@ setup(
     ],
     python_requires=">=3.8",
     install_requires=requirements,
+    extras_require={
+        "telemetry": [
+            "opentelemetry-sdk",
+            "opentelemetry-exporter-otlp-proto-http",
+            "prometheus-client",
+        ],
+    },
     entry_points={
         "console_scripts": [
             "geoplan-generate=scripts.generate_tasks:main",